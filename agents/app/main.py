@@ -1,8 +1,9 @@
+import logging
+import threading
 from pathlib import Path
 from typing import Any, Tuple
 
 import psycopg2
-from psycopg2.extensions import cursor as PGCursor
 import yaml
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse, PlainTextResponse
@@ -10,9 +11,12 @@ from pydantic import BaseModel
 from pymongo import MongoClient
 
 from .config import settings
+from .migrations import apply_migrations
 
 app = FastAPI(title="Trainium Agents API", version="0.1.0")
 
+logger = logging.getLogger(__name__)
+
 
 class FeedbackIn(BaseModel):
     persona: str
@@ -89,6 +93,41 @@ def _pg_connect() -> psycopg2.extensions.connection:
     )
 
 
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_READY = False
+
+
+def _ensure_schema(conn: psycopg2.extensions.connection) -> None:
+    """Apply pending migrations the first time the database is reached.
+
+    Normally this happens at startup; it is retried lazily only if Postgres
+    was unavailable then. Once it succeeds no further DDL is issued.
+    """
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+    with _SCHEMA_LOCK:
+        if not _SCHEMA_READY:
+            applied = apply_migrations(conn)
+            if applied:
+                logger.info("applied schema migrations %s", applied)
+            _SCHEMA_READY = True
+
+
+@app.on_event("startup")
+def _apply_schema() -> None:  # pragma: no cover - requires Postgres
+    """Bring the feedback schema up to date once per process."""
+    try:
+        conn = _pg_connect()
+    except Exception as exc:
+        logger.warning("postgres unavailable, deferring migrations: %s", exc)
+        return
+    try:
+        _ensure_schema(conn)
+    finally:
+        conn.close()
+
+
 @app.get("/personas", response_class=JSONResponse)
 def list_personas() -> list[dict[str, Any]]:
     """Expose the personas catalog for the frontend."""
@@ -109,9 +148,9 @@ def invoke_agent(persona: str, body: AgentRequest) -> dict[str, str]:
 @app.post("/feedback", response_class=JSONResponse)
 def create_feedback(item: FeedbackIn) -> dict[str, Any]:
     conn = _pg_connect()
+    _ensure_schema(conn)
     with conn:
         with conn.cursor() as cur:
-            _ensure_feedback_table(cur)
             cur.execute(
                 "INSERT INTO feedback (persona, input, output, feedback) "
                 "VALUES (%s, %s, %s, %s) RETURNING id, created_at",
@@ -125,9 +164,9 @@ def create_feedback(item: FeedbackIn) -> dict[str, Any]:
 @app.get("/feedback", response_class=JSONResponse)
 def list_feedback() -> list[dict[str, Any]]:
     conn = _pg_connect()
+    _ensure_schema(conn)
     with conn:
         with conn.cursor() as cur:
-            _ensure_feedback_table(cur)
             cur.execute(
                 "SELECT id, persona, input, output, feedback, created_at "
                 "FROM feedback ORDER BY id"
@@ -147,18 +186,6 @@ def list_feedback() -> list[dict[str, Any]]:
     ]
 
 
-def _ensure_feedback_table(cur: PGCursor) -> None:
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS feedback ("
-        "id SERIAL PRIMARY KEY, "
-        "persona TEXT NOT NULL, "
-        "input TEXT NOT NULL, "
-        "output TEXT NOT NULL, "
-        "feedback TEXT NOT NULL, "
-        "created_at TIMESTAMPTZ NOT NULL DEFAULT NOW())",
-    )
-
-
 @app.get("/health/postgres", response_class=JSONResponse)
 def health_postgres() -> dict[str, Any]:
     ok, err = _check_postgres()
@@ -0,0 +1,89 @@
+"""Versioned schema migrations for the agents service.
+
+Migrations are applied once, at startup, and recorded in the shared
+``schema_version`` table under the ``agents`` component so that request
+handlers never need to issue DDL.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+COMPONENT = "agents"
+
+# Serializes migration runs across workers and services sharing the database.
+_ADVISORY_LOCK_KEY = 7_204_118_301
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A numbered schema change made of one or more SQL statements."""
+
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "create feedback",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS feedback (
+                id SERIAL PRIMARY KEY,
+                persona TEXT NOT NULL,
+                input TEXT NOT NULL,
+                output TEXT NOT NULL,
+                feedback TEXT NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+            """,
+        ),
+    ),
+)
+
+
+def apply_migrations(
+    conn: Any, migrations: Sequence[Migration] = MIGRATIONS
+) -> list[int]:
+    """Apply pending ``migrations`` in a single transaction.
+
+    Returns the versions that were applied by this call. Concurrent callers
+    block on an advisory lock, so only the first one performs the work.
+    """
+
+    applied_now: list[int] = []
+    with conn, conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_ADVISORY_LOCK_KEY,))
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                component TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (component, version)
+            )
+            """
+        )
+        cur.execute(
+            "SELECT version FROM schema_version WHERE component = %s",
+            (COMPONENT,),
+        )
+        done = {row[0] for row in cur.fetchall()}
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if migration.version in done:
+                continue
+            for statement in migration.statements:
+                cur.execute(statement)
+            cur.execute(
+                """
+                INSERT INTO schema_version (component, version, description)
+                VALUES (%s, %s, %s)
+                """,
+                (COMPONENT, migration.version, migration.description),
+            )
+            applied_now.append(migration.version)
+    return applied_now
@@ -155,11 +155,12 @@ def test_pipeline_e2e(monkeypatch) -> None:
     data_path = Path(__file__).resolve().parent / "data" / "jobs.json"
     jobs = json.loads(data_path.read_text())
 
-    def fake_embed(job: dict) -> list[float]:
-        title = job["title"]
-        return [1.0, 0.0] if "Widget" in title else [0.0, 1.0]
+    def fake_embed_batch(batch: list[dict], batch_size: int) -> list[list[float]]:
+        return [
+            [1.0, 0.0] if "Widget" in job["title"] else [0.0, 1.0] for job in batch
+        ]
 
-    monkeypatch.setattr(dedupe_module, "_embed", fake_embed)
+    monkeypatch.setattr(dedupe_module, "_embed_batch", fake_embed_batch)
 
     # Deduplicate using JobSpy helper
     deduped = dedupe_module.dedupe_jobs(jobs)
@@ -0,0 +1,302 @@
+"""Approximate nearest-neighbour index over normalized job embeddings.
+
+:class:`IVFIndex` is an inverted-file index: every vector is filed under the
+nearest of ``nlist`` spherical k-means centroids, and a query only scans the
+``nprobe`` lists whose centroids are closest to it. Until ``train_min``
+vectors have been added there is nothing to cluster, and queries scan every
+vector instead. Everything runs on CPU with numpy.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import secrets
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+
+def _kmeans(
+    data: np.ndarray, k: int, *, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Spherical k-means: unit centroids maximising cosine similarity."""
+
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = (data @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        empty = np.bincount(assign, minlength=k) == 0
+        # Re-seed clusters that lost every member.
+        sums[empty] = data[rng.choice(len(data), int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = sums / norms
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Persistent IVF index of unit vectors keyed by string ids.
+
+    Parameters
+    ----------
+    dim:
+        Embedding dimension.
+    nlist:
+        Number of k-means lists the vectors are partitioned into.
+    nprobe:
+        Lists scanned per query; more is slower but finds more neighbours.
+    train_min:
+        Vectors required before the lists are trained. Defaults to
+        ``39 * nlist``, the usual minimum for stable centroids.
+
+    Adding an id that is already present replaces its vector. ``metadata``
+    is free-form JSON-serializable state saved with the index.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        *,
+        nlist: int = 256,
+        nprobe: int = 8,
+        train_min: int | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_min = 39 * nlist if train_min is None else train_min
+        self.seed = seed
+        self.metadata: dict[str, Any] = {}
+        self._vectors = np.empty((1024, dim), dtype=np.float32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._assign = np.full(1024, -1, dtype=np.int32)
+        self._size = 0
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._centroids: np.ndarray | None = None
+        self._lists: list[list[int]] = []
+        # Lists as arrays, rebuilt lazily after they change.
+        self._list_arrays: dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, ids: Sequence[str], vectors: Any) -> None:
+        """Insert or replace ``ids`` with the matching rows of ``vectors``."""
+
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        # A repeated id within one call keeps its last vector.
+        latest = {key: i for i, key in enumerate(ids)}
+        if len(latest) != len(ids):
+            ids = list(latest)
+            vectors = vectors[list(latest.values())]
+        for key in ids:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._alive[row] = False
+        self._reserve(self._size + len(ids))
+        start, end = self._size, self._size + len(ids)
+        self._vectors[start:end] = vectors
+        self._alive[start:end] = True
+        self._ids.extend(ids)
+        self._rows.update((key, start + i) for i, key in enumerate(ids))
+        self._size = end
+        if self.trained:
+            self._file(np.arange(start, end))
+        elif len(self) >= self.train_min:
+            self.train()
+
+    def train(self) -> None:
+        """Cluster the current vectors and file every vector under its list."""
+
+        live = np.flatnonzero(self._alive[: self._size])
+        if len(live) == 0:
+            return
+        rng = np.random.default_rng(self.seed)
+        sample = live
+        if len(sample) > 64 * self.nlist:
+            sample = rng.choice(live, 64 * self.nlist, replace=False)
+        self._centroids = _kmeans(
+            self._vectors[sample],
+            min(self.nlist, len(sample)),
+            iterations=10,
+            rng=rng,
+        )
+        self._lists = [[] for _ in range(len(self._centroids))]
+        self._assign[: self._size] = -1
+        self._file(live)
+
+    def search(
+        self,
+        queries: Any,
+        *,
+        k: int = 10,
+        min_similarity: float = -1.0,
+        exclude: Iterable[str] = (),
+    ) -> list[list[tuple[str, float]]]:
+        """Return up to ``k`` ``(id, similarity)`` pairs per query, best first.
+
+        Only neighbours with cosine similarity of at least ``min_similarity``
+        are returned, and never those whose id is in ``exclude``.
+        """
+
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        alive = self._alive
+        excluded = [self._rows[key] for key in exclude if key in self._rows]
+        if excluded:
+            alive = alive.copy()
+            alive[excluded] = False
+        if self._centroids is None:
+            rows = np.flatnonzero(alive[: self._size])
+            sims = queries @ self._vectors[rows].T
+            return [self._top(rows, row, k, min_similarity) for row in sims]
+        nprobe = min(self.nprobe, len(self._centroids))
+        probes = np.argpartition(
+            -(queries @ self._centroids.T), nprobe - 1, axis=1
+        )[:, :nprobe]
+        results = []
+        for query, lists in zip(queries, probes):
+            rows = np.concatenate([self._list_array(int(i)) for i in lists])
+            rows = rows[alive[rows]]
+            sims = self._vectors[rows] @ query
+            results.append(self._top(rows, sims, k, min_similarity))
+        return results
+
+    def save(self, path: str) -> None:
+        """Atomically write the index to ``path``, dropping replaced vectors."""
+
+        self._compact()
+        config = {
+            "dim": self.dim,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "train_min": self.train_min,
+            "seed": self.seed,
+            "metadata": self.metadata,
+        }
+        centroids = self._centroids
+        if centroids is None:
+            centroids = np.empty((0, self.dim), dtype=np.float32)
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            config=np.array(json.dumps(config)),
+            ids=np.array(self._ids, dtype=str),
+            vectors=self._vectors[: self._size],
+            assign=self._assign[: self._size],
+            centroids=centroids,
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Workers may save concurrently, so each needs its own temp file.
+        tmp = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(buffer.getvalue())
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            index = cls(
+                config["dim"],
+                nlist=config["nlist"],
+                nprobe=config["nprobe"],
+                train_min=config["train_min"],
+                seed=config["seed"],
+            )
+            index.metadata = config["metadata"]
+            ids = [str(key) for key in data["ids"]]
+            index._reserve(len(ids))
+            index._vectors[: len(ids)] = data["vectors"]
+            index._alive[: len(ids)] = True
+            index._ids = ids
+            index._rows = {key: row for row, key in enumerate(ids)}
+            index._size = len(ids)
+            if len(data["centroids"]):
+                index._centroids = data["centroids"]
+                index._lists = [[] for _ in range(len(index._centroids))]
+                assign = data["assign"]
+                index._assign[: len(ids)] = assign
+                for row, list_id in enumerate(assign.tolist()):
+                    index._lists[list_id].append(row)
+        return index
+
+    def _file(self, rows: Iterable[int]) -> None:
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return
+        assert self._centroids is not None
+        assign = (self._vectors[rows] @ self._centroids.T).argmax(axis=1)
+        self._assign[rows] = assign
+        for row, list_id in zip(rows.tolist(), assign.tolist()):
+            self._lists[list_id].append(row)
+            self._list_arrays.pop(list_id, None)
+
+    def _list_array(self, list_id: int) -> np.ndarray:
+        array = self._list_arrays.get(list_id)
+        if array is None:
+            array = np.array(self._lists[list_id], dtype=np.int64)
+            self._list_arrays[list_id] = array
+        return array
+
+    def _top(
+        self, rows: np.ndarray, sims: np.ndarray, k: int, min_similarity: float
+    ) -> list[tuple[str, float]]:
+        keep = sims >= min_similarity
+        rows, sims = rows[keep], sims[keep]
+        if len(sims) > k:
+            best = np.argpartition(-sims, k - 1)[:k]
+            rows, sims = rows[best], sims[best]
+        order = np.argsort(-sims, kind="stable")
+        return [(self._ids[rows[i]], float(sims[i])) for i in order]
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._vectors):
+            return
+        size = max(capacity, 2 * len(self._vectors))
+        vectors = np.empty((size, self.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        alive = np.zeros(size, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        assign = np.full(size, -1, dtype=np.int32)
+        assign[: self._size] = self._assign[: self._size]
+        self._vectors, self._alive, self._assign = vectors, alive, assign
+
+    def _compact(self) -> None:
+        """Drop rows whose id has since been re-added."""
+
+        live = np.flatnonzero(self._alive[: self._size])
+        if len(live) == self._size:
+            return
+        count = len(live)
+        self._vectors[:count] = self._vectors[live]
+        self._assign[:count] = self._assign[live]
+        self._alive[:count] = True
+        self._alive[count:] = False
+        self._ids = [self._ids[row] for row in live.tolist()]
+        self._rows = {key: row for row, key in enumerate(self._ids)}
+        self._size = count
+        if self._centroids is not None:
+            self._lists = [[] for _ in range(len(self._centroids))]
+            for row, list_id in enumerate(self._assign[:count].tolist()):
+                self._lists[list_id].append(row)
+            self._list_arrays.clear()
@@ -0,0 +1,113 @@
+"""Compressed, date-partitioned archive of raw scrape payloads.
+
+Each ingestion run writes its raw jobs, one JSON object per line, to::
+
+    <root>/date=YYYY-MM-DD/board=<board>/<run_id>.ndjson.gz
+
+so a single day or board can be replayed by listing one directory.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import os
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Iterator
+
+_SUFFIX = ".ndjson.gz"
+
+
+class ArchiveWriter:
+    """Streams one run's raw jobs into a temporary file, published on close.
+
+    Readers never see a partially written run: the file only appears under
+    its final name once :meth:`close` has succeeded.
+    """
+
+    def __init__(self, path: str, *, compresslevel: int = 6) -> None:
+        self.path = path
+        self.rows = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._tmp = f"{path}.tmp"
+        self._fh = gzip.open(
+            self._tmp, "wt", encoding="utf-8", compresslevel=compresslevel
+        )
+
+    def write(self, jobs: Iterable[dict[str, Any]]) -> None:
+        for job in jobs:
+            # DataFrame records mark missing values as NaN, which replay would
+            # read back as a truthy float; archive them as null instead.
+            job = {
+                k: None if isinstance(v, float) and math.isnan(v) else v
+                for k, v in job.items()
+            }
+            # ``default=str`` keeps dates and other scraper types readable.
+            self._fh.write(json.dumps(job, default=str) + "\n")
+            self.rows += 1
+
+    def close(self) -> None:
+        self._fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._fh.close()
+        try:
+            os.remove(self._tmp)
+        except FileNotFoundError:
+            pass
+
+
+class RawArchive:
+    """Local directory of archived scrape payloads."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path_for(self, board: str, run_id: str, ts: float) -> str:
+        day = datetime.fromtimestamp(ts, tz=timezone.utc).date().isoformat()
+        return os.path.join(
+            self.root, f"date={day}", f"board={board}", f"{run_id}{_SUFFIX}"
+        )
+
+    def writer(self, board: str, run_id: str, ts: float) -> ArchiveWriter:
+        return ArchiveWriter(self.path_for(board, run_id, ts))
+
+    def files(
+        self,
+        *,
+        board: str | None = None,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterator[tuple[str, str]]:
+        """Yield ``(board, path)`` for archived runs, oldest day first.
+
+        ``since`` and ``until`` are inclusive UTC dates.
+        """
+
+        if not os.path.isdir(self.root):
+            return
+        for day_dir in sorted(os.listdir(self.root)):
+            if not day_dir.startswith("date="):
+                continue
+            day = date.fromisoformat(day_dir[len("date=") :])
+            if (since and day < since) or (until and day > until):
+                continue
+            day_path = os.path.join(self.root, day_dir)
+            for board_dir in sorted(os.listdir(day_path)):
+                name = board_dir[len("board=") :]
+                if not board_dir.startswith("board=") or (board and name != board):
+                    continue
+                board_path = os.path.join(day_path, board_dir)
+                for filename in sorted(os.listdir(board_path)):
+                    if filename.endswith(_SUFFIX):
+                        yield name, os.path.join(board_path, filename)
+
+    @staticmethod
+    def read(path: str) -> Iterator[dict[str, Any]]:
+        """Stream the raw jobs stored in one archive file."""
+
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                yield json.loads(line)
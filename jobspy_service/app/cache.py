@@ -0,0 +1,614 @@
+"""Bounded in-process cache and miss coalescing for job search results."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+V = TypeVar("V")
+
+
+def normalize_key(source: str, term: str | None) -> tuple[str, str]:
+    """Fold case and whitespace so equivalent searches share an entry."""
+
+    return source.strip().lower(), " ".join((term or "").split()).lower()
+
+
+class SearchCache(Generic[V]):
+    """LRU cache with per-entry TTL, an entry cap and a byte budget.
+
+    Parameters
+    ----------
+    max_entries:
+        Maximum number of resident entries.
+    max_bytes:
+        Budget for the summed ``sizeof`` of resident values.
+    sizeof:
+        Callable estimating the resident size of a value in bytes.
+    sweep_interval:
+        Minimum seconds between full sweeps that drop expired entries.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        sizeof: Callable[[V], int] = lambda value: len(repr(value)),
+        sweep_interval: float = 60.0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._sweep_interval = sweep_interval
+        # key -> (expires_at, size, value, stored_at); ordered from least to
+        # most recent.
+        self._entries: OrderedDict[Hashable, tuple[float, int, V, float]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the live value for ``key`` and mark it recently used."""
+
+        found = self.lookup(key)
+        return None if found is None else found[0]
+
+    def lookup(self, key: Hashable) -> tuple[V, float] | None:
+        """Like :meth:`get`, but return ``(value, stored_at)``."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry[0] <= now:
+                self._drop(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[2], entry[3]
+
+    def set(
+        self, key: Hashable, value: V, *, ttl: float, stored_at: float | None = None
+    ) -> None:
+        """Store ``value`` for ``ttl`` seconds, evicting LRU entries as needed.
+
+        ``stored_at`` is when the value was produced; it defaults to now and
+        is kept when an entry is copied between tiers.
+        """
+
+        size = self._sizeof(value)
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes or ttl <= 0:
+                return
+            self._maybe_sweep(now)
+            while self._entries and (
+                len(self._entries) >= self.max_entries
+                or self._bytes + size > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+            self._entries[key] = (
+                now + ttl,
+                size,
+                value,
+                now if stored_at is None else stored_at,
+            )
+            self._bytes += size
+
+    def peek(self, key: Hashable) -> float | None:
+        """``stored_at`` of a live entry, without counting a lookup."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[3]
+
+    def items(self) -> list[tuple[Hashable, float, float, V]]:
+        """Live entries as ``(key, expires_at, stored_at, value)``, LRU first."""
+
+        now = time.time()
+        with self._lock:
+            return [
+                (key, expires_at, stored_at, value)
+                for key, (expires_at, _, value, stored_at) in self._entries.items()
+                if expires_at > now
+            ]
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry and return how many were removed."""
+
+        with self._lock:
+            return self._sweep(time.time())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: Hashable) -> None:
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now - self._last_sweep >= self._sweep_interval:
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> int:
+        self._last_sweep = now
+        expired = [k for k, entry in self._entries.items() if entry[0] <= now]
+        for key in expired:
+            self._drop(key)
+        self._expirations += len(expired)
+        return len(expired)
+
+
+class SQLiteCacheBackend:
+    """Host-local cache tier shared by every worker process.
+
+    Values are stored as zlib-compressed bytes with an absolute expiry time in
+    a SQLite database in WAL mode, so readers in other processes are not
+    blocked by writers. Every ``purge_every`` writes, expired rows are
+    deleted and, beyond ``max_entries``, the oldest stored rows with them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        timeout: float = 5.0,
+        max_entries: int = 10_000,
+        purge_every: int = 100,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.purge_every = max(purge_every, 1)
+        self._writes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL,
+                payload BLOB NOT NULL,
+                stored_at REAL
+            )
+            """
+        )
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(search_cache)")
+        }
+        if "stored_at" not in columns:
+            # Files written before ages were tracked; their rows read as stale.
+            self._conn.execute("ALTER TABLE search_cache ADD COLUMN stored_at REAL")
+
+    def get(self, key: str) -> tuple[float, bytes] | None:
+        """Return ``(expires_at, payload)`` for a live entry."""
+
+        found = self.lookup(key)
+        return None if found is None else (found[0], found[2])
+
+    def lookup(self, key: str) -> tuple[float, float, bytes] | None:
+        """Return ``(expires_at, stored_at, payload)`` for a live entry."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, COALESCE(stored_at, 0), payload "
+                "FROM search_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], zlib.decompress(row[2])
+
+    def set(
+        self,
+        key: str,
+        payload: bytes,
+        expires_at: float,
+        stored_at: float | None = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache "
+                "(key, expires_at, payload, stored_at) VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    expires_at,
+                    zlib.compress(payload),
+                    time.time() if stored_at is None else stored_at,
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._purge()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge()
+
+    def _purge(self) -> int:
+        """Delete expired rows, then the oldest ones over ``max_entries``."""
+
+        expired = self._conn.execute(
+            "DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+        evicted = self._conn.execute(
+            """
+            DELETE FROM search_cache WHERE key IN (
+                SELECT key FROM search_cache
+                ORDER BY COALESCE(stored_at, 0) DESC, key
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        self._evictions += evicted
+        return expired
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) "
+                "FROM search_cache"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "evictions": self._evictions,
+        }
+
+
+class TieredCache(Generic[V]):
+    """In-process :class:`SearchCache` (L1) in front of a shared backend (L2).
+
+    ``encode`` and ``decode`` convert values to and from the bytes stored in
+    the backend; keys must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        l1: SearchCache[V],
+        l2: SQLiteCacheBackend,
+        *,
+        encode: Callable[[V], bytes],
+        decode: Callable[[bytes], V],
+    ) -> None:
+        self.l1 = l1
+        self.l2 = l2
+        self._encode = encode
+        self._decode = decode
+        self._l2_hits = 0
+        self._l2_misses = 0
+
+    def get(self, key: Hashable) -> V | None:
+        found = self.lookup(key)
+        return None if found is None else found[0]
+
+    def lookup(self, key: Hashable) -> tuple[V, float] | None:
+        found = self.l1.lookup(key)
+        if found is not None:
+            return found
+        row = self.l2.lookup(json.dumps(key))
+        if row is None:
+            self._l2_misses += 1
+            return None
+        self._l2_hits += 1
+        expires_at, stored_at, payload = row
+        value = self._decode(payload)
+        self.l1.set(key, value, ttl=expires_at - time.time(), stored_at=stored_at)
+        return value, stored_at
+
+    def set(
+        self, key: Hashable, value: V, *, ttl: float, stored_at: float | None = None
+    ) -> None:
+        now = time.time()
+        stored_at = now if stored_at is None else stored_at
+        self.l1.set(key, value, ttl=ttl, stored_at=stored_at)
+        if ttl > 0:
+            self.l2.set(json.dumps(key), self._encode(value), now + ttl, stored_at)
+
+    def peek(self, key: Hashable) -> float | None:
+        stored_at = self.l1.peek(key)
+        if stored_at is not None:
+            return stored_at
+        row = self.l2.lookup(json.dumps(key))
+        return None if row is None else row[1]
+
+    def items(self) -> list[tuple[Hashable, float, float, V]]:
+        # The shared tier already lives on disk.
+        return self.l1.items()
+
+    def purge_expired(self) -> int:
+        return self.l1.purge_expired() + self.l2.purge_expired()
+
+    def clear(self) -> None:
+        self.l1.clear()
+        self.l2.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.l1.stats(),
+            "l2_hits": self._l2_hits,
+            "l2_misses": self._l2_misses,
+            "l2": self.l2.stats(),
+        }
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+
+class PopularityTracker:
+    """Request counts per key that halve every ``half_life`` seconds.
+
+    At most ``max_keys`` keys are tracked; when the limit is exceeded the
+    least popular tenth is forgotten.
+    """
+
+    def __init__(self, *, half_life: float = 3600.0, max_keys: int = 10_000) -> None:
+        self.half_life = half_life
+        self.max_keys = max_keys
+        # key -> (score, updated_at)
+        self._scores: dict[Hashable, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: Hashable) -> None:
+        now = time.time()
+        with self._lock:
+            score, updated = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decay(score, updated, now) + 1.0, now)
+            if len(self._scores) > self.max_keys:
+                ranked = self._ranked(now)
+                for stale, _ in ranked[-max(len(ranked) // 10, 1) :]:
+                    del self._scores[stale]
+
+    def ranked(self) -> list[tuple[Hashable, float]]:
+        """``(key, score)`` pairs, most popular first."""
+
+        with self._lock:
+            return self._ranked(time.time())
+
+    def restore(self, scores: Iterable[tuple[Hashable, float]]) -> None:
+        """Add ``(key, score)`` pairs, e.g. from a snapshot, as of now."""
+
+        now = time.time()
+        with self._lock:
+            for key, score in scores:
+                current, updated = self._scores.get(key, (0.0, now))
+                self._scores[key] = (self._decay(current, updated, now) + score, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _ranked(self, now: float) -> list[tuple[Hashable, float]]:
+        scores = [
+            (key, self._decay(score, updated, now))
+            for key, (score, updated) in self._scores.items()
+        ]
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores
+
+    def _decay(self, score: float, updated: float, now: float) -> float:
+        if self.half_life <= 0:
+            return score
+        return score * 0.5 ** (max(now - updated, 0.0) / self.half_life)
+
+
+def _json_key(key: Any) -> Hashable:
+    """Undo JSON turning tuple keys into lists."""
+
+    return tuple(_json_key(k) for k in key) if isinstance(key, list) else key
+
+
+def save_snapshot(
+    path: str,
+    cache: SearchCache[V] | TieredCache[V],
+    popularity: PopularityTracker,
+    *,
+    encode: Callable[[V], Any],
+) -> int:
+    """Atomically write live cache entries and popularity scores to ``path``.
+
+    ``encode`` turns a value into something JSON-serializable. Returns the
+    number of entries written.
+    """
+
+    entries = [
+        {"key": key, "expires_at": exp, "stored_at": stored, "value": encode(value)}
+        for key, exp, stored, value in cache.items()
+    ]
+    snapshot = {
+        "saved_at": time.time(),
+        "entries": entries,
+        "popularity": [[key, score] for key, score in popularity.ranked()],
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Every worker snapshots on shutdown, so each needs its own temp file.
+    tmp = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(snapshot, fh)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    return len(entries)
+
+
+def load_snapshot(
+    path: str,
+    cache: SearchCache[V] | TieredCache[V],
+    popularity: PopularityTracker,
+    *,
+    decode: Callable[[Any], V],
+) -> int:
+    """Restore a :func:`save_snapshot` file, skipping expired entries.
+
+    Entries keep their original expiry and age. Returns the number restored.
+    """
+
+    with open(path, encoding="utf-8") as fh:
+        snapshot = json.load(fh)
+    now = time.time()
+    restored = 0
+    # Oldest-used first, so the LRU order survives the round trip.
+    for entry in snapshot.get("entries", []):
+        ttl = entry["expires_at"] - now
+        if ttl <= 0:
+            continue
+        cache.set(
+            _json_key(entry["key"]),
+            decode(entry["value"]),
+            ttl=ttl,
+            stored_at=entry["stored_at"],
+        )
+        restored += 1
+    popularity.restore(
+        (_json_key(key), score) for key, score in snapshot.get("popularity", [])
+    )
+    return restored
+
+
+class SingleFlight(Generic[V]):
+    """Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block until it finishes and receive the same result or error.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future[V]] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], V]) -> tuple[V, bool]:
+        """Return ``(value, shared)`` where ``shared`` marks a coalesced call."""
+
+        future, leader = self.join(key)
+        if not leader:
+            return future.result(), True
+        try:
+            value = fn()
+        except BaseException as exc:
+            self.finish(key, future, exc=exc)
+            raise
+        self.finish(key, future, value=value)
+        return value, False
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], Awaitable[V]]
+    ) -> tuple[V, bool]:
+        """Awaitable counterpart of :meth:`do` for coroutine functions."""
+
+        future, leader = self.join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+        try:
+            value = await fn()
+        except BaseException as exc:
+            self.finish(key, future, exc=exc)
+            raise
+        self.finish(key, future, value=value)
+        return value, False
+
+    def join(self, key: Hashable) -> tuple[Future[V], bool]:
+        """Register interest in ``key``; the first caller becomes the leader.
+
+        A leader must eventually call :meth:`finish` with the same future.
+        """
+
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._leaders += 1
+            return future, True
+
+    def finish(
+        self,
+        key: Hashable,
+        future: Future[V],
+        *,
+        value: V | None = None,
+        exc: BaseException | None = None,
+    ) -> None:
+        """Publish the leader's result (or ``exc``) to every waiter."""
+
+        with self._lock:
+            del self._calls[key]
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(value)  # type: ignore[arg-type]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+            }
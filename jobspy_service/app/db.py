@@ -0,0 +1,199 @@
+"""Process-wide Postgres connection pooling for the JobSpy service."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from psycopg2.extensions import STATUS_READY
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of reusable database connections.
+
+    Parameters
+    ----------
+    connect:
+        Zero-argument factory returning a new DB-API connection.
+    min_size:
+        Connections opened eagerly by :meth:`open`.
+    max_size:
+        Upper bound on open connections; further checkouts wait.
+    timeout:
+        Seconds a checkout waits for a free connection before raising
+        :class:`PoolTimeout`.
+    health_check_interval:
+        Connections idle for longer than this many seconds are probed with
+        ``SELECT 1`` before being handed out. ``0`` probes on every checkout.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        health_check_interval: float = 30.0,
+    ) -> None:
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("invalid pool size bounds")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle: deque[tuple[Any, float]] = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._counters = {
+            "connections_created": 0,
+            "connections_discarded": 0,
+            "checkouts": 0,
+            "reused": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+        }
+
+    def open(self) -> None:
+        """Eagerly open connections until ``min_size`` are available."""
+
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            conn = self._create()
+            self._release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Check out a connection for the duration of the ``with`` block."""
+
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def checkout(self) -> Any:
+        """Return a healthy connection, opening one if below ``max_size``."""
+
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            self._counters["checkouts"] += 1
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"no connection available within {self.timeout}s"
+                        )
+                    self._counters["waits"] += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    self._size += 1
+                    conn = None
+            if conn is None:
+                return self._create()
+            if self._healthy(conn, last_used):
+                with self._cond:
+                    self._counters["reused"] += 1
+                return conn
+            self._discard(conn)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool occupancy and lifetime counters."""
+
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                **self._counters,
+            }
+
+    def _create(self) -> Any:
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters["connections_created"] += 1
+        return conn
+
+    def _healthy(self, conn: Any, last_used: float) -> bool:
+        if getattr(conn, "closed", 0):
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+        except Exception as exc:
+            logger.warning("discarding unhealthy pooled connection: %s", exc)
+            with self._cond:
+                self._counters["health_check_failures"] += 1
+            return False
+        return True
+
+    def _release(self, conn: Any) -> None:
+        if getattr(conn, "closed", 0):
+            self._discard(conn)
+            return
+        try:
+            if getattr(conn, "status", STATUS_READY) != STATUS_READY:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn: Any) -> None:
+        _close_quietly(conn)
+        with self._cond:
+            self._size -= 1
+            self._counters["connections_discarded"] += 1
+            self._cond.notify()
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:  # pragma: no cover - already broken
+        pass
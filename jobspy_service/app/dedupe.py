@@ -2,7 +2,8 @@
 
 The default similarity thresholds are tuned separately for large and small
 companies. They can be configured via :class:`DedupConfig` or the environment
-variables ``BIG_COMPANY_THRESHOLD`` and ``SMALL_COMPANY_THRESHOLD``.
+variables ``BIG_COMPANY_THRESHOLD`` and ``SMALL_COMPANY_THRESHOLD``; the
+embedding batch size via ``DEDUPE_EMBED_BATCH_SIZE``.
 """
 
 from __future__ import annotations
@@ -15,6 +16,8 @@ import re
 
 import numpy as np
 
+from .ann import IVFIndex
+
 try:  # pragma: no cover - dependency not installed in tests
     from sentence_transformers import SentenceTransformer  # type: ignore
 except Exception:  # pragma: no cover - handled gracefully
@@ -70,10 +73,13 @@ class DedupConfig:
         Similarity cutoff for postings from large companies. Defaults to ``0.9``.
     small_company_threshold:
         Similarity cutoff for small companies. Defaults to ``0.85``.
+    embed_batch_size:
+        Jobs encoded per model batch. Defaults to ``64``.
     """
 
     big_company_threshold: float = 0.9
     small_company_threshold: float = 0.85
+    embed_batch_size: int = 64
 
     @classmethod
     def from_env(cls) -> "DedupConfig":
@@ -86,28 +92,77 @@ class DedupConfig:
             small_company_threshold=float(
                 os.getenv("SMALL_COMPANY_THRESHOLD", cls.small_company_threshold)
             ),
+            embed_batch_size=int(
+                os.getenv("DEDUPE_EMBED_BATCH_SIZE", cls.embed_batch_size)
+            ),
         )
 
 
-def _embed(job: dict) -> np.ndarray:
-    """Return a normalized embedding for the job title and description."""
+def _embed_text(job: dict) -> str:
+    return " ".join(
+        part for part in (job.get("title"), job.get("description")) if part
+    )
+
+
+def _embed_batch(jobs: Sequence[dict], batch_size: int) -> Sequence[np.ndarray]:
+    """Return normalized embeddings of the jobs' titles and descriptions.
+
+    The model is called once and encodes ``batch_size`` texts per forward
+    pass, which amortizes the per-call overhead that dominates on CPU.
+    """
 
     if _MODEL is None:  # pragma: no cover - only when dependency missing
         raise RuntimeError("sentence-transformers is required for embedding")
-    text = " ".join(
-        part for part in (job.get("title"), job.get("description")) if part
+    if not jobs:
+        return []
+    return _MODEL.encode(
+        [_embed_text(job) for job in jobs],
+        batch_size=batch_size,
+        normalize_embeddings=True,
     )
-    return _MODEL.encode(text, normalize_embeddings=True)
 
 
-def _cosine(a: np.ndarray, b: np.ndarray) -> float:
-    """Cosine similarity for normalized vectors."""
+# Candidates compared against the kept set per matrix product.
+_BLOCK_SIZE = 256
 
-    return float(np.dot(a, b))
+
+class _EmbeddingMatrix:
+    """Kept embeddings as the rows of a contiguous float32 matrix.
+
+    Capacity doubles when full, so appends are amortized O(1) and every
+    similarity check is a single matrix product over the filled rows.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024) -> None:
+        self._rows = np.empty((max(capacity, 1), dim), dtype=np.float32)
+        self.size = 0
+
+    def max_similarity(self, block: np.ndarray) -> np.ndarray:
+        """Highest cosine similarity of each row of ``block`` to a kept row."""
+
+        if self.size == 0:
+            return np.full(len(block), -np.inf, dtype=np.float32)
+        return (block @ self._rows[: self.size].T).max(axis=1)
+
+    def extend(self, rows: np.ndarray) -> None:
+        needed = self.size + len(rows)
+        if needed > len(self._rows):
+            grown = np.empty(
+                (max(needed, 2 * len(self._rows)), self._rows.shape[1]),
+                dtype=np.float32,
+            )
+            grown[: self.size] = self._rows[: self.size]
+            self._rows = grown
+        self._rows[self.size : needed] = rows
+        self.size = needed
 
 
 def dedupe_jobs(
-    jobs: Sequence[dict], *, config: DedupConfig | None = None
+    jobs: Sequence[dict],
+    *,
+    config: DedupConfig | None = None,
+    index: IVFIndex | None = None,
+    ids: Sequence[str | None] | None = None,
 ) -> list[dict]:
     """Remove semantically similar job postings.
 
@@ -118,25 +173,74 @@ def dedupe_jobs(
     config:
         Optional :class:`DedupConfig`. When ``None`` the environment variables
         ``BIG_COMPANY_THRESHOLD`` and ``SMALL_COMPANY_THRESHOLD`` are used.
+    index:
+        Optional :class:`~jobspy_service.app.ann.IVFIndex` of previously
+        seen postings. Jobs whose nearest indexed neighbour is within their
+        threshold are dropped.
+    ids:
+        The index id of each job, if it is indexed already
+        (``jobs_normalized.id`` for the index kept by ingestion). These jobs
+        are only deduplicated against each other, never against their own
+        indexed copies.
     """
 
     cfg = config or DedupConfig.from_env()
-    kept: list[dict] = []
-    embeddings: list[np.ndarray] = []
+    if ids is not None and len(ids) != len(jobs):
+        raise ValueError("ids and jobs must have the same length")
+    # Exact title/company repeats never reach the model.
+    candidates: list[dict] = []
     seen: set[str] = set()
     for job in jobs:
         job_hash = _hash(job)
-        if job_hash in seen:
-            continue
-        seen.add(job_hash)
-        emb = _embed(job)
-        threshold = (
-            cfg.big_company_threshold
-            if job.get("company_size") == "big"
-            else cfg.small_company_threshold
+        if job_hash not in seen:
+            seen.add(job_hash)
+            candidates.append(job)
+    if not candidates:
+        return []
+    embeddings = np.asarray(
+        _embed_batch(candidates, max(cfg.embed_batch_size, 1)), dtype=np.float32
+    )
+    thresholds = [
+        cfg.big_company_threshold
+        if job.get("company_size") == "big"
+        else cfg.small_company_threshold
+        for job in candidates
+    ]
+    if index is not None and len(index):
+        nearest = index.search(
+            embeddings,
+            k=1,
+            min_similarity=min(thresholds),
+            exclude=[key for key in ids or () if key is not None],
         )
-        if all(_cosine(emb, existing) < threshold for existing in embeddings):
-            kept.append(job)
-            embeddings.append(emb)
+        novel = [
+            i
+            for i, (hits, threshold) in enumerate(zip(nearest, thresholds))
+            if not hits or hits[0][1] < threshold
+        ]
+        candidates = [candidates[i] for i in novel]
+        thresholds = [thresholds[i] for i in novel]
+        embeddings = embeddings[novel]
+        if not candidates:
+            return []
+
+    # Greedy pass in input order: a job is kept unless it is too similar to
+    # one kept before it. Each block is compared with everything kept so far
+    # in one product, and with its own earlier members via its Gram matrix.
+    kept: list[dict] = []
+    matrix = _EmbeddingMatrix(embeddings.shape[1], min(len(candidates), 1024))
+    for start in range(0, len(candidates), _BLOCK_SIZE):
+        block = embeddings[start : start + _BLOCK_SIZE]
+        prior = matrix.max_similarity(block)
+        within = block @ block.T
+        accepted: list[int] = []
+        for i, threshold in enumerate(thresholds[start : start + len(block)]):
+            if prior[i] >= threshold:
+                continue
+            if accepted and within[i, accepted].max() >= threshold:
+                continue
+            accepted.append(i)
+        matrix.extend(block[accepted])
+        kept.extend(candidates[start + i] for i in accepted)
     return kept
 
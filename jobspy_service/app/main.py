@@ -3,19 +3,48 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import math
 import os
+import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from time import perf_counter
-from typing import Any
+from itertools import chain, islice, repeat
+from operator import methodcaller
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, NamedTuple
 
 import psycopg2
 from psycopg2.extensions import cursor as PGCursor
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from .archive import ArchiveWriter, RawArchive
+from .cache import (
+    PopularityTracker,
+    SearchCache,
+    SingleFlight,
+    SQLiteCacheBackend,
+    TieredCache,
+    load_snapshot,
+    normalize_key,
+    save_snapshot,
+)
+from .db import ConnectionPool
+from .migrations import apply_migrations
+from .pipeline import StagedPipeline
+from .ratelimit import TokenBucket, parse_rate_limits
+from .spool import RunSpool
+from .scheduler import BoardSchedule, LeaderLock
 
 try:  # pragma: no cover - optional dependency
     import jobspy as jobspy_lib
@@ -45,13 +74,67 @@ app = FastAPI(title="JobSpy API", version="0.1.0")
 
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache for search results
+# Search result cache: a bounded in-memory LRU, optionally backed by a
+# host-local SQLite file shared between uvicorn workers. Results older than
+# ``CACHE_TTL`` are stale: for another ``CACHE_STALE_TTL`` seconds they are
+# still served while one background scrape refreshes them.
 CACHE_TTL = int(os.getenv("JOBSPY_CACHE_TTL_SECONDS", "600"))
-_CACHE: dict[tuple[str, str], tuple[float, JobSearchResponse]] = {}
+CACHE_STALE_TTL = int(os.getenv("JOBSPY_CACHE_STALE_SECONDS", "0"))
+# A streamed search is cached, and shared with coalesced requests, only if it
+# has at most this many jobs; larger ones are streamed without being held.
+STREAM_CACHE_MAX_JOBS = int(os.getenv("JOBSPY_STREAM_CACHE_MAX_JOBS", "1000"))
+
+
+ResultCache = SearchCache[JobSearchResponse] | TieredCache[JobSearchResponse]
+
+
+def _build_cache() -> ResultCache:
+    l1: SearchCache[JobSearchResponse] = SearchCache(
+        max_entries=int(os.getenv("JOBSPY_CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(os.getenv("JOBSPY_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        sizeof=lambda response: len(response.model_dump_json()),
+    )
+    backend = os.getenv("JOBSPY_CACHE_BACKEND", "memory").lower()
+    if backend == "memory":
+        return l1
+    if backend != "sqlite":
+        raise ValueError(f"unknown JOBSPY_CACHE_BACKEND: {backend}")
+    return TieredCache(
+        l1,
+        SQLiteCacheBackend(
+            os.getenv("JOBSPY_CACHE_PATH", "/tmp/jobspy_search_cache.sqlite3"),
+            max_entries=int(os.getenv("JOBSPY_CACHE_SQLITE_MAX_ENTRIES", "10000")),
+        ),
+        encode=lambda response: response.model_dump_json().encode(),
+        decode=JobSearchResponse.model_validate_json,
+    )
+
+
+_CACHE: ResultCache = _build_cache()
+# Concurrent misses for the same key wait on a single scrape.
+_INFLIGHT: SingleFlight[JobSearchResponse] = SingleFlight()
+# Background revalidations, referenced until done so they are not collected.
+_REFRESHES: set[asyncio.Task[None]] = set()
+# Decayed search counts per cache key, used to pick the keys to prewarm.
+_POPULARITY = PopularityTracker(
+    half_life=float(os.getenv("JOBSPY_POPULARITY_HALF_LIFE_SECONDS", "3600"))
+)
+# Politeness limits are enforced per source rather than per request.
+_BUCKETS: dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
 
 VALID_SOURCES = {"indeed", "linkedin", "google"}
 
 
+class StageTiming(BaseModel):
+    """Duration and throughput of one ingestion stage."""
+
+    stage: str
+    duration: float
+    rows: int
+    rows_per_second: float
+
+
 class IngestionRun(BaseModel):
     """Record of a single ingestion run."""
 
@@ -62,14 +145,49 @@ class IngestionRun(BaseModel):
     unique_new: int
     errors: int
     timestamp: float
+    unchanged: int = 0
+    scheduling_lag: float | None = None
+    stages: list[StageTiming] = []
+    failed_rows: int = 0
+    hours_old: int | None = None
+    rows_saved: int = 0
+    collapsed: int = 0
+
+
+class IngestionCheckpoint(BaseModel):
+    """Persistence progress of a run, used to resume it after a failure."""
+
+    run_id: str
+    board: str
+    status: str
+    committed: int
+    updated_at: float
 
 
-# Structured logging helper
+class StageSummary(BaseModel):
+    """Latency percentiles of one stage for one board over a time window."""
+
+    board: str
+    stage: str
+    runs: int
+    p50: float
+    p95: float
+    rows_per_second: float
+
+
+# Structured logging helper. The block may set ``rows`` on the yielded dict;
+# on success a :class:`StageTiming` is appended to ``timings`` if given.
 @contextmanager
-def _log_stage(run_id: str, board: str, stage: str) -> Any:
+def _log_stage(
+    run_id: str,
+    board: str,
+    stage: str,
+    timings: list[StageTiming] | None = None,
+) -> Iterator[dict[str, int]]:
     start = perf_counter()
+    counts = {"rows": 0}
     try:
-        yield
+        yield counts
     except Exception as exc:
         duration = perf_counter() - start
         logger.error(
@@ -84,42 +202,92 @@ def _log_stage(run_id: str, board: str, stage: str) -> Any:
         )
         raise
     else:
-        duration = perf_counter() - start
-        logger.info(
-            "stage complete",
-            extra={
-                "run_id": run_id,
-                "board": board,
-                "stage": stage,
-                "duration": duration,
-                "status": "ok",
-            },
-        )
+        timing = _stage_timing(stage, perf_counter() - start, counts["rows"])
+        _log_stage_timing(run_id, board, timing)
+        if timings is not None:
+            timings.append(timing)
+
+
+def _stage_timing(stage: str, duration: float, rows: int) -> StageTiming:
+    return StageTiming(
+        stage=stage,
+        duration=duration,
+        rows=rows,
+        rows_per_second=rows / duration if duration else 0.0,
+    )
+
+
+def _log_stage_timing(run_id: str, board: str, timing: StageTiming) -> None:
+    logger.info(
+        "stage complete",
+        extra={
+            "run_id": run_id,
+            "board": board,
+            "stage": timing.stage,
+            "duration": timing.duration,
+            "rows": timing.rows,
+            "status": "ok",
+        },
+    )
 
 
-# Board-specific scheduling configuration
+# Board-specific scheduling configuration. ``persist_mode`` selects between the
+# set-based ``"bulk"`` upsert (``chunk_size`` rows per statement) and the
+# original ``"row"`` path that issues one statement per job. Every
+# ``commit_size`` rows are committed in their own transaction followed by a
+# checkpoint, so a failure only loses the chunk in flight. ``ingest_mode``
+# ``"pipelined"`` scrapes ``page_size`` jobs at a time and normalizes and
+# persists each page while the next is scraped, with at most ``queue_depth``
+# pages waiting between stages; ``"sequential"`` handles the whole result set
+# one stage after another. Each run only asks for postings newer than the last
+# successful run plus ``window_overlap_hours``, with ``hours_old`` as the
+# ceiling.
 BOARD_CONFIG: dict[str, dict[str, Any]] = {
     "indeed": {
         "enabled": True,
         "cadence": "4h",
         "results_wanted_max": 50,
         "hours_old": 24,
+        "window_overlap_hours": 1,
         "country": "us",
         "delay": 0,
+        "persist_mode": "bulk",
+        "chunk_size": 500,
+        "commit_size": 500,
+        "ingest_mode": "sequential",
     },
     "linkedin": {
         "enabled": True,
         "cadence": "daily",
         "results_wanted_max": 50,
         "hours_old": 24,
+        "window_overlap_hours": 1,
         "country": "us",
         "delay": 0,
+        "persist_mode": "bulk",
+        "chunk_size": 500,
+        "commit_size": 500,
+        "ingest_mode": "sequential",
     },
 }
 
-# Track last run time for each board and all run records
+DEFAULT_PERSIST_MODE = "bulk"
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_COMMIT_SIZE = 500
+DEFAULT_INGEST_MODE = "sequential"
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_QUEUE_DEPTH = 2
+DEFAULT_WINDOW_OVERLAP_HOURS = 1
+
+# Track last run time for each board and the most recent run records. The
+# history is a ring buffer so a long-lived worker does not grow without bound.
+# ``_LAST_SUCCESS`` only moves once a run's rows are all committed, so a failed
+# run never narrows the next scrape window.
 _LAST_RUN: dict[str, float | None] = {}
-INGESTION_RUNS: list[IngestionRun] = []
+_LAST_SUCCESS: dict[str, float | None] = {}
+INGESTION_RUNS: deque[IngestionRun] = deque(
+    maxlen=int(os.getenv("INGEST_RUN_HISTORY_SIZE", "1000"))
+)
 
 
 def _pg_connect() -> psycopg2.extensions.connection:
@@ -129,64 +297,83 @@ def _pg_connect() -> psycopg2.extensions.connection:
         user=os.getenv("POSTGRES_USER"),
         password=os.getenv("POSTGRES_PASSWORD"),
         dbname=os.getenv("POSTGRES_DB"),
+        connect_timeout=int(os.getenv("PG_CONNECT_TIMEOUT_SECONDS", "5")),
     )
 
 
-def _ensure_jobs_table(cur: PGCursor) -> None:
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS jobs_normalized ("
-        "id SERIAL PRIMARY KEY, "
-        "source TEXT NOT NULL, "
-        "title TEXT NOT NULL, "
-        "company TEXT, "
-        "description TEXT, "
-        "location TEXT, "
-        "url TEXT, "
-        "is_remote BOOLEAN, "
-        "job_id_ext TEXT NOT NULL, "
-        "updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(), "
-        "UNIQUE (source, job_id_ext))"
-    )
+# Shared by ingestion, scheduling and the run-history endpoints. The factory
+# looks ``_pg_connect`` up on each call so it can be swapped out in tests.
+_POOL = ConnectionPool(
+    lambda: _pg_connect(),
+    min_size=int(os.getenv("PG_POOL_MIN_SIZE", "1")),
+    max_size=int(os.getenv("PG_POOL_MAX_SIZE", "10")),
+    timeout=float(os.getenv("PG_POOL_TIMEOUT_SECONDS", "5")),
+    health_check_interval=float(os.getenv("PG_POOL_HEALTHCHECK_SECONDS", "30")),
+)
 
 
-def _ensure_ingestion_runs_table(cur: PGCursor) -> None:
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS ingestion_runs (
-            run_id UUID PRIMARY KEY,
-            board TEXT NOT NULL,
-            fetched INTEGER NOT NULL,
-            normalized INTEGER NOT NULL,
-            unique_new INTEGER NOT NULL,
-            errors INTEGER NOT NULL,
-            timestamp TIMESTAMPTZ NOT NULL
-        )
-        """
-    )
+@contextmanager
+def _pg_conn() -> Iterator[psycopg2.extensions.connection]:
+    """Borrow a pooled connection for the duration of the block."""
+
+    with _POOL.connection() as conn:
+        yield conn
+
+
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_READY = False
+
+
+def _ensure_schema(conn: psycopg2.extensions.connection) -> None:
+    """Apply pending migrations the first time the database is reached.
+
+    Normally this happens at startup; it is retried lazily only if Postgres
+    was unavailable then. Once it succeeds no further DDL is issued.
+    """
+
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+    with _SCHEMA_LOCK:
+        if not _SCHEMA_READY:
+            applied = apply_migrations(conn)
+            if applied:
+                logger.info("applied schema migrations %s", applied)
+            _SCHEMA_READY = True
 
 
 def _load_last_runs() -> None:
-    """Load last-run timestamps from the database."""
+    """Merge last-run timestamps from the database into memory.
+
+    Only completed runs are recorded there, so a newer in-memory attempt
+    (one whose persistence failed) is kept rather than overwritten.
+    """
 
     try:
-        conn = _pg_connect()
-        with conn, conn.cursor() as cur:
-            _ensure_ingestion_runs_table(cur)
-            cur.execute(
-                """
-                SELECT board, EXTRACT(EPOCH FROM MAX(timestamp))
-                FROM ingestion_runs
-                GROUP BY board
-                """
-            )
-            rows = cur.fetchall()
+        with _pg_conn() as conn:
+            _ensure_schema(conn)
+            with conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT board, EXTRACT(EPOCH FROM MAX(timestamp))
+                    FROM ingestion_runs
+                    GROUP BY board
+                    """
+                )
+                rows = cur.fetchall()
         for board, ts in rows:
-            _LAST_RUN[board] = ts
+            recorded = float(ts) if ts is not None else None
+            _LAST_RUN[board] = _latest(recorded, _LAST_RUN.get(board))
+            _LAST_SUCCESS[board] = _latest(recorded, _LAST_SUCCESS.get(board))
     except Exception:  # pragma: no cover - best effort
         for board in BOARD_CONFIG:
             _LAST_RUN.setdefault(board, None)
 
 
+def _latest(*stamps: float | None) -> float | None:
+    return max((ts for ts in stamps if ts is not None), default=None)
+
+
 def scrape_jobs(
     source: str,
     *,
@@ -195,8 +382,13 @@ def scrape_jobs(
     results_wanted_max: int | None = None,
     country: str | None = None,
     delay: int | None = None,
+    offset: int = 0,
 ) -> dict[str, Any]:
-    """Invoke the JobSpy scraping library for the given source."""
+    """Invoke the JobSpy scraping library for the given source.
+
+    ``offset`` skips that many results, which lets callers fetch a board in
+    pages of ``results_wanted_max``.
+    """
 
     if jobspy_lib is None:  # pragma: no cover - library not installed
         return {"jobs": [], "source": source}
@@ -207,6 +399,7 @@ def scrape_jobs(
         results_wanted_max=results_wanted_max,
         country=country,
         delay=delay,
+        offset=offset,
     )  # type: ignore[attr-defined]
 
 
@@ -252,16 +445,190 @@ def normalize_for_db(source: str, raw: dict[str, Any]) -> dict[str, Any]:
         "url": job.url,
         "is_remote": is_remote,
         "job_id_ext": job_id_ext,
+        "content_hash": content_hash(
+            job.title, job.company, job.description, job.location, job.url, is_remote
+        ),
     }
 
 
-@app.get("/jobs/search", response_class=JSONResponse, response_model=JobSearchResponse)
-def search_jobs(
-    source: str,
-    search_term: str | None = None,
-    google_search_term: str | None = None,
-) -> JobSearchResponse:
-    """Scrape jobs from the requested source."""
+def content_hash(
+    title: str,
+    company: str | None,
+    description: str | None,
+    location: str | None,
+    url: str | None,
+    is_remote: bool,
+) -> str:
+    """Fingerprint the persisted content of a job to detect no-op updates."""
+
+    return _fingerprint((title, company, description, location, url, is_remote))
+
+
+def _fingerprint(fields: tuple[Any, ...]) -> str:
+    # Unit-separated fields with NUL standing in for None keep "" and None
+    # distinct while avoiding a per-row JSON encode.
+    text = "\x1f".join(["\x00" if f is None else str(f) for f in fields])
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _fingerprint_columns(*columns: list[Any]) -> list[str]:
+    """Column-wise :func:`_fingerprint` over equally long field columns."""
+
+    texts = map(
+        "\x1f".join,
+        zip(*([("\x00" if v is None else str(v)) for v in col] for col in columns)),
+    )
+    blake2b = hashlib.blake2b
+    return [blake2b(t.encode(), digest_size=16).hexdigest() for t in texts]
+
+
+class JobRow(NamedTuple):
+    """DB-ready ``jobs_normalized`` row in column order."""
+
+    source: str
+    title: str
+    company: str | None
+    description: str | None
+    location: str | None
+    url: str | None
+    is_remote: bool
+    job_id_ext: str | None
+    content_hash: str
+
+
+# ``JobRow._make`` without the extra Python frame per row.
+_new_job_row = partial(tuple.__new__, JobRow)
+
+# Provider field aliases in priority order; must mirror ``normalize_job`` and
+# the ``job_id_ext`` fallbacks in ``normalize_for_db``.
+_FIELD_ALIASES: dict[str, tuple[str, ...]] = {
+    "title": ("title", "job_title"),
+    "company": ("company", "company_name"),
+    "description": ("description", "job_description"),
+    "location": ("location", "city", "location_name"),
+    "url": ("url", "job_url", "link"),
+    "remote": ("remote_status", "is_remote", "remote"),
+    "job_id_ext": ("job_id", "id", "jobkey", "job_id_ext"),
+}
+
+
+def _raw_columns(raw_jobs: Any) -> tuple[int, Callable[[str], list[Any] | None]]:
+    """Return the row count and a column accessor for a scrape result.
+
+    Accepts a list of dicts or a pandas ``DataFrame``. The accessor returns
+    ``None`` for columns absent from every row, and missing values (including
+    ``NaN`` in frames) as ``None``.
+    """
+
+    if hasattr(raw_jobs, "columns") and hasattr(raw_jobs, "notna"):
+        frame = raw_jobs
+        present = set(frame.columns)
+
+        def frame_column(name: str) -> list[Any] | None:
+            if name not in present:
+                return None
+            col = frame[name]
+            return col.astype(object).where(col.notna(), None).tolist()
+
+        return len(frame), frame_column
+
+    rows = raw_jobs if isinstance(raw_jobs, list) else list(raw_jobs)
+    keys: set[str] = set().union(*rows) if rows else set()
+
+    def dict_column(name: str) -> list[Any] | None:
+        if name not in keys:
+            return None
+        return list(map(methodcaller("get", name), rows))
+
+    return len(rows), dict_column
+
+
+def _coalesce(
+    column: Callable[[str], list[Any] | None], names: tuple[str, ...], size: int
+) -> list[Any]:
+    """Column-wise ``a or b or c`` across the alias columns ``names``."""
+
+    result: list[Any] | None = None
+    last_present = False
+    for name in names:
+        col = column(name)
+        last_present = col is not None
+        if col is None:
+            continue
+        result = col if result is None else [a or b for a, b in zip(result, col)]
+    if result is None:
+        return [None] * size
+    if not last_present:
+        # ``raw.get(missing)`` would have turned a falsy tail into ``None``.
+        result = [value or None for value in result]
+    return result
+
+
+def normalize_batch(source: str, raw_jobs: Any) -> list[JobRow]:
+    """Normalize a whole scrape result into DB-ready rows in one pass.
+
+    Field aliases are resolved column by column instead of row by row, and no
+    intermediate :class:`Job` models are built. For well-formed input the rows
+    match :func:`normalize_for_db` field for field.
+    """
+
+    size, column = _raw_columns(raw_jobs)
+    if size == 0:
+        return []
+    titles = [t or "" for t in _coalesce(column, _FIELD_ALIASES["title"], size)]
+    companies = _coalesce(column, _FIELD_ALIASES["company"], size)
+    descriptions = _coalesce(column, _FIELD_ALIASES["description"], size)
+    locations = _coalesce(column, _FIELD_ALIASES["location"], size)
+    urls = _coalesce(column, _FIELD_ALIASES["url"], size)
+    is_remote = [
+        r is True or r == "remote"
+        for r in _coalesce(column, _FIELD_ALIASES["remote"], size)
+    ]
+    ext_ids = _coalesce(column, _FIELD_ALIASES["job_id_ext"], size)
+    ids = [i or u for i, u in zip(ext_ids, urls)]
+    hashes = _fingerprint_columns(
+        titles, companies, descriptions, locations, urls, is_remote
+    )
+    return list(
+        map(
+            _new_job_row,
+            zip(
+                repeat(source, size),
+                titles,
+                companies,
+                descriptions,
+                locations,
+                urls,
+                is_remote,
+                ids,
+                hashes,
+            ),
+        )
+    )
+
+
+def collapse_duplicates(rows: list[JobRow]) -> list[JobRow]:
+    """Drop repeated ``(source, job_id_ext)`` rows in one hash pass.
+
+    The last copy of a posting wins but keeps the position of the first, so
+    the batch order is otherwise unchanged. Rows without any id never
+    conflict in Postgres and are all kept.
+    """
+
+    latest: dict[Any, JobRow] = {}
+    for i, row in enumerate(rows):
+        key = i if row.job_id_ext is None else (row.source, row.job_id_ext)
+        latest[key] = row
+    return rows if len(latest) == len(rows) else list(latest.values())
+
+
+def _search_params(
+    source: str, search_term: str | None, google_search_term: str | None
+) -> tuple[str, str | None, int]:
+    """Validate a search request against the environment configuration.
+
+    Returns ``(source, term, delay)`` or raises :class:`HTTPException`.
+    """
 
     if os.getenv("JOBSPY_ENABLED", "false").lower() != "true":
         raise HTTPException(status_code=501, detail="scraping disabled")
@@ -301,28 +668,365 @@ def search_jobs(
                 detail="google_search_term required for Google Jobs",
             )
         logger.info("Scraping Google Jobs with delay=%ss", delay)
-        term = google_search_term
-    else:
-        term = search_term
+        return source_l, google_search_term, delay
+    return source_l, search_term, delay
 
-    cache_key = (source_l, term or "")
-    now = time.time()
-    cached = _CACHE.get(cache_key)
-    if cached and now - cached[0] < CACHE_TTL:
+
+def _bucket_for(source: str, delay: int) -> TokenBucket:
+    """Return the token bucket guarding scrapes of ``source``.
+
+    ``JOBSPY_RATE_LIMITS`` overrides the rate and burst per source; otherwise
+    one scrape is allowed every ``JOBSPY_DELAY_SECONDS``.
+    """
+
+    try:
+        limits = parse_rate_limits(os.getenv("JOBSPY_RATE_LIMITS", ""))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=500, detail="invalid JOBSPY_RATE_LIMITS"
+        ) from exc
+    rate, burst = limits.get(source, (1 / delay if delay else 0.0, 1.0))
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(source)
+        if bucket is None or (bucket.rate, bucket.burst) != (rate, burst):
+            bucket = _BUCKETS[source] = TokenBucket(rate, burst)
+    return bucket
+
+
+def _cache_ttl() -> float:
+    """How long a search result stays in the cache, stale window included."""
+
+    return CACHE_TTL + max(CACHE_STALE_TTL, 0)
+
+
+def _cached_search(
+    source: str,
+    term: str | None,
+    bucket: TokenBucket,
+    cache_key: tuple[str, str],
+) -> tuple[JobSearchResponse, float] | None:
+    """Return a cached result and its age, revalidating it if it is stale."""
+
+    found = _CACHE.lookup(cache_key)
+    if found is None:
+        return None
+    cached, stored_at = found
+    age = max(time.time() - stored_at, 0.0)
+    if age >= CACHE_TTL:
+        _revalidate(source, term, bucket, cache_key)
+    return cached, age
+
+
+def _revalidate(
+    source: str,
+    term: str | None,
+    bucket: TokenBucket,
+    cache_key: tuple[str, str],
+) -> None:
+    """Refresh ``cache_key`` in the background unless a scrape is in flight.
+
+    The refresh registers with ``_INFLIGHT``, so a request that misses while
+    it runs waits for it instead of scraping again.
+    """
+
+    future, leader = _INFLIGHT.join(cache_key)
+    if not leader:
+        return
+
+    async def refresh() -> None:
+        try:
+            response = await _scrape_search(source, term, bucket, cache_key)
+        except BaseException as exc:
+            _INFLIGHT.finish(cache_key, future, exc=exc)
+            if not isinstance(exc, Exception):
+                raise
+            logger.warning("Background refresh of %s failed: %s", cache_key, exc)
+            return
+        _INFLIGHT.finish(cache_key, future, value=response)
+
+    logger.info("Serving stale result for %s while refreshing", cache_key)
+    task = asyncio.create_task(refresh())
+    _REFRESHES.add(task)
+    task.add_done_callback(_REFRESHES.discard)
+
+
+def _age_header(age: float) -> dict[str, str]:
+    return {"Age": str(int(age))}
+
+
+@app.get("/jobs/search", response_class=JSONResponse, response_model=JobSearchResponse)
+async def search_jobs(
+    source: str,
+    response: Response,
+    search_term: str | None = None,
+    google_search_term: str | None = None,
+) -> JobSearchResponse:
+    """Scrape jobs from the requested source.
+
+    The ``Age`` header gives the seconds since the result was scraped.
+    """
+
+    source_l, term, delay = _search_params(source, search_term, google_search_term)
+    bucket = _bucket_for(source_l, delay)
+
+    cache_key = normalize_key(source_l, term)
+    _POPULARITY.record(cache_key)
+    found = _cached_search(source_l, term, bucket, cache_key)
+    if found is not None:
         logger.info("Returning cached result for %s", cache_key)
-        return cached[1]
+        cached, age = found
+        response.headers.update(_age_header(age))
+        return cached
+
+    while True:
+        try:
+            result, shared = await _INFLIGHT.do_async(
+                cache_key, lambda: _scrape_search(source_l, term, bucket, cache_key)
+            )
+            break
+        except _UnsharedStream:
+            continue  # the stream we joined was too large to cache
+    if shared:
+        logger.info("Coalesced search for %s onto in-flight scrape", cache_key)
+    response.headers.update(_age_header(0))
+    return result
+
+
+async def _scrape_search(
+    source: str,
+    term: str | None,
+    bucket: TokenBucket,
+    cache_key: tuple[str, str],
+) -> JobSearchResponse:
+    waited = await bucket.acquire()
+    logger.info("Rate limiter delayed %s scrape by %.2fs", source, waited)
+    return await _fetch_and_cache(source, term, cache_key)
 
-    logger.info("Applied delay of %ss before scrape", delay)
-    time.sleep(delay)
-    limit = BOARD_CONFIG.get(source_l, {}).get("results_wanted_max")
-    raw = scrape_jobs(source_l, search_term=term, results_wanted_max=limit)
+
+async def _fetch_and_cache(
+    source: str, term: str | None, cache_key: tuple[str, str]
+) -> JobSearchResponse:
+    response = await asyncio.to_thread(_fetch_search, source, term)
+    _CACHE.set(cache_key, response, ttl=_cache_ttl())
+    return response
+
+
+async def prewarm_cache(
+    top_n: int, *, lead: float = 0.0, leader: LeaderLock | None = None
+) -> int:
+    """Refresh the ``top_n`` most searched keys of each source ahead of time.
+
+    A key is refreshed if it is not cached or turns stale within ``lead``
+    seconds. Prewarming never waits for a token: once a source's bucket is
+    empty its remaining keys wait for the next round. The tokens it does
+    take come from the same bucket as user searches, so a user miss right
+    after a round may wait for a refill. With a ``leader``, workers that do
+    not hold it skip the round without taking any token, so one round
+    spends one worker's budget rather than one per worker. Returns the
+    number of keys refreshed.
+    """
+
+    if leader is not None and not await asyncio.to_thread(leader.acquire):
+        return 0
+    picked: dict[str, int] = {}
+    exhausted: set[str] = set()
+    refreshed = 0
+    for cache_key, _ in _POPULARITY.ranked():
+        source, term = cache_key
+        if source in exhausted or picked.get(source, 0) >= top_n:
+            continue
+        picked[source] = picked.get(source, 0) + 1
+        stored_at = _CACHE.peek(cache_key)
+        if stored_at is not None and stored_at + CACHE_TTL > time.time() + lead:
+            continue
+        try:
+            _, _, delay = _search_params(source, term, term)
+            bucket = _bucket_for(source, delay)
+        except HTTPException:
+            continue  # scraping of this source has since been disabled
+        if not bucket.try_acquire():
+            exhausted.add(source)
+            continue
+        future, leader = _INFLIGHT.join(cache_key)
+        if not leader:
+            continue
+        try:
+            response = await _fetch_and_cache(source, term or None, cache_key)
+        except Exception as exc:
+            _INFLIGHT.finish(cache_key, future, exc=exc)
+            logger.warning("Prewarming %s failed: %s", cache_key, exc)
+            continue
+        _INFLIGHT.finish(cache_key, future, value=response)
+        refreshed += 1
+    return refreshed
+
+
+def _fetch_raw(source: str, term: str | None) -> list[dict[str, Any]]:
+    limit = BOARD_CONFIG.get(source, {}).get("results_wanted_max")
+    raw = scrape_jobs(source, search_term=term, results_wanted_max=limit)
     raw_jobs = raw.get("jobs", [])
     if limit is not None:
         raw_jobs = raw_jobs[:limit]
-    jobs = [normalize_job(j) for j in raw_jobs]
-    response = JobSearchResponse(source=source_l, jobs=jobs)
-    _CACHE[cache_key] = (time.time(), response)
-    return response
+    return raw_jobs
+
+
+def _fetch_search(source: str, term: str | None) -> JobSearchResponse:
+    jobs = [normalize_job(j) for j in _fetch_raw(source, term)]
+    return JobSearchResponse(source=source, jobs=jobs)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _replay_ndjson(jobs: list[Job]) -> AsyncIterator[str]:
+    for job in jobs:
+        yield job.model_dump_json() + "\n"
+
+
+class _UnsharedStream(Exception):
+    """A streamed scrape ended without a result to share with its followers."""
+
+
+class _NormalizingStream:
+    """Normalize scraped pages while streaming them as NDJSON lines.
+
+    Each page is scraped only once the previous one has been written, so
+    neither the raw pages nor the normalized jobs pile up. Up to
+    ``max_jobs`` jobs are collected and, once the scrape completes, cached
+    and handed to any requests coalesced onto it. A larger result, or one
+    cut short by a disconnecting client, is not cached: the followers are
+    released with :class:`_UnsharedStream` and scrape for themselves.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        first: list[dict[str, Any]],
+        pages: Iterator[list[dict[str, Any]]],
+        cache_key: tuple[str, str],
+        future: Future[JobSearchResponse],
+        *,
+        max_jobs: int,
+    ) -> None:
+        self._source = source
+        self._first = first
+        self._pages = pages
+        self._cache_key = cache_key
+        self._future = future
+        self._max_jobs = max_jobs
+        self._jobs: list[Job] | None = []
+        self._complete = False
+        self._done = False
+
+    async def lines(self) -> AsyncIterator[str]:
+        try:
+            page: list[dict[str, Any]] | None = self._first
+            while page is not None:
+                for raw in page:
+                    job = normalize_job(raw)
+                    self._collect(job)
+                    yield job.model_dump_json() + "\n"
+                page = await asyncio.to_thread(next, self._pages, None)
+            self._complete = True
+        except Exception as exc:
+            self.finish(exc)
+            raise
+        finally:
+            self.finish()
+
+    def _collect(self, job: Job) -> None:
+        if self._jobs is None:
+            return
+        if len(self._jobs) < self._max_jobs:
+            self._jobs.append(job)
+            return
+        # Too large to cache: stop holding jobs and release the followers.
+        self._jobs = None
+        self.finish()
+
+    def finish(self, exc: BaseException | None = None) -> None:
+        if self._done:
+            return
+        self._done = True
+        if exc is None and (self._jobs is None or not self._complete):
+            exc = _UnsharedStream()
+        if exc is not None:
+            _INFLIGHT.finish(self._cache_key, self._future, exc=exc)
+            return
+        assert self._jobs is not None
+        response = JobSearchResponse(source=self._source, jobs=self._jobs)
+        _CACHE.set(self._cache_key, response, ttl=_cache_ttl())
+        _INFLIGHT.finish(self._cache_key, self._future, value=response)
+
+
+@app.get("/jobs/search/stream", response_class=StreamingResponse)
+async def search_jobs_stream(
+    source: str,
+    search_term: str | None = None,
+    google_search_term: str | None = None,
+) -> StreamingResponse:
+    """Stream normalized jobs as newline-delimited JSON.
+
+    Validation, caching and coalescing match ``/jobs/search``; cached results
+    are replayed as a stream.
+    """
+
+    source_l, term, delay = _search_params(source, search_term, google_search_term)
+    bucket = _bucket_for(source_l, delay)
+
+    cache_key = normalize_key(source_l, term)
+    _POPULARITY.record(cache_key)
+    found = _cached_search(source_l, term, bucket, cache_key)
+    while found is None:
+        future, leader = _INFLIGHT.join(cache_key)
+        if leader:
+            break
+        try:
+            found = await asyncio.wrap_future(future), 0.0
+        except _UnsharedStream:
+            continue
+    if found is not None:
+        cached, age = found
+        return StreamingResponse(
+            _replay_ndjson(cached.jobs),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=_age_header(age),
+        )
+
+    try:
+        waited = await bucket.acquire()
+        logger.info("Rate limiter delayed %s scrape by %.2fs", source_l, waited)
+        cfg = BOARD_CONFIG.get(source_l, {})
+        pages = _scrape_pages(
+            source_l,
+            {"results_wanted_max": cfg.get("results_wanted_max")},
+            max(int(cfg.get("page_size") or DEFAULT_PAGE_SIZE), 1),
+            None,
+            search_term=term,
+        )
+        # Scrape the first page before responding so that a failing scrape
+        # still gets an error status rather than an empty stream.
+        first = await asyncio.to_thread(next, pages, [])
+    except BaseException as exc:
+        _INFLIGHT.finish(cache_key, future, exc=exc)
+        raise
+    stream = _NormalizingStream(
+        source_l, first, pages, cache_key, future, max_jobs=STREAM_CACHE_MAX_JOBS
+    )
+    return StreamingResponse(
+        stream.lines(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=_age_header(0),
+        background=BackgroundTask(stream.finish),
+    )
+
+
+@app.get("/jobs/cache/stats")
+def cache_stats() -> dict[str, Any]:
+    """Report search cache occupancy plus in-flight scrape coalescing."""
+
+    _CACHE.purge_expired()
+    return {**_CACHE.stats(), **_INFLIGHT.stats()}
 
 
 def _interval_for(board: str) -> float:
@@ -330,37 +1034,446 @@ def _interval_for(board: str) -> float:
     return 4 * 3600 if cadence == "4h" else 24 * 3600
 
 
-def _due(board: str, *, now: float | None = None) -> bool:
-    now = now or time.time()
+def _recorded_run(board: str) -> float | None:
+    """Timestamp of the newest run recorded in the database for ``board``."""
+
+    try:
+        with _pg_conn() as conn, conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT EXTRACT(EPOCH FROM MAX(timestamp))
+                FROM ingestion_runs WHERE board = %s
+                """,
+                (board,),
+            )
+            row = cur.fetchone()
+        return float(row[0]) if row and row[0] is not None else None
+    except Exception:  # pragma: no cover - best effort
+        return None
+
+
+def _last_run(board: str) -> float | None:
+    """Last run timestamp for ``board``, falling back to the database."""
+
     last = _LAST_RUN.get(board)
     if last is None:
+        last = _LAST_RUN[board] = _recorded_run(board)
+    return last
+
+
+def _last_success(board: str) -> float | None:
+    """Timestamp of the last run of ``board`` whose rows were all committed."""
+
+    last = _LAST_SUCCESS.get(board)
+    if last is None:
+        last = _LAST_SUCCESS[board] = _recorded_run(board)
+    return last
+
+
+def _scrape_window(board: str, cfg: dict[str, Any], now: float) -> int | None:
+    """``hours_old`` to scrape: back to the last success plus the overlap.
+
+    The overlap absorbs postings indexed late and the time the previous run
+    spent scraping before it was timestamped. ``hours_old`` from the board
+    config caps the window and is used as is until a run has succeeded.
+    """
+
+    ceiling = cfg.get("hours_old")
+    last = _last_success(board)
+    if last is None:
+        return ceiling
+    overlap = cfg.get("window_overlap_hours", DEFAULT_WINDOW_OVERLAP_HOURS)
+    hours = max(math.ceil((now - last) / 3600 + overlap), 1)
+    return hours if ceiling is None else min(hours, ceiling)
+
+
+def _rows_saved(fetched: int, hours_old: int | None, cfg: dict[str, Any]) -> int:
+    """Estimate the rows a full ``hours_old`` window would have re-fetched.
+
+    Assumes postings arrive evenly over time, and never counts beyond the
+    board's ``results_wanted_max``.
+    """
+
+    ceiling = cfg.get("hours_old")
+    if not hours_old or ceiling is None or hours_old >= ceiling:
+        return 0
+    full = round(fetched * ceiling / hours_old)
+    limit = cfg.get("results_wanted_max")
+    if limit is not None:
+        full = min(full, limit)
+    return max(full - fetched, 0)
+
+
+def _due_at(board: str) -> float | None:
+    """When ``board`` next falls due, or ``None`` if it has never run."""
+
+    last = _last_run(board)
+    return None if last is None else last + _interval_for(board)
+
+
+def _due(board: str, *, now: float | None = None) -> bool:
+    now = now or time.time()
+    due_at = _due_at(board)
+    return due_at is None or now >= due_at
+
+
+# Rows whose content hash is unchanged are left untouched: no new tuple, no
+# WAL and no ``updated_at`` bump. Such rows are not returned by RETURNING.
+_UPSERT_ASSIGNMENTS = """
+    title = EXCLUDED.title,
+    company = EXCLUDED.company,
+    description = EXCLUDED.description,
+    location = EXCLUDED.location,
+    url = EXCLUDED.url,
+    is_remote = EXCLUDED.is_remote,
+    content_hash = EXCLUDED.content_hash,
+    updated_at = NOW()
+WHERE jobs_normalized.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+"""
+
+
+@dataclass
+class PersistResult:
+    """Outcome counts of persisting one batch of normalized jobs."""
+
+    unique_new: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+
+def _upsert_rows(cur: PGCursor, jobs: list[JobRow]) -> PersistResult:
+    """Upsert ``jobs`` one statement at a time."""
+
+    result = PersistResult()
+    for job in jobs:
+        cur.execute(
+            f"""
+            INSERT INTO jobs_normalized
+                (source, title, company, description, location, url,
+                 is_remote, job_id_ext, content_hash)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (source, job_id_ext) DO UPDATE SET
+                {_UPSERT_ASSIGNMENTS}
+            RETURNING xmax = 0
+            """,
+            job,
+        )
+        row = cur.fetchone()
+        if row is None:
+            result.unchanged += 1
+        elif row[0]:
+            result.unique_new += 1
+    return result
+
+
+def _upsert_bulk(
+    cur: PGCursor, jobs: list[JobRow], chunk_size: int
+) -> PersistResult:
+    """Upsert ``jobs`` with one multi-row statement per chunk.
+
+    Rows are tagged with their batch position so that ``DISTINCT ON`` can keep
+    the last copy of a ``(source, job_id_ext)`` pair; Postgres refuses to
+    update the same row twice within a single ``ON CONFLICT`` statement.
+    """
+
+    result = PersistResult()
+    for start in range(0, len(jobs), chunk_size):
+        chunk = jobs[start : start + chunk_size]
+        values = ", ".join(
+            ["(%s::integer, %s, %s, %s, %s, %s, %s, %s::boolean, %s, %s)"]
+            * len(chunk)
+        )
+        params: list[Any] = []
+        for offset, job in enumerate(chunk):
+            params.append(start + offset)
+            params.extend(job)
+        cur.execute(
+            f"""
+            INSERT INTO jobs_normalized
+                (source, title, company, description, location, url,
+                 is_remote, job_id_ext, content_hash)
+            SELECT DISTINCT ON (source, job_id_ext)
+                source, title, company, description, location, url,
+                is_remote, job_id_ext, content_hash
+            FROM (VALUES {values}) AS v
+                (ord, source, title, company, description, location, url,
+                 is_remote, job_id_ext, content_hash)
+            ORDER BY source, job_id_ext, ord DESC
+            ON CONFLICT (source, job_id_ext) DO UPDATE SET
+                {_UPSERT_ASSIGNMENTS}
+            RETURNING xmax = 0
+            """,
+            params,
+        )
+        written = cur.fetchall()
+        distinct = len({(job.source, job.job_id_ext) for job in chunk})
+        result.unique_new += sum(1 for (inserted,) in written if inserted)
+        result.unchanged += distinct - len(written)
+    return result
+
+
+def _persist_jobs(
+    cur: PGCursor, jobs: list[JobRow], cfg: dict[str, Any]
+) -> PersistResult:
+    """Write normalized jobs using the board's configured persistence mode."""
+
+    if not jobs:
+        return PersistResult()
+    mode = cfg.get("persist_mode", DEFAULT_PERSIST_MODE)
+    if mode == "row":
+        return _upsert_rows(cur, jobs)
+    if mode != "bulk":
+        raise ValueError(f"unknown persist_mode: {mode}")
+    chunk_size = int(cfg.get("chunk_size") or DEFAULT_CHUNK_SIZE)
+    return _upsert_bulk(cur, jobs, max(chunk_size, 1))
+
+
+# Errors that mean the connection is gone rather than that a row was rejected.
+_CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+def _persist_chunk(
+    cur: PGCursor, jobs: list[JobRow], cfg: dict[str, Any]
+) -> PersistResult:
+    """Persist ``jobs``, skipping and counting rows the database rejects.
+
+    The chunk is written in one go under a savepoint. If Postgres rejects
+    it, the chunk is replayed row by row, each under its own savepoint, so
+    one bad row costs only itself.
+    """
+
+    cur.execute("SAVEPOINT persist_chunk")
+    try:
+        result = _persist_jobs(cur, jobs, cfg)
+    except _CONNECTION_ERRORS:
+        raise
+    except psycopg2.DatabaseError as exc:
+        logger.warning("chunk rejected, retrying row by row: %s", exc)
+        cur.execute("ROLLBACK TO SAVEPOINT persist_chunk")
+    else:
+        cur.execute("RELEASE SAVEPOINT persist_chunk")
+        return result
+    result = PersistResult()
+    for job in jobs:
+        cur.execute("SAVEPOINT persist_row")
         try:
-            conn = _pg_connect()
-            with conn, conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT EXTRACT(EPOCH FROM MAX(timestamp))
-                    FROM ingestion_runs WHERE board = %s
-                    """,
-                    (board,),
-                )
-                row = cur.fetchone()
-            last = row[0] if row and row[0] is not None else None
-        except Exception:  # pragma: no cover - best effort
-            last = None
-        _LAST_RUN[board] = last
-    return last is None or now - last >= _interval_for(board)
+            row_result = _upsert_rows(cur, [job])
+        except _CONNECTION_ERRORS:
+            raise
+        except psycopg2.DatabaseError as exc:
+            cur.execute("ROLLBACK TO SAVEPOINT persist_row")
+            result.failed += 1
+            logger.warning(
+                "row rejected",
+                extra={"board": job.source, "job_id_ext": job.job_id_ext, "error": exc},
+            )
+            continue
+        cur.execute("RELEASE SAVEPOINT persist_row")
+        result.unique_new += row_result.unique_new
+        result.unchanged += row_result.unchanged
+    cur.execute("RELEASE SAVEPOINT persist_chunk")
+    return result
 
 
-def ingest_board(board: str, *, now: float | None = None) -> IngestionRun:
-    run_id = str(uuid.uuid4())
-    start_all = perf_counter()
-    cfg = BOARD_CONFIG[board]
+@dataclass
+class _Checkpoint(PersistResult):
+    """Rows of a run committed so far and their outcome counts."""
+
+    committed: int = 0
+
+
+def _open_checkpoint(conn: psycopg2.extensions.connection, run: IngestionRun) -> None:
+    with conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO ingestion_checkpoints (run_id, board, status)
+            VALUES (%s, %s, 'running')
+            """,
+            (run.run_id, run.board),
+        )
+
+
+def _commit_chunk(
+    conn: psycopg2.extensions.connection,
+    run_id: str,
+    checkpoint: _Checkpoint,
+    jobs: list[JobRow],
+    cfg: dict[str, Any],
+) -> None:
+    """Persist ``jobs`` in their own transaction and advance ``checkpoint``."""
+
+    with conn, conn.cursor() as cur:
+        result = _persist_chunk(cur, jobs, cfg)
+        cur.execute(
+            """
+            UPDATE ingestion_checkpoints
+            SET committed = %s, unique_new = %s, unchanged = %s,
+                failed_rows = %s, updated_at = NOW()
+            WHERE run_id = %s
+            """,
+            (
+                checkpoint.committed + len(jobs),
+                checkpoint.unique_new + result.unique_new,
+                checkpoint.unchanged + result.unchanged,
+                checkpoint.failed + result.failed,
+                run_id,
+            ),
+        )
+    checkpoint.committed += len(jobs)
+    checkpoint.unique_new += result.unique_new
+    checkpoint.unchanged += result.unchanged
+    checkpoint.failed += result.failed
+
+
+def _complete_run(
+    conn: psycopg2.extensions.connection,
+    run: IngestionRun,
+    checkpoint: _Checkpoint,
+) -> None:
+    """Record ``run`` with the checkpoint's totals and close the checkpoint.
+
+    Any rows spooled for the run are no longer needed once it is complete.
+    """
+
+    run.unique_new = checkpoint.unique_new
+    run.unchanged = checkpoint.unchanged
+    run.failed_rows = checkpoint.failed
+    with conn, conn.cursor() as cur:
+        _record_run(cur, run)
+        cur.execute(
+            """
+            UPDATE ingestion_checkpoints
+            SET status = 'complete', updated_at = NOW()
+            WHERE run_id = %s
+            """,
+            (run.run_id,),
+        )
+    RunSpool(_spool_dir(), run.run_id).remove()
+    # A resumed run may complete after a newer one did.
+    _LAST_SUCCESS[run.board] = max(run.timestamp, _LAST_SUCCESS.get(run.board) or 0)
+
+
+def _set_checkpoint_status(run_id: str, status: str) -> None:
+    """Best-effort status update on a fresh connection."""
+
+    try:
+        with _pg_conn() as conn, conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE ingestion_checkpoints
+                SET status = %s, updated_at = NOW()
+                WHERE run_id = %s
+                """,
+                (status, run_id),
+            )
+    except Exception as exc:  # pragma: no cover - best effort
+        logger.warning("could not mark run %s %s: %s", run_id, status, exc)
+
+
+def _spool_dir() -> str:
+    return os.getenv("INGEST_SPOOL_DIR", "/tmp/jobspy_spool")
+
+
+def _suspend_run(
+    run: IngestionRun,
+    checkpoint: _Checkpoint,
+    pending: Iterable[JobRow],
+    exc: Exception,
+    *,
+    finish: Callable[[], None] | None = None,
+) -> None:
+    """Spool the rows not yet committed so the run can be resumed later.
+
+    ``finish`` is called once ``pending`` has been consumed, for runs whose
+    totals are only known after that; the spooled snapshot is then updated.
+    """
+
+    run.errors += 1
+    run.unique_new = checkpoint.unique_new
+    run.unchanged = checkpoint.unchanged
+    run.failed_rows = checkpoint.failed
+    spool = RunSpool(_spool_dir(), run.run_id)
+    try:
+        spooled = spool.write(checkpoint.committed, run.model_dump(), pending)
+    finally:
+        if finish is not None:
+            finish()
+    if finish is not None:
+        spool.update_run(run.model_dump())
+    _set_checkpoint_status(run.run_id, "failed")
+    logger.warning(
+        "persistence interrupted after %d rows, %d spooled for resume: %s",
+        checkpoint.committed,
+        spooled,
+        exc,
+        extra={"run_id": run.run_id, "board": run.board, "status": "error"},
+    )
+
+
+def _batched(rows: Iterable[JobRow], size: int) -> Iterator[list[JobRow]]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _record_run(cur: PGCursor, run: IngestionRun) -> None:
+    """Insert ``run`` and its stage timings in the caller's transaction."""
+
+    cur.execute(
+        """
+        INSERT INTO ingestion_runs
+            (run_id, board, fetched, normalized, unique_new, errors,
+             unchanged, scheduling_lag, failed_rows, hours_old, rows_saved,
+             collapsed, timestamp)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, TO_TIMESTAMP(%s))
+        """,
+        (
+            run.run_id,
+            run.board,
+            run.fetched,
+            run.normalized,
+            run.unique_new,
+            run.errors,
+            run.unchanged,
+            run.scheduling_lag,
+            run.failed_rows,
+            run.hours_old,
+            run.rows_saved,
+            run.collapsed,
+            run.timestamp,
+        ),
+    )
+    if run.stages:
+        cur.executemany(
+            """
+            INSERT INTO ingestion_run_stages
+                (run_id, stage, duration, rows, rows_per_second)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            [
+                (run.run_id, s.stage, s.duration, s.rows, s.rows_per_second)
+                for s in run.stages
+            ],
+        )
+
+
+def _ingest_sequential(
+    run_id: str,
+    board: str,
+    cfg: dict[str, Any],
+    *,
+    now: float | None,
+    lag: float | None,
+    hours_old: int | None,
+) -> IngestionRun:
+    """Run each stage over the board's complete result set in turn."""
+
     limit = cfg.get("results_wanted_max")
-    with _log_stage(run_id, board, "scrape"):
+    stages: list[StageTiming] = []
+    with _log_stage(run_id, board, "scrape", stages) as scraped:
         raw = scrape_jobs(
             board,
-            hours_old=cfg.get("hours_old"),
+            hours_old=hours_old,
             results_wanted_max=limit,
             country=cfg.get("country"),
             delay=cfg.get("delay"),
@@ -368,81 +1481,267 @@ def ingest_board(board: str, *, now: float | None = None) -> IngestionRun:
         jobs = raw.get("jobs", [])
         if limit is not None:
             jobs = jobs[:limit]
-    with _log_stage(run_id, board, "normalize"):
-        normalized_jobs = [normalize_for_db(board, j) for j in jobs]
-    unique_new = 0
-    errors = 0
-    ts = now or time.time()
-    conn: psycopg2.extensions.connection | None = None
-    with _log_stage(run_id, board, "persist"):
-        try:
-            conn = _pg_connect()
-            with conn:
-                with conn.cursor() as cur:
-                    _ensure_jobs_table(cur)
-                    _ensure_ingestion_runs_table(cur)
-                    for job in normalized_jobs:
-                        cur.execute(
-                            """
-                            INSERT INTO jobs_normalized
-                                (source, title, company, description, location, url,
-                                 is_remote, job_id_ext)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (source, job_id_ext) DO UPDATE SET
-                                title = EXCLUDED.title,
-                                company = EXCLUDED.company,
-                                description = EXCLUDED.description,
-                                location = EXCLUDED.location,
-                                url = EXCLUDED.url,
-                                is_remote = EXCLUDED.is_remote,
-                                updated_at = NOW()
-                            RETURNING xmax = 0
-                            """,
-                            (
-                                job["source"],
-                                job["title"],
-                                job["company"],
-                                job["description"],
-                                job["location"],
-                                job["url"],
-                                job["is_remote"],
-                                job["job_id_ext"],
-                            ),
-                        )
-                        if cur.fetchone()[0]:
-                            unique_new += 1
-                    cur.execute(
-                        """
-                        INSERT INTO ingestion_runs
-                            (run_id, board, fetched, normalized, unique_new, errors,
-                             timestamp)
-                        VALUES (%s, %s, %s, %s, %s, %s, TO_TIMESTAMP(%s))
-                        """,
-                        (
-                            run_id,
-                            board,
-                            len(jobs),
-                            len(normalized_jobs),
-                            unique_new,
-                            errors,
-                            ts,
-                        ),
-                    )
-        except Exception as exc:  # pragma: no cover - best effort
-            errors += 1
-            logger.warning("database unavailable, skipping persistence: %s", exc)
-        finally:
-            if conn is not None:
-                conn.close()
+        scraped["rows"] = len(jobs)
+    _archive_raw(run_id, board, jobs, now or time.time(), stages)
+    with _log_stage(run_id, board, "normalize", stages) as normalized:
+        normalized_jobs = normalize_batch(board, jobs)
+        normalized["rows"] = len(normalized_jobs)
+    with _log_stage(run_id, board, "collapse", stages) as collapsed:
+        unique_jobs = collapse_duplicates(normalized_jobs)
+        collapsed["rows"] = len(normalized_jobs)
     run = IngestionRun(
         run_id=run_id,
         board=board,
         fetched=len(jobs),
         normalized=len(normalized_jobs),
-        unique_new=unique_new,
-        errors=errors,
-        timestamp=ts,
+        collapsed=len(normalized_jobs) - len(unique_jobs),
+        unique_new=0,
+        errors=0,
+        timestamp=now or time.time(),
+        scheduling_lag=lag,
+        stages=stages,
+        hours_old=hours_old,
+        rows_saved=_rows_saved(len(jobs), hours_old, cfg),
+    )
+    commit_size = max(int(cfg.get("commit_size") or DEFAULT_COMMIT_SIZE), 1)
+    checkpoint = _Checkpoint()
+    try:
+        with _pg_conn() as conn:
+            _ensure_schema(conn)
+            _open_checkpoint(conn, run)
+            with _log_stage(run_id, board, "persist", run.stages) as persist:
+                for chunk in _batched(unique_jobs, commit_size):
+                    _commit_chunk(conn, run_id, checkpoint, chunk, cfg)
+                persist["rows"] = len(unique_jobs)
+            _complete_run(conn, run, checkpoint)
+    except Exception as exc:  # pragma: no cover - best effort
+        _suspend_run(run, checkpoint, unique_jobs[checkpoint.committed :], exc)
+    return run
+
+
+def _raw_records(jobs: Any) -> Any:
+    """Raw jobs as dicts, whether the scraper returned a list or a DataFrame."""
+
+    return jobs.to_dict("records") if hasattr(jobs, "to_dict") else jobs
+
+
+def _open_archive(board: str, run_id: str, ts: float) -> ArchiveWriter | None:
+    """Writer for this run's raw payload, if ``INGEST_ARCHIVE_DIR`` is set."""
+
+    root = os.getenv("INGEST_ARCHIVE_DIR")
+    if not root:
+        return None
+    try:
+        return RawArchive(root).writer(board, run_id, ts)
+    except OSError as exc:
+        logger.warning("could not open raw archive: %s", exc)
+        return None
+
+
+def _archive_raw(
+    run_id: str, board: str, jobs: Any, ts: float, stages: list[StageTiming]
+) -> None:
+    """Best-effort copy of a run's raw scrape into the archive."""
+
+    writer = _open_archive(board, run_id, ts)
+    if writer is None:
+        return
+    try:
+        with _log_stage(run_id, board, "archive", stages) as archived:
+            writer.write(_raw_records(jobs))
+            writer.close()
+            archived["rows"] = writer.rows
+    except OSError as exc:
+        writer.abort()
+        logger.warning("could not archive raw scrape: %s", exc)
+
+
+def _archived_pages(
+    pages: Iterable[list[dict[str, Any]]], writer: ArchiveWriter | None
+) -> Iterator[list[dict[str, Any]]]:
+    """Pass ``pages`` through, copying each into the archive on the way.
+
+    The archive is only published if every page was written; an archive
+    error is logged and archiving stops, but the pages keep flowing.
+    """
+
+    complete = False
+    try:
+        for page in pages:
+            if writer is not None:
+                try:
+                    writer.write(_raw_records(page))
+                except OSError as exc:
+                    logger.warning("could not archive raw scrape: %s", exc)
+                    writer.abort()
+                    writer = None
+            yield page
+        complete = True
+    finally:
+        if writer is not None and not complete:
+            writer.abort()
+        elif writer is not None:
+            try:
+                writer.close()
+            except OSError as exc:
+                logger.warning("could not archive raw scrape: %s", exc)
+
+
+def _scrape_pages(
+    board: str,
+    cfg: dict[str, Any],
+    page_size: int,
+    hours_old: int | None,
+    *,
+    search_term: str | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield up to ``results_wanted_max`` jobs, ``page_size`` at a time."""
+
+    limit = cfg.get("results_wanted_max")
+    offset = 0
+    while limit is None or offset < limit:
+        wanted = page_size if limit is None else min(page_size, limit - offset)
+        raw = scrape_jobs(
+            board,
+            search_term=search_term,
+            hours_old=hours_old,
+            results_wanted_max=wanted,
+            country=cfg.get("country"),
+            delay=cfg.get("delay"),
+            offset=offset,
+        )
+        page = raw.get("jobs", [])[:wanted]
+        if page:
+            yield page
+        if len(page) < wanted:
+            return
+        offset += len(page)
+
+
+def _ingest_pipelined(
+    run_id: str,
+    board: str,
+    cfg: dict[str, Any],
+    *,
+    now: float | None,
+    lag: float | None,
+    hours_old: int | None,
+) -> IngestionRun:
+    """Scrape, normalize and persist page by page with the stages overlapped.
+
+    Each page is committed as one checkpointed chunk. If scraping fails part
+    way through, the pages already committed stay and the run is aborted.
+    Because the stages overlap, the run is timestamped when it starts, and
+    time spent archiving raw pages counts towards the scrape stage, as does
+    collapsing duplicates, which happens within each page, towards normalize.
+    """
+
+    page_size = max(int(cfg.get("page_size") or DEFAULT_PAGE_SIZE), 1)
+    depth = max(int(cfg.get("queue_depth") or DEFAULT_QUEUE_DEPTH), 1)
+    run = IngestionRun(
+        run_id=run_id,
+        board=board,
+        fetched=0,
+        normalized=0,
+        unique_new=0,
+        errors=0,
+        timestamp=now or time.time(),
+        scheduling_lag=lag,
+        hours_old=hours_old,
+    )
+
+    def normalize_page(page: list[dict[str, Any]]) -> list[JobRow]:
+        rows = normalize_batch(board, page)
+        unique = collapse_duplicates(rows)
+        run.collapsed += len(rows) - len(unique)
+        return unique
+
+    pipeline: StagedPipeline[list[dict[str, Any]], list[JobRow]] = StagedPipeline(
+        lambda: _archived_pages(
+            _scrape_pages(board, cfg, page_size, hours_old),
+            _open_archive(board, run_id, run.timestamp),
+        ),
+        normalize_page,
+        names=("scrape", "normalize"),
+        depth=depth,
+    )
+    persist_busy = 0.0
+    checkpoint = _Checkpoint()
+    pending: list[JobRow] = []
+    with pipeline:
+        try:
+            with _pg_conn() as conn:
+                _ensure_schema(conn)
+                _open_checkpoint(conn, run)
+                for pending in pipeline:
+                    start = perf_counter()
+                    _commit_chunk(conn, run_id, checkpoint, pending, cfg)
+                    persist_busy += perf_counter() - start
+                pending = []
+                _finish_pipelined(run, pipeline, persist_busy)
+                _complete_run(conn, run, checkpoint)
+        except Exception as exc:  # pragma: no cover - best effort
+            if exc is pipeline.error:
+                _set_checkpoint_status(run_id, "aborted")
+                raise
+            # Spool the page in flight and drain the rest of the pipeline, so
+            # fetched/normalized still count every page.
+            rest = chain(pending, chain.from_iterable(pipeline))
+            _suspend_run(
+                run,
+                checkpoint,
+                rest,
+                exc,
+                finish=partial(_finish_pipelined, run, pipeline, None),
+            )
+    return run
+
+
+def _finish_pipelined(
+    run: IngestionRun,
+    pipeline: StagedPipeline[Any, Any],
+    persist_busy: float | None,
+) -> None:
+    """Copy exact totals and busy-time stage timings from ``pipeline``."""
+
+    run.fetched = pipeline.rows["scrape"]
+    run.normalized = pipeline.rows["normalize"] + run.collapsed
+    run.rows_saved = _rows_saved(
+        run.fetched, run.hours_old, BOARD_CONFIG.get(run.board, {})
     )
+    run.stages = [
+        _stage_timing(stage, pipeline.busy[stage], pipeline.rows[stage])
+        for stage in ("scrape", "normalize")
+    ]
+    if persist_busy is not None:
+        persisted = run.normalized - run.collapsed
+        run.stages.append(_stage_timing("persist", persist_busy, persisted))
+    for timing in run.stages:
+        _log_stage_timing(run.run_id, run.board, timing)
+
+
+def ingest_board(
+    board: str, *, now: float | None = None, due_at: float | None = None
+) -> IngestionRun:
+    """Scrape, normalize and persist ``board`` once.
+
+    ``due_at`` is the time the scheduler wanted the run to start; the
+    difference to the actual start is recorded as ``scheduling_lag``.
+    """
+
+    run_id = str(uuid.uuid4())
+    start_all = perf_counter()
+    lag = None if due_at is None else time.time() - due_at
+    cfg = BOARD_CONFIG[board]
+    mode = cfg.get("ingest_mode", DEFAULT_INGEST_MODE)
+    hours_old = _scrape_window(board, cfg, now or time.time())
+    if mode == "sequential":
+        ingest = _ingest_sequential
+    elif mode == "pipelined":
+        ingest = _ingest_pipelined
+    else:
+        raise ValueError(f"unknown ingest_mode: {mode}")
+    run = ingest(run_id, board, cfg, now=now, lag=lag, hours_old=hours_old)
     INGESTION_RUNS.append(run)
     _LAST_RUN[board] = run.timestamp
     logger.info(
@@ -452,19 +1751,149 @@ def ingest_board(board: str, *, now: float | None = None) -> IngestionRun:
             "board": board,
             "stage": "complete",
             "duration": perf_counter() - start_all,
+            "hours_old": run.hours_old,
+            "rows_saved": run.rows_saved,
             "status": "ok",
         },
     )
     return run
 
 
-def run_all_due(*, now: float | None = None) -> list[IngestionRun]:
-    runs: list[IngestionRun] = []
+_DEDUPE_INDEX: Any = None
+_DEDUPE_INDEX_LOCK = threading.Lock()
+_DEDUPE_INDEX_PAGE = 1000
+# ``updated_at`` is the transaction start time, so a row can commit after the
+# watermark has passed it. Rows this far behind the watermark are re-read and
+# added if they are not indexed yet.
+_DEDUPE_INDEX_OVERLAP = timedelta(seconds=60)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def update_dedupe_index(path: str | None = None) -> int:
+    """Add jobs changed since the last update to the dedupe ANN index.
+
+    The index at ``path`` (default ``DEDUPE_INDEX_PATH``) is keyed by
+    ``jobs_normalized.id`` and remembers the newest ``updated_at`` it has
+    seen, so each call only embeds new and edited postings. Returns the
+    number of embeddings added.
+    """
+
+    global _DEDUPE_INDEX
+    path = path or os.getenv("DEDUPE_INDEX_PATH")
+    if not path:
+        return 0
+    # Imported lazily: loading the embedding model is expensive.
+    from . import dedupe
+    from .ann import IVFIndex
+
+    batch_size = max(dedupe.DedupConfig.from_env().embed_batch_size, 1)
+    with _DEDUPE_INDEX_LOCK:
+        index = _DEDUPE_INDEX
+        if index is None and os.path.exists(path):
+            index = IVFIndex.load(path)
+        watermark = _EPOCH
+        if index is not None and "watermark" in index.metadata:
+            watermark = datetime.fromisoformat(index.metadata["watermark"])
+        start = max(watermark - _DEDUPE_INDEX_OVERLAP, _EPOCH)
+        cursor: tuple[datetime, int] = (start, 0)
+        newest, added = watermark, 0
+        while True:
+            with _pg_conn() as conn, conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, updated_at, title, description
+                    FROM jobs_normalized
+                    WHERE (updated_at, id) > (%s, %s)
+                    ORDER BY updated_at, id
+                    LIMIT %s
+                    """,
+                    (*cursor, _DEDUPE_INDEX_PAGE),
+                )
+                rows = cur.fetchall()
+            if not rows:
+                break
+            cursor = (rows[-1][1], rows[-1][0])
+            fresh = [
+                row
+                for row in rows
+                if row[1] > watermark or index is None or str(row[0]) not in index
+            ]
+            if fresh:
+                vectors = dedupe._embed_batch(
+                    [{"title": r[2], "description": r[3]} for r in fresh],
+                    batch_size,
+                )
+                if index is None:
+                    index = IVFIndex(len(vectors[0]))
+                index.add([str(r[0]) for r in fresh], vectors)
+                added += len(fresh)
+            newest = max(newest, cursor[0])
+            if len(rows) < _DEDUPE_INDEX_PAGE:
+                break
+        if index is None:
+            return 0
+        if added or newest > watermark:
+            index.metadata["watermark"] = newest.isoformat()
+            index.save(path)
+        _DEDUPE_INDEX = index
+    return added
+
+
+def _ingest_isolated(
+    board: str, now: float | None, due_at: float | None = None
+) -> IngestionRun | None:
+    """Run ``ingest_board`` and log, rather than raise, any failure."""
+
+    try:
+        return ingest_board(board, now=now, due_at=due_at)
+    except Exception:
+        logger.exception(
+            "ingest failed",
+            extra={"board": board, "stage": "complete", "status": "error"},
+        )
+        return None
+
+
+def _run_boards(
+    due: list[tuple[str, float | None]],
+    *,
+    now: float | None = None,
+    max_workers: int | None = None,
+) -> list[IngestionRun]:
+    """Ingest ``(board, due_at)`` pairs, up to ``max_workers`` at a time."""
+
+    if max_workers is None:
+        max_workers = int(os.getenv("INGEST_MAX_CONCURRENT_BOARDS", "4"))
+    workers = max(1, min(max_workers, len(due)))
+    if workers == 1:
+        results = [_ingest_isolated(board, now, due_at) for board, due_at in due]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ingest"
+        ) as pool:
+            results = list(
+                pool.map(lambda item: _ingest_isolated(item[0], now, item[1]), due)
+            )
+    return [run for run in results if run is not None]
+
+
+def run_all_due(
+    *, now: float | None = None, max_workers: int | None = None
+) -> list[IngestionRun]:
+    """Ingest every enabled board that is due.
+
+    Up to ``max_workers`` boards (``INGEST_MAX_CONCURRENT_BOARDS`` by default)
+    are scraped and persisted in parallel. A board that raises is logged and
+    skipped so it cannot prevent the remaining boards from completing.
+    """
+
     now = now or time.time()
-    for board, cfg in BOARD_CONFIG.items():
-        if cfg.get("enabled") and _due(board, now=now):
-            runs.append(ingest_board(board, now=now))
-    return runs
+    due = [
+        (board, _due_at(board))
+        for board, cfg in BOARD_CONFIG.items()
+        if cfg.get("enabled") and _due(board, now=now)
+    ]
+    return _run_boards(due, now=now, max_workers=max_workers)
 
 
 @app.post("/ingest/run", response_model=IngestionRun)
@@ -476,36 +1905,412 @@ async def run_single(board: str) -> IngestionRun:
     return await asyncio.to_thread(ingest_board, board)
 
 
+MAX_RUNS_PAGE = 1000
+
+
 @app.get("/ingest/runs", response_model=list[IngestionRun])
-def list_runs(limit: int = 100) -> list[IngestionRun]:
+def list_runs(
+    limit: int = 100,
+    board: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+    before_ts: float | None = None,
+    before_id: str | None = None,
+    after_ts: float | None = None,
+    after_id: str | None = None,
+) -> list[IngestionRun]:
+    """Return runs newest first, one keyset page at a time.
+
+    Pass the ``timestamp`` and ``run_id`` of the last run on a page as
+    ``before_ts``/``before_id`` to fetch the next (older) page, or those of
+    the first run as ``after_ts``/``after_id`` to fetch the previous one.
+    ``since`` and ``until`` bound the timestamp (inclusive/exclusive).
+    """
+
+    if not 1 <= limit <= MAX_RUNS_PAGE:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be between 1 and {MAX_RUNS_PAGE}"
+        )
+    if before_ts is not None and after_ts is not None:
+        raise HTTPException(
+            status_code=400, detail="before_ts and after_ts are mutually exclusive"
+        )
+    if (before_id and before_ts is None) or (after_id and after_ts is None):
+        raise HTTPException(
+            status_code=400, detail="a cursor run_id requires its timestamp"
+        )
+    try:
+        # Canonical form, so in-memory string order matches Postgres UUID order.
+        before_id, after_id = (
+            None if run_id is None else str(uuid.UUID(run_id))
+            for run_id in (before_id, after_id)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="invalid cursor run_id") from exc
+    clauses: list[str] = []
+    params: list[Any] = []
+    if board is not None:
+        clauses.append("board = %s")
+        params.append(board)
+    if since is not None:
+        clauses.append("timestamp >= TO_TIMESTAMP(%s)")
+        params.append(since)
+    if until is not None:
+        clauses.append("timestamp < TO_TIMESTAMP(%s)")
+        params.append(until)
+    for ts, run_id, op in ((before_ts, before_id, "<"), (after_ts, after_id, ">")):
+        if ts is None:
+            continue
+        if run_id is None:
+            clauses.append(f"timestamp {op} TO_TIMESTAMP(%s)")
+            params.append(ts)
+        else:
+            clauses.append(f"(timestamp, run_id) {op} (TO_TIMESTAMP(%s), %s::uuid)")
+            params.extend((ts, run_id))
+    # Walking forward from an ``after`` cursor scans ascending; the page is
+    # flipped back to newest-first below.
+    direction = "ASC" if after_ts is not None else "DESC"
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     try:
-        conn = _pg_connect()
-        with conn, conn.cursor() as cur:
+        with _pg_conn() as conn, conn, conn.cursor() as cur:
             cur.execute(
-                """
+                f"""
                 SELECT run_id, board, fetched, normalized, unique_new, errors,
-                       EXTRACT(EPOCH FROM timestamp)
+                       EXTRACT(EPOCH FROM timestamp), unchanged, scheduling_lag,
+                       failed_rows, hours_old, rows_saved, collapsed
                 FROM ingestion_runs
-                ORDER BY timestamp DESC
+                {where}
+                ORDER BY timestamp {direction}, run_id {direction}
                 LIMIT %s
                 """,
-                (limit,),
+                (*params, limit),
             )
             rows = cur.fetchall()
+            stages = _load_stages(cur, [str(r[0]) for r in rows])
+        if after_ts is not None:
+            rows.reverse()
         return [
             IngestionRun(
-                run_id=r[0],
+                run_id=str(r[0]),
                 board=r[1],
                 fetched=r[2],
                 normalized=r[3],
                 unique_new=r[4],
                 errors=r[5],
                 timestamp=r[6],
+                unchanged=r[7],
+                scheduling_lag=r[8],
+                failed_rows=r[9],
+                hours_old=r[10],
+                rows_saved=r[11],
+                collapsed=r[12],
+                stages=stages.get(str(r[0]), []),
             )
             for r in rows
         ]
     except Exception:  # pragma: no cover - fallback to memory
-        return INGESTION_RUNS[-limit:]
+        return _page_in_memory(
+            limit,
+            board=board,
+            since=since,
+            until=until,
+            before=None if before_ts is None else (before_ts, before_id),
+            after=None if after_ts is None else (after_ts, after_id),
+        )
+
+
+def _run_key(run: IngestionRun) -> tuple[float, str]:
+    return run.timestamp, run.run_id
+
+
+def _page_in_memory(
+    limit: int,
+    *,
+    board: str | None,
+    since: float | None,
+    until: float | None,
+    before: tuple[float, str | None] | None,
+    after: tuple[float, str | None] | None,
+) -> list[IngestionRun]:
+    """Apply the ``/ingest/runs`` filters and cursor to the ring buffer."""
+
+    def keep(run: IngestionRun) -> bool:
+        if board is not None and run.board != board:
+            return False
+        if since is not None and run.timestamp < since:
+            return False
+        if until is not None and run.timestamp >= until:
+            return False
+        if before is not None and not _past_cursor(run, before, older=True):
+            return False
+        if after is not None and not _past_cursor(run, after, older=False):
+            return False
+        return True
+
+    runs = sorted(filter(keep, INGESTION_RUNS), key=_run_key, reverse=True)
+    return runs[-limit:] if after is not None else runs[:limit]
+
+
+def _past_cursor(
+    run: IngestionRun, cursor: tuple[float, str | None], *, older: bool
+) -> bool:
+    ts, run_id = cursor
+    if run_id is None:
+        return run.timestamp < ts if older else run.timestamp > ts
+    return _run_key(run) < cursor if older else _run_key(run) > cursor
+
+
+# Stages are reported in pipeline order rather than alphabetically.
+_STAGE_ORDER = {
+    "scrape": 0,
+    "archive": 1,
+    "normalize": 2,
+    "collapse": 3,
+    "persist": 4,
+}
+
+
+def _load_stages(cur: PGCursor, run_ids: list[str]) -> dict[str, list[StageTiming]]:
+    """Fetch stage timings for ``run_ids`` in one query."""
+
+    if not run_ids:
+        return {}
+    cur.execute(
+        """
+        SELECT run_id, stage, duration, rows, rows_per_second
+        FROM ingestion_run_stages
+        WHERE run_id = ANY(%s::uuid[])
+        """,
+        (run_ids,),
+    )
+    stages: dict[str, list[StageTiming]] = {}
+    for run_id, stage, duration, rows, rps in cur.fetchall():
+        stages.setdefault(str(run_id), []).append(
+            StageTiming(
+                stage=stage, duration=duration, rows=rows, rows_per_second=rps
+            )
+        )
+    for timings in stages.values():
+        timings.sort(key=lambda t: _STAGE_ORDER.get(t.stage, len(_STAGE_ORDER)))
+    return stages
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Linearly interpolated percentile, matching ``percentile_cont``."""
+
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def _summarize_memory(since: float, board: str | None) -> list[StageSummary]:
+    """In-memory counterpart of the ``/ingest/stages/summary`` query."""
+
+    grouped: dict[tuple[str, str], list[StageTiming]] = {}
+    for run in INGESTION_RUNS:
+        if run.timestamp < since or (board and run.board != board):
+            continue
+        for timing in run.stages:
+            grouped.setdefault((run.board, timing.stage), []).append(timing)
+    return [
+        StageSummary(
+            board=key[0],
+            stage=key[1],
+            runs=len(timings),
+            p50=_percentile([t.duration for t in timings], 0.5),
+            p95=_percentile([t.duration for t in timings], 0.95),
+            rows_per_second=sum(t.rows_per_second for t in timings) / len(timings),
+        )
+        for key, timings in sorted(
+            grouped.items(),
+            key=lambda kv: (kv[0][0], _STAGE_ORDER.get(kv[0][1], len(_STAGE_ORDER))),
+        )
+    ]
+
+
+@app.get("/ingest/stages/summary", response_model=list[StageSummary])
+def stage_summary(
+    window_hours: float = 24.0, board: str | None = None
+) -> list[StageSummary]:
+    """p50/p95 stage latency per board for runs in the last ``window_hours``."""
+
+    if window_hours <= 0:
+        raise HTTPException(status_code=400, detail="window_hours must be positive")
+    since = time.time() - window_hours * 3600
+    try:
+        with _pg_conn() as conn, conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT r.board, s.stage, COUNT(*),
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY s.duration),
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY s.duration),
+                       AVG(s.rows_per_second)
+                FROM ingestion_run_stages s
+                JOIN ingestion_runs r USING (run_id)
+                WHERE r.timestamp >= TO_TIMESTAMP(%s)
+                  AND (%s::text IS NULL OR r.board = %s)
+                GROUP BY r.board, s.stage
+                """,
+                (since, board, board),
+            )
+            rows = cur.fetchall()
+        return [
+            StageSummary(
+                board=r[0],
+                stage=r[1],
+                runs=r[2],
+                p50=r[3],
+                p95=r[4],
+                rows_per_second=r[5],
+            )
+            for r in sorted(
+                rows, key=lambda r: (r[0], _STAGE_ORDER.get(r[1], len(_STAGE_ORDER)))
+            )
+        ]
+    except Exception:  # pragma: no cover - fallback to memory
+        return _summarize_memory(since, board)
+
+
+def _claim_checkpoint(
+    conn: psycopg2.extensions.connection, run: IngestionRun
+) -> _Checkpoint:
+    """Mark ``run`` as resuming and return its committed progress.
+
+    Only failed runs, or runs whose checkpoint has not moved for
+    ``INGEST_RESUME_STALE_SECONDS`` (their worker died), can be claimed. A
+    run that is complete already has its leftover spool removed.
+    """
+
+    stale = float(os.getenv("INGEST_RESUME_STALE_SECONDS", "300"))
+    with conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO ingestion_checkpoints (run_id, board, status)
+            VALUES (%s, %s, 'resuming')
+            ON CONFLICT (run_id) DO UPDATE
+                SET status = 'resuming', updated_at = NOW()
+                WHERE ingestion_checkpoints.status = 'failed'
+                   OR (ingestion_checkpoints.status IN ('running', 'resuming')
+                       AND ingestion_checkpoints.updated_at
+                           < NOW() - make_interval(secs => %s))
+            RETURNING committed, unique_new, unchanged, failed_rows
+            """,
+            (run.run_id, run.board, stale),
+        )
+        row = cur.fetchone()
+        if row is None:
+            cur.execute(
+                "SELECT status FROM ingestion_checkpoints WHERE run_id = %s",
+                (run.run_id,),
+            )
+            current = cur.fetchone()
+    if row is None:
+        if current is not None and current[0] == "complete":
+            # A resume that died after completing can leave its spool behind.
+            RunSpool(_spool_dir(), run.run_id).remove()
+        raise HTTPException(
+            status_code=409, detail="run is complete or still in progress"
+        )
+    return _Checkpoint(
+        committed=row[0], unique_new=row[1], unchanged=row[2], failed=row[3]
+    )
+
+
+def _merge_stage(
+    stages: list[StageTiming], timing: StageTiming
+) -> list[StageTiming]:
+    """Add ``timing`` to ``stages``, summing it into an earlier same stage.
+
+    Stage timings are keyed by ``(run_id, stage)``, so a run that failed
+    after recording its persist stage must not get a second one.
+    """
+
+    merged = [s for s in stages if s.stage != timing.stage]
+    for earlier in stages:
+        if earlier.stage == timing.stage:
+            timing = _stage_timing(
+                timing.stage,
+                earlier.duration + timing.duration,
+                earlier.rows + timing.rows,
+            )
+    return merged + [timing]
+
+
+def resume_run(run_id: str) -> IngestionRun:
+    """Commit the spooled remainder of a suspended run without re-scraping."""
+
+    spool = RunSpool(_spool_dir(), run_id)
+    if not spool.exists():
+        raise HTTPException(status_code=404, detail="no spooled rows for run")
+    header = spool.header()
+    run = IngestionRun(**header["run"])
+    cfg = BOARD_CONFIG.get(run.board, {})
+    commit_size = max(int(cfg.get("commit_size") or DEFAULT_COMMIT_SIZE), 1)
+    with _pg_conn() as conn:
+        _ensure_schema(conn)
+        checkpoint = _claim_checkpoint(conn, run)
+        # The checkpoint may be ahead of the spool if the failing commit
+        # actually went through.
+        rows = spool.rows(skip=max(checkpoint.committed - header["base"], 0))
+        try:
+            resumed: list[StageTiming] = []
+            with _log_stage(run_id, run.board, "persist", resumed) as persist:
+                before = checkpoint.committed
+                for chunk in _batched(map(JobRow._make, rows), commit_size):
+                    _commit_chunk(conn, run_id, checkpoint, chunk, cfg)
+                persist["rows"] = checkpoint.committed - before
+            run.stages = _merge_stage(run.stages, resumed[0])
+            _complete_run(conn, run, checkpoint)
+        except Exception:
+            _set_checkpoint_status(run_id, "failed")
+            raise
+    INGESTION_RUNS.append(run)
+    return run
+
+
+@app.post("/ingest/runs/{run_id}/resume", response_model=IngestionRun)
+async def resume_run_endpoint(run_id: str) -> IngestionRun:
+    return await asyncio.to_thread(resume_run, run_id)
+
+
+@app.get("/ingest/checkpoints", response_model=list[IngestionCheckpoint])
+def list_checkpoints(
+    status: str = "failed", limit: int = 100
+) -> list[IngestionCheckpoint]:
+    """Runs whose persistence stopped part way, newest first."""
+
+    with _pg_conn() as conn, conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT run_id, board, status, committed,
+                   EXTRACT(EPOCH FROM updated_at)
+            FROM ingestion_checkpoints
+            WHERE status = %s
+            ORDER BY updated_at DESC
+            LIMIT %s
+            """,
+            (status, min(max(limit, 1), MAX_RUNS_PAGE)),
+        )
+        rows = cur.fetchall()
+    return [
+        IngestionCheckpoint(
+            run_id=str(r[0]),
+            board=r[1],
+            status=r[2],
+            committed=r[3],
+            updated_at=float(r[4]),
+        )
+        for r in rows
+    ]
+
+
+@app.get("/db/pool/stats")
+def pool_stats() -> dict[str, Any]:
+    """Report occupancy and lifetime counters of the Postgres pool."""
+
+    return _POOL.stats()
 
 
 @app.post("/ingest/run-all", response_model=list[IngestionRun])
@@ -513,15 +2318,161 @@ async def run_all_endpoint() -> list[IngestionRun]:
     return await asyncio.to_thread(run_all_due)
 
 
+# Session-level advisory lock held by the one process driving the scheduler.
+_SCHEDULER_LOCK_KEY = 7_204_118_302
+# Leader-only background work (scheduled ingestion, the dedupe index) runs in
+# whichever worker holds the lock.
+_LEADER = LeaderLock(lambda: _pg_connect(), _SCHEDULER_LOCK_KEY)
+# board -> consecutive scheduled runs that raised or could not persist
+_FAILED_ATTEMPTS: dict[str, int] = {}
+
+
+def _scheduler_tick(
+    schedule: BoardSchedule, leader: LeaderLock, *, poll: float
+) -> float:
+    """Run every board whose deadline has passed; return seconds to sleep.
+
+    Processes that do not hold the leader lock do nothing and retry after
+    ``poll`` seconds. The leader refreshes last-run times from the database
+    each tick so that manual runs from other workers push deadlines back.
+    A board whose run raised or could not persist is retried after ``poll``
+    seconds, doubling with each consecutive failure up to its cadence.
+    """
+
+    if not leader.acquire():
+        schedule.clear()
+        return poll
+    _load_last_runs()
+    now = time.time()
+    _sync_schedule(schedule, now)
+    due = schedule.pop_due(now)
+    if due:
+        ok = {run.board for run in _run_boards(due) if not run.errors}
+        now = time.time()
+        _sync_schedule(schedule, now)
+        for board, _ in due:
+            if board in ok:
+                _FAILED_ATTEMPTS.pop(board, None)
+                continue
+            failures = _FAILED_ATTEMPTS[board] = _FAILED_ATTEMPTS.get(board, 0) + 1
+            backoff = min(poll * 2 ** (failures - 1), _interval_for(board))
+            schedule.defer(board, now + backoff)
+    deadline = schedule.next_deadline()
+    if deadline is None:
+        return poll
+    return min(max(deadline - time.time(), 0.0), poll)
+
+
+def _sync_schedule(schedule: BoardSchedule, now: float) -> None:
+    enabled = {b for b, cfg in BOARD_CONFIG.items() if cfg.get("enabled")}
+    for board in schedule.boards() - enabled:
+        schedule.remove(board)
+    for board in enabled:
+        schedule.sync(board, _LAST_RUN.get(board), now=now)
+
+
 async def _scheduler_loop() -> None:
-    interval = int(os.getenv("INGEST_SCHEDULER_INTERVAL_SECONDS", "3600"))
+    poll = float(os.getenv("INGEST_SCHEDULER_INTERVAL_SECONDS", "60"))
+    schedule = BoardSchedule(
+        _interval_for,
+        jitter=float(os.getenv("INGEST_SCHEDULER_JITTER_SECONDS", "0")),
+    )
+    while True:
+        try:
+            delay = await asyncio.to_thread(
+                _scheduler_tick, schedule, _LEADER, poll=poll
+            )
+        except Exception:
+            logger.exception("scheduler tick failed")
+            delay = poll
+        await asyncio.sleep(delay)
+
+
+def _dedupe_index_tick(leader: LeaderLock) -> int:
+    """Update the dedupe index if this worker leads; return jobs added."""
+
+    if not leader.acquire():
+        return 0
+    return update_dedupe_index()
+
+
+async def _dedupe_index_loop(interval: float) -> None:
     while True:
-        await asyncio.to_thread(run_all_due)
+        try:
+            added = await asyncio.to_thread(_dedupe_index_tick, _LEADER)
+        except Exception:
+            logger.exception("dedupe index update failed")
+        else:
+            if added:
+                logger.info("added %d jobs to the dedupe index", added)
         await asyncio.sleep(interval)
 
 
+async def _prewarm_loop(top_n: int, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Anything turning stale before the next round is refreshed now.
+            refreshed = await prewarm_cache(top_n, lead=interval, leader=_LEADER)
+        except Exception:
+            logger.exception("cache prewarm failed")
+        else:
+            if refreshed:
+                logger.info("prewarmed %d cached searches", refreshed)
+
+
+def _snapshot_path() -> str | None:
+    return os.getenv("JOBSPY_CACHE_SNAPSHOT_PATH") or None
+
+
+def _restore_cache() -> None:
+    path = _snapshot_path()
+    if path is None or not os.path.exists(path):
+        return
+    try:
+        restored = load_snapshot(
+            path, _CACHE, _POPULARITY, decode=JobSearchResponse.model_validate
+        )
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("could not restore cache snapshot %s: %s", path, exc)
+        return
+    logger.info("restored %d cached searches from %s", restored, path)
+
+
+def _snapshot_cache() -> None:
+    path = _snapshot_path()
+    if path is None:
+        return
+    try:
+        saved = save_snapshot(
+            path, _CACHE, _POPULARITY, encode=methodcaller("model_dump", mode="json")
+        )
+    except OSError as exc:
+        logger.warning("could not write cache snapshot %s: %s", path, exc)
+        return
+    logger.info("saved %d cached searches to %s", saved, path)
+
+
 @app.on_event("startup")
 async def _startup() -> None:  # pragma: no cover - background task
+    try:
+        await asyncio.to_thread(_POOL.open)
+    except Exception as exc:
+        logger.warning("could not pre-open Postgres pool: %s", exc)
     _load_last_runs()
+    _restore_cache()
     asyncio.create_task(_scheduler_loop())
+    top_n = int(os.getenv("JOBSPY_PREWARM_TOP_N", "0"))
+    if top_n > 0:
+        interval = float(os.getenv("JOBSPY_PREWARM_INTERVAL_SECONDS", "60"))
+        asyncio.create_task(_prewarm_loop(top_n, interval))
+    if os.getenv("DEDUPE_INDEX_PATH"):
+        interval = float(os.getenv("DEDUPE_INDEX_INTERVAL_SECONDS", "300"))
+        asyncio.create_task(_dedupe_index_loop(interval))
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:  # pragma: no cover - process teardown
+    _snapshot_cache()
+    _POOL.close()
 
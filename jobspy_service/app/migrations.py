@@ -0,0 +1,240 @@
+"""Versioned schema migrations for the JobSpy service.
+
+Migrations are applied once, at startup, and recorded in the shared
+``schema_version`` table under the ``jobspy`` component so that request
+handlers never need to issue DDL.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+COMPONENT = "jobspy"
+
+# Serializes migration runs across workers and services sharing the database.
+_ADVISORY_LOCK_KEY = 7_204_118_301
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A numbered schema change made of one or more SQL statements."""
+
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "create jobs_normalized",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS jobs_normalized (
+                id SERIAL PRIMARY KEY,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                company TEXT,
+                description TEXT,
+                location TEXT,
+                url TEXT,
+                is_remote BOOLEAN,
+                job_id_ext TEXT NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                UNIQUE (source, job_id_ext)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "create ingestion_runs",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_runs (
+                run_id UUID PRIMARY KEY,
+                board TEXT NOT NULL,
+                fetched INTEGER NOT NULL,
+                normalized INTEGER NOT NULL,
+                unique_new INTEGER NOT NULL,
+                errors INTEGER NOT NULL,
+                timestamp TIMESTAMPTZ NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        3,
+        "index ingestion_runs for history and cadence lookups",
+        (
+            """
+            CREATE INDEX IF NOT EXISTS ingestion_runs_timestamp_idx
+                ON ingestion_runs (timestamp DESC)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ingestion_runs_board_timestamp_idx
+                ON ingestion_runs (board, timestamp)
+            """,
+        ),
+    ),
+    Migration(
+        4,
+        "track job content hashes and unchanged rows per run",
+        (
+            """
+            ALTER TABLE jobs_normalized
+                ADD COLUMN IF NOT EXISTS content_hash TEXT
+            """,
+            """
+            ALTER TABLE ingestion_runs
+                ADD COLUMN IF NOT EXISTS unchanged INTEGER NOT NULL DEFAULT 0
+            """,
+        ),
+    ),
+    Migration(
+        5,
+        "record scheduling lag per run",
+        (
+            """
+            ALTER TABLE ingestion_runs
+                ADD COLUMN IF NOT EXISTS scheduling_lag DOUBLE PRECISION
+            """,
+        ),
+    ),
+    Migration(
+        6,
+        "create ingestion_run_stages",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_run_stages (
+                run_id UUID NOT NULL
+                    REFERENCES ingestion_runs (run_id) ON DELETE CASCADE,
+                stage TEXT NOT NULL,
+                duration DOUBLE PRECISION NOT NULL,
+                rows INTEGER NOT NULL,
+                rows_per_second DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (run_id, stage)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        7,
+        "index ingestion_runs for keyset pagination",
+        (
+            """
+            CREATE INDEX IF NOT EXISTS ingestion_runs_timestamp_run_idx
+                ON ingestion_runs (timestamp DESC, run_id DESC)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ingestion_runs_board_timestamp_run_idx
+                ON ingestion_runs (board, timestamp DESC, run_id DESC)
+            """,
+            # Both are prefixes of the indexes above.
+            "DROP INDEX IF EXISTS ingestion_runs_timestamp_idx",
+            "DROP INDEX IF EXISTS ingestion_runs_board_timestamp_idx",
+        ),
+    ),
+    Migration(
+        8,
+        "checkpoint chunked persistence and count rejected rows",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_checkpoints (
+                run_id UUID PRIMARY KEY,
+                board TEXT NOT NULL,
+                status TEXT NOT NULL,
+                committed INTEGER NOT NULL DEFAULT 0,
+                unique_new INTEGER NOT NULL DEFAULT 0,
+                unchanged INTEGER NOT NULL DEFAULT 0,
+                failed_rows INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ingestion_checkpoints_status_idx
+                ON ingestion_checkpoints (status, updated_at DESC)
+            """,
+            """
+            ALTER TABLE ingestion_runs
+                ADD COLUMN IF NOT EXISTS failed_rows INTEGER NOT NULL DEFAULT 0
+            """,
+        ),
+    ),
+    Migration(
+        9,
+        "record incremental scrape windows",
+        (
+            """
+            ALTER TABLE ingestion_runs
+                ADD COLUMN IF NOT EXISTS hours_old INTEGER,
+                ADD COLUMN IF NOT EXISTS rows_saved INTEGER NOT NULL DEFAULT 0
+            """,
+        ),
+    ),
+    Migration(
+        10,
+        "count duplicates collapsed within a batch",
+        (
+            """
+            ALTER TABLE ingestion_runs
+                ADD COLUMN IF NOT EXISTS collapsed INTEGER NOT NULL DEFAULT 0
+            """,
+        ),
+    ),
+    Migration(
+        11,
+        "index jobs_normalized by update time",
+        (
+            """
+            CREATE INDEX IF NOT EXISTS jobs_normalized_updated_idx
+                ON jobs_normalized (updated_at, id)
+            """,
+        ),
+    ),
+)
+
+
+def apply_migrations(
+    conn: Any, migrations: Sequence[Migration] = MIGRATIONS
+) -> list[int]:
+    """Apply pending ``migrations`` in a single transaction.
+
+    Returns the versions that were applied by this call. Concurrent callers
+    block on an advisory lock, so only the first one performs the work.
+    """
+
+    applied_now: list[int] = []
+    with conn, conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_ADVISORY_LOCK_KEY,))
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                component TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (component, version)
+            )
+            """
+        )
+        cur.execute(
+            "SELECT version FROM schema_version WHERE component = %s",
+            (COMPONENT,),
+        )
+        done = {row[0] for row in cur.fetchall()}
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if migration.version in done:
+                continue
+            for statement in migration.statements:
+                cur.execute(statement)
+            cur.execute(
+                """
+                INSERT INTO schema_version (component, version, description)
+                VALUES (%s, %s, %s)
+                """,
+                (COMPONENT, migration.version, migration.description),
+            )
+            applied_now.append(migration.version)
+    return applied_now
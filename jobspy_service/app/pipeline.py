@@ -0,0 +1,135 @@
+"""Bounded producer/consumer pipeline used for paged ingestion."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from time import perf_counter
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+_DONE = object()
+
+
+class StagedPipeline(Generic[T, U]):
+    """Run a page producer and a per-page transform in background threads.
+
+    Pages flow ``produce -> transform -> consumer`` through queues holding at
+    most ``depth`` items each, so besides the page each stage is working on,
+    at most ``2 * depth`` pages are resident however many the producer
+    yields. The consumer iterates the pipeline in its own thread; an
+    exception raised by either background stage is re-raised there once the
+    pages ahead of it have been consumed.
+
+    ``busy`` and ``rows`` report, per stage, the time spent doing work (not
+    waiting on a queue) and the number of rows handled, measured with
+    ``size``.
+    """
+
+    def __init__(
+        self,
+        produce: Callable[[], Iterable[T]],
+        transform: Callable[[T], U],
+        *,
+        names: tuple[str, str] = ("produce", "transform"),
+        depth: int = 2,
+        size: Callable[[Any], int] = len,
+    ) -> None:
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self._produce = produce
+        self._transform = transform
+        self._names = names
+        self._size = size
+        self._pages: queue.Queue[Any] = queue.Queue(maxsize=depth)
+        self._results: queue.Queue[Any] = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self.error: BaseException | None = None
+        self.busy: dict[str, float] = dict.fromkeys(names, 0.0)
+        self.rows: dict[str, int] = dict.fromkeys(names, 0)
+
+    def __enter__(self) -> "StagedPipeline[T, U]":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        for target in (self._run_producer, self._run_transform):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __iter__(self) -> Iterator[U]:
+        while True:
+            item = self._results.get()
+            if item is _DONE:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield item
+
+    def close(self) -> None:
+        """Stop the background stages and wait for them to exit."""
+
+        self._stop.set()
+        for q in (self._pages, self._results):
+            try:
+                while True:
+                    q.get_nowait()
+            except queue.Empty:
+                pass
+        for thread in self._threads:
+            thread.join()
+
+    def _put(self, q: queue.Queue[Any], item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run_producer(self) -> None:
+        name = self._names[0]
+        try:
+            pages = iter(self._produce())
+            while not self._stop.is_set():
+                start = perf_counter()
+                page = next(pages, _DONE)
+                self.busy[name] += perf_counter() - start
+                if page is _DONE:
+                    break
+                self.rows[name] += self._size(page)
+                if not self._put(self._pages, page):
+                    break
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            self._put(self._pages, _DONE)
+
+    def _run_transform(self) -> None:
+        name = self._names[1]
+        try:
+            while not self._stop.is_set():
+                try:
+                    page = self._pages.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                if page is _DONE:
+                    break
+                start = perf_counter()
+                result = self._transform(page)
+                self.busy[name] += perf_counter() - start
+                self.rows[name] += self._size(result)
+                if not self._put(self._results, result):
+                    break
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            self._put(self._results, _DONE)
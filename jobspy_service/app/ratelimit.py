@@ -0,0 +1,83 @@
+"""Per-source token buckets enforcing scraper politeness limits."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst``.
+
+    A ``rate`` of ``0`` disables limiting. Callers reserve a token up front,
+    so concurrent waiters are spaced ``1 / rate`` seconds apart instead of all
+    waking at once when the bucket refills.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        if rate < 0 or burst < 1:
+            raise ValueError("rate must be >= 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+
+        if self.rate == 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now."""
+
+        if self.rate == 0:
+            return True
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    async def acquire(self) -> float:
+        """Wait until a token is available and return the time waited."""
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+
+def parse_rate_limits(spec: str) -> dict[str, tuple[float, float]]:
+    """Parse ``"indeed=0.5:2,linkedin=0.2"`` into ``{source: (rate, burst)}``.
+
+    ``rate`` is in requests per second and ``burst`` defaults to ``1``.
+    """
+
+    limits: dict[str, tuple[float, float]] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        source, _, value = item.partition("=")
+        rate_str, _, burst_str = value.partition(":")
+        rate = float(rate_str)
+        burst = float(burst_str) if burst_str else 1.0
+        if not source.strip() or rate < 0 or burst < 1:
+            raise ValueError(f"invalid rate limit entry: {item!r}")
+        limits[source.strip().lower()] = (rate, burst)
+    return limits
@@ -0,0 +1,164 @@
+"""Deadline-driven ingestion scheduling and cross-worker leader election."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import random
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BoardSchedule:
+    """Min-heap of board deadlines derived from cadence and last run time.
+
+    Parameters
+    ----------
+    interval_for:
+        Returns a board's cadence in seconds.
+    jitter:
+        Up to this many seconds are added to each deadline at random so that
+        boards sharing a cadence do not all fire at the same instant.
+    rng:
+        Source of randomness for jitter; injectable for tests.
+    """
+
+    def __init__(
+        self,
+        interval_for: Callable[[str], float],
+        *,
+        jitter: float = 0.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._interval_for = interval_for
+        self._jitter = jitter
+        self._rng = rng or random.Random()
+        self._heap: list[tuple[float, str]] = []
+        # board -> (last run timestamp, current deadline)
+        self._boards: dict[str, tuple[float | None, float]] = {}
+
+    def sync(self, board: str, last_run: float | None, *, now: float) -> float:
+        """Track ``board`` and return its deadline.
+
+        The deadline is only recomputed when ``last_run`` changes, so jitter
+        stays stable between calls.
+        """
+
+        known = self._boards.get(board)
+        if known is not None and known[0] == last_run:
+            return known[1]
+        base = now if last_run is None else last_run + self._interval_for(board)
+        due = base + (self._rng.uniform(0, self._jitter) if self._jitter else 0.0)
+        self._boards[board] = (last_run, due)
+        heapq.heappush(self._heap, (due, board))
+        return due
+
+    def defer(self, board: str, due_at: float) -> None:
+        """Move ``board``'s deadline to ``due_at`` without a new last run."""
+
+        last_run = self._boards[board][0] if board in self._boards else None
+        self._boards[board] = (last_run, due_at)
+        heapq.heappush(self._heap, (due_at, board))
+
+    def remove(self, board: str) -> None:
+        self._boards.pop(board, None)
+
+    def clear(self) -> None:
+        self._boards.clear()
+        self._heap.clear()
+
+    def boards(self) -> set[str]:
+        return set(self._boards)
+
+    def next_deadline(self) -> float | None:
+        """Earliest live deadline, discarding superseded heap entries."""
+
+        while self._heap and not self._live(*self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list[tuple[str, float]]:
+        """Remove and return ``(board, due_at)`` for every deadline <= ``now``.
+
+        Popped boards stay tracked; the next :meth:`sync` with a new
+        ``last_run`` schedules them again.
+        """
+
+        due: list[tuple[str, float]] = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, board = heapq.heappop(self._heap)
+            if self._live(due_at, board):
+                due.append((board, due_at))
+        return due
+
+    def _live(self, due_at: float, board: str) -> bool:
+        known = self._boards.get(board)
+        return known is not None and known[1] == due_at
+
+
+class LeaderLock:
+    """Session-level Postgres advisory lock held on a dedicated connection.
+
+    Only the process holding the lock drives scheduled ingestion. If its
+    connection dies the lock is released by Postgres and another process
+    acquires it on its next attempt. One instance may be shared by several
+    threads of a process.
+    """
+
+    def __init__(self, connect: Callable[[], Any], key: int) -> None:
+        self._connect = connect
+        self._key = key
+        self._conn: Any | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None
+
+    def acquire(self) -> bool:
+        """Return ``True`` if this process is (still) the leader."""
+
+        with self._lock:
+            return self._acquire()
+
+    def _acquire(self) -> bool:
+        if self._conn is not None:
+            try:
+                with self._conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                return True
+            except Exception as exc:
+                logger.warning("lost scheduler leadership: %s", exc)
+                self.release()
+        try:
+            conn = self._connect()
+        except Exception as exc:
+            logger.warning("cannot contend for scheduler leadership: %s", exc)
+            return False
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (self._key,))
+                acquired = bool(cur.fetchone()[0])
+        except Exception as exc:
+            logger.warning("leader election failed: %s", exc)
+            acquired = False
+        if not acquired:
+            conn.close()
+            return False
+        logger.info("acquired scheduler leadership")
+        self._conn = conn
+        return True
+
+    def release(self) -> None:
+        """Close the dedicated connection, which drops the advisory lock."""
+
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:  # pragma: no cover - already broken
+                pass
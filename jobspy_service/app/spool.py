@@ -0,0 +1,72 @@
+"""On-disk spool of normalized rows for resuming interrupted ingestion runs."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from typing import Any, Iterable, Iterator, Sequence
+
+
+class RunSpool:
+    """NDJSON file holding the rows a run had not yet committed.
+
+    The first line is a header with ``base``, the number of the run's rows
+    already committed before the first spooled one, and ``run``, a snapshot
+    of the run record. Each further line is one row as a JSON array.
+    """
+
+    def __init__(self, directory: str, run_id: str) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, f"{run_id}.ndjson")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def write(
+        self, base: int, run: dict[str, Any], rows: Iterable[Sequence[Any]]
+    ) -> int:
+        """Atomically replace the spool and return the number of rows written."""
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        count = 0
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"base": base, "run": run}) + "\n")
+            for row in rows:
+                fh.write(json.dumps(list(row)) + "\n")
+                count += 1
+        os.replace(tmp, self.path)
+        return count
+
+    def header(self) -> dict[str, Any]:
+        with open(self.path, encoding="utf-8") as fh:
+            return json.loads(fh.readline())
+
+    def update_run(self, run: dict[str, Any]) -> None:
+        """Atomically replace the header's run snapshot, keeping the rows."""
+
+        tmp = f"{self.path}.tmp"
+        with open(self.path, encoding="utf-8") as src, open(
+            tmp, "w", encoding="utf-8"
+        ) as dst:
+            header = json.loads(src.readline())
+            header["run"] = run
+            dst.write(json.dumps(header) + "\n")
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, self.path)
+
+    def rows(self, skip: int = 0) -> Iterator[list[Any]]:
+        """Yield spooled rows after the first ``skip``."""
+
+        with open(self.path, encoding="utf-8") as fh:
+            fh.readline()
+            for i, line in enumerate(fh):
+                if i >= skip:
+                    yield json.loads(line)
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
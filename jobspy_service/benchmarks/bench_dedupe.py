@@ -0,0 +1,92 @@
+"""Compare per-job and batched embedding in ``dedupe_jobs``.
+
+Requires ``sentence-transformers`` (see ``requirements-test.txt``); the model
+is downloaded on first use. Usage::
+
+    python jobspy_service/benchmarks/bench_dedupe.py [--sizes 1000 10000] \\
+        [--batch-sizes 32 64 128]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Sequence
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from jobspy_service.app import dedupe  # noqa: E402
+from jobspy_service.app.dedupe import DedupConfig, dedupe_jobs  # noqa: E402
+
+_ROLES = ("Python Developer", "Data Engineer", "Designer", "Nurse", "Accountant")
+_VERBS = ("build", "maintain", "design", "review", "support", "ship")
+
+
+def synthetic_jobs(count: int, *, seed: int = 0) -> list[dict[str, Any]]:
+    """Build ``count`` jobs in which roughly one in five repeats another."""
+
+    rng = random.Random(seed)
+    jobs: list[dict[str, Any]] = []
+    for i in range(count):
+        ident = rng.randrange(i) if i and rng.random() < 0.2 else i
+        role = _ROLES[ident % len(_ROLES)]
+        jobs.append(
+            {
+                "title": f"{role} {ident}",
+                "company": f"Company {ident % 300}",
+                "company_size": "big" if ident % 3 == 0 else "small",
+                "description": " ".join(
+                    rng.choice(_VERBS) + f" {role.lower()} systems"
+                    for _ in range(12)
+                ),
+            }
+        )
+    return jobs
+
+
+def _per_job_embed(jobs: Sequence[dict], batch_size: int) -> list[Any]:
+    """The previous behaviour: one ``encode`` call per job."""
+
+    assert dedupe._MODEL is not None
+    return [
+        dedupe._MODEL.encode(dedupe._embed_text(job), normalize_embeddings=True)
+        for job in jobs
+    ]
+
+
+def _report(jobs: list[dict[str, Any]], mode: str, config: DedupConfig) -> None:
+    start = perf_counter()
+    kept = dedupe_jobs(jobs, config=config)
+    seconds = perf_counter() - start
+    size = len(jobs)
+    print(f"{size:>7} {mode:>12} {seconds:>9.2f} {size / seconds:>9.0f} {len(kept):>6}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 64, 128])
+    args = parser.parse_args(argv)
+    if dedupe._MODEL is None:
+        raise SystemExit("sentence-transformers is required for this benchmark")
+
+    # Warm the model so the first timing does not include lazy initialisation.
+    dedupe_jobs(synthetic_jobs(16), config=DedupConfig())
+    print(f"{'jobs':>7} {'mode':>12} {'seconds':>9} {'jobs/s':>9} {'kept':>6}")
+    for size in args.sizes:
+        jobs = synthetic_jobs(size)
+        batched = dedupe._embed_batch
+        dedupe._embed_batch = _per_job_embed  # type: ignore[assignment]
+        try:
+            _report(jobs, "per-job", DedupConfig())
+        finally:
+            dedupe._embed_batch = batched  # type: ignore[assignment]
+        for batch_size in args.batch_sizes:
+            config = DedupConfig(embed_batch_size=batch_size)
+            _report(jobs, f"batch={batch_size}", config)
+
+
+if __name__ == "__main__":
+    main()
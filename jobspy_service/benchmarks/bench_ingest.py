@@ -0,0 +1,244 @@
+"""Measure end-to-end ingestion throughput against a local Postgres.
+
+``scrape_jobs`` is replaced by a synthetic generator, so the numbers cover
+normalization and persistence only. Connection settings come from the usual
+``POSTGRES_*`` variables. Usage::
+
+    python jobspy_service/benchmarks/bench_ingest.py --rows 50000 \\
+        [--description-size 2000] [--duplicate-ratio 0.1] [--mode pipelined] \\
+        [--compare jobspy_service/benchmarks/results/ingest_<sha>_<time>.json]
+
+Results are written as JSON to ``benchmarks/results/`` (or ``--output``),
+named after the current commit, so runs on different commits can be
+compared with ``--compare``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+import jobspy_service.app.main as main  # noqa: E402
+
+BOARD = "bench"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def synthetic_jobs(
+    count: int,
+    *,
+    description_size: int = 1000,
+    duplicate_ratio: float = 0.0,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Build ``count`` raw jobs, a ``duplicate_ratio`` share repeating ids."""
+
+    rng = random.Random(seed)
+    words = "build operate scale services data python postgres teams".split()
+    unique = max(1, round(count * (1 - duplicate_ratio)))
+    jobs: list[dict[str, Any]] = []
+    for i in range(count):
+        ident = i if i < unique else rng.randrange(unique)
+        description = " ".join(
+            rng.choice(words) for _ in range(description_size // 7 + 1)
+        )[:description_size]
+        jobs.append(
+            {
+                "title": f"Engineer {ident}",
+                "company": f"Company {rng.randrange(1000)}",
+                "description": description,
+                "location": rng.choice(["NY", "SF", "Remote", None]),
+                "job_url": f"https://example.com/jobs/{ident}",
+                "id": str(ident),
+                "is_remote": rng.random() < 0.3,
+            }
+        )
+    rng.shuffle(jobs)
+    return jobs
+
+
+def _fake_scraper(jobs: list[dict[str, Any]]) -> Any:
+    def scrape(
+        source: str,
+        *,
+        results_wanted_max: int | None = None,
+        offset: int = 0,
+        **_: Any,
+    ) -> dict[str, Any]:
+        end = None if results_wanted_max is None else offset + results_wanted_max
+        return {"jobs": jobs[offset:end]}
+
+    return scrape
+
+
+def _execute(sql: str, params: tuple[Any, ...] = ()) -> None:
+    with main._pg_conn() as conn, conn, conn.cursor() as cur:
+        cur.execute(sql, params)
+
+
+def _reset(board: str) -> None:
+    _execute("DELETE FROM jobs_normalized WHERE source = %s", (board,))
+
+
+def _cleanup(board: str) -> None:
+    _reset(board)
+    _execute("DELETE FROM ingestion_runs WHERE board = %s", (board,))
+    _execute("DELETE FROM ingestion_checkpoints WHERE board = %s", (board,))
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(
+    jobs: list[dict[str, Any]],
+    *,
+    mode: str,
+    repeats: int,
+    warm: bool,
+    page_size: int,
+    commit_size: int,
+) -> list[dict[str, Any]]:
+    """Ingest ``jobs`` ``repeats`` times and return one record per run."""
+
+    main.BOARD_CONFIG.clear()
+    main.BOARD_CONFIG[BOARD] = {
+        "enabled": True,
+        "cadence": "4h",
+        "results_wanted_max": len(jobs),
+        "ingest_mode": mode,
+        "page_size": page_size,
+        "commit_size": commit_size,
+    }
+    results = []
+    with patch.object(main, "scrape_jobs", side_effect=_fake_scraper(jobs)):
+        for _ in range(repeats):
+            if not warm:
+                _reset(BOARD)
+            start = perf_counter()
+            run = main.ingest_board(BOARD)
+            wall = perf_counter() - start
+            if run.errors:
+                raise SystemExit("ingestion failed; is Postgres reachable?")
+            results.append(
+                {
+                    "wall_seconds": wall,
+                    "rows_per_second": run.fetched / wall if wall else 0.0,
+                    "unique_new": run.unique_new,
+                    "unchanged": run.unchanged,
+                    "failed_rows": run.failed_rows,
+                    "stages": {s.stage: s.duration for s in run.stages},
+                }
+            )
+    return results
+
+
+def _compare(current: dict[str, Any], previous_path: str) -> None:
+    previous = json.loads(Path(previous_path).read_text())
+    old, new = previous["best"], current["best"]
+    change = (new["rows_per_second"] / old["rows_per_second"] - 1) * 100
+    print(
+        f"rows/s {old['rows_per_second']:.0f} ({previous['commit']}) -> "
+        f"{new['rows_per_second']:.0f} ({current['commit']}): {change:+.1f}%"
+    )
+    for stage, seconds in new["stages"].items():
+        before = old["stages"].get(stage)
+        if before:
+            print(f"  {stage:<10} {before:8.4f}s -> {seconds:8.4f}s")
+
+
+def main_cli(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--description-size", type=int, default=1000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument(
+        "--mode", choices=("sequential", "pipelined"), default="sequential"
+    )
+    parser.add_argument("--page-size", type=int, default=main.DEFAULT_PAGE_SIZE)
+    parser.add_argument("--commit-size", type=int, default=main.DEFAULT_COMMIT_SIZE)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="keep rows between repeats to measure the unchanged-row path",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", help="previous results file to diff against")
+    args = parser.parse_args(argv)
+
+    with main._pg_conn() as conn:
+        main._ensure_schema(conn)
+    jobs = synthetic_jobs(
+        args.rows,
+        description_size=args.description_size,
+        duplicate_ratio=args.duplicate_ratio,
+        seed=args.seed,
+    )
+    try:
+        runs = run_benchmark(
+            jobs,
+            mode=args.mode,
+            repeats=args.repeats,
+            warm=args.warm,
+            page_size=args.page_size,
+            commit_size=args.commit_size,
+        )
+    finally:
+        _cleanup(BOARD)
+
+    commit = _git_commit()
+    result = {
+        "commit": commit,
+        "timestamp": time.time(),
+        "params": {
+            k: v for k, v in vars(args).items() if k not in ("output", "compare")
+        },
+        "runs": runs,
+        "best": max(runs, key=lambda r: r["rows_per_second"]),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    output = args.output or RESULTS_DIR / (
+        f"ingest_{commit}_{time.strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, default=str))
+
+    best = result["best"]
+    print(f"{args.rows} rows, {args.mode}: {best['rows_per_second']:.0f} rows/s")
+    for stage, seconds in best["stages"].items():
+        print(f"  {stage:<10} {seconds:8.4f}s")
+    print(f"peak RSS {result['peak_rss_mb']:.1f} MiB; results in {output}")
+    if args.compare:
+        _compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,84 @@
+"""Compare per-row and column-wise normalization of scrape results.
+
+Usage::
+
+    python jobspy_service/benchmarks/bench_normalize.py [--sizes 1000 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from jobspy_service.app.main import normalize_batch, normalize_for_db  # noqa: E402
+
+# Alternate provider field names so alias resolution is exercised.
+_VARIANTS: tuple[dict[str, str], ...] = (
+    {"title": "title", "company": "company", "url": "url", "id": "job_id"},
+    {"title": "job_title", "company": "company_name", "url": "job_url", "id": "id"},
+    {"title": "title", "company": "company", "url": "link", "id": "jobkey"},
+)
+
+
+def synthetic_jobs(count: int, *, seed: int = 0) -> list[dict[str, Any]]:
+    """Build ``count`` raw jobs mixing the provider field aliases."""
+
+    rng = random.Random(seed)
+    jobs: list[dict[str, Any]] = []
+    for i in range(count):
+        names = _VARIANTS[i % len(_VARIANTS)]
+        jobs.append(
+            {
+                names["title"]: f"Engineer {i}",
+                names["company"]: f"Company {rng.randrange(500)}",
+                "description": "Build and operate services. " * 20,
+                "location": rng.choice(["NY", "SF", None]),
+                names["url"]: f"https://example.com/jobs/{i}",
+                names["id"]: str(i),
+                "is_remote": rng.random() < 0.3,
+            }
+        )
+    return jobs
+
+
+def _best_of(fn: Callable[[], Any], repeats: int) -> float:
+    """Best wall time over ``repeats`` runs with GC paused, as ``timeit`` does."""
+
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = perf_counter()
+            fn()
+            best = min(best, perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8} {'per-row s':>10} {'batch s':>10} {'speedup':>8}")
+    for size in args.sizes:
+        jobs = synthetic_jobs(size)
+        per_row = _best_of(
+            lambda: [normalize_for_db("bench", j) for j in jobs], args.repeats
+        )
+        batch = _best_of(lambda: normalize_batch("bench", jobs), args.repeats)
+        print(f"{size:>8} {per_row:>10.4f} {batch:>10.4f} {per_row / batch:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
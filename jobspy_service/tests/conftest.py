@@ -1,20 +1,35 @@
 from pathlib import Path
 import sys
-import types
 import pytest
 import httpx
 
-# Minimal numpy stub for tests
-numpy_stub = types.ModuleType("numpy")
-numpy_stub.array = lambda seq: list(seq)
-numpy_stub.dot = lambda a, b: sum(x * y for x, y in zip(a, b))
-numpy_stub.ndarray = list  # type: ignore[attr-defined]
-sys.modules.setdefault("numpy", numpy_stub)
-
 sys.path.append(str(Path(__file__).resolve().parents[2]))
+from jobspy_service.app import main  # noqa: E402
 from jobspy_service.app.main import app  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def _reset_rate_limits():
+    """Start every test with full per-source token buckets."""
+    main._BUCKETS.clear()
+    yield
+    main._BUCKETS.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_scrape_windows():
+    """Scrape windows narrow after a success; start every test from scratch."""
+    main._LAST_SUCCESS.clear()
+    yield
+    main._LAST_SUCCESS.clear()
+
+
+@pytest.fixture(autouse=True)
+def _spool_dir(tmp_path, monkeypatch):
+    """Keep resume spools written by failed test runs out of /tmp."""
+    monkeypatch.setenv("INGEST_SPOOL_DIR", str(tmp_path / "spool"))
+
+
 @pytest.fixture
 async def client():
     transport = httpx.ASGITransport(app=app)
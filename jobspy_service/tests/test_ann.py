@@ -0,0 +1,225 @@
+"""Tests for the approximate nearest-neighbour dedupe index."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+
+import jobspy_service.app.main as main
+from jobspy_service.app import dedupe
+from jobspy_service.app.ann import IVFIndex
+from jobspy_service.app.dedupe import DedupConfig, dedupe_jobs
+
+
+def _unit(rng: np.random.Generator, count: int, dim: int) -> np.ndarray:
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_search_applies_top_k_and_similarity_cutoff() -> None:
+    index = IVFIndex(2)
+    index.add(["a", "b", "c"], [[1.0, 0.0], [0.8, 0.6], [0.0, 1.0]])
+
+    [hits] = index.search([1.0, 0.0], k=2)
+    assert [key for key, _ in hits] == ["a", "b"]
+    assert hits[1][1] == np.float32(0.8)
+    assert index.search([1.0, 0.0], k=5, min_similarity=0.5) == [
+        [("a", 1.0), ("b", hits[1][1])]
+    ]
+
+
+def test_readding_an_id_replaces_its_vector(tmp_path) -> None:
+    index = IVFIndex(2)
+    index.add(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+    index.add(["a"], [[0.0, 1.0]])
+
+    assert len(index) == 2
+    assert index.search([1.0, 0.0], min_similarity=0.5) == [[]]
+    index.save(str(tmp_path / "index.npz"))
+    assert index._size == 2  # the replaced vector is dropped on save
+    assert [p.name for p in tmp_path.iterdir()] == ["index.npz"]
+
+
+def test_trained_index_finds_most_neighbours_after_round_trip(tmp_path) -> None:
+    rng = np.random.default_rng(0)
+    centres = _unit(rng, 32, 16)
+    noise = 0.05 * rng.normal(size=(4000, 16)).astype(np.float32)
+    vectors = centres[rng.integers(32, size=4000)] + noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = IVFIndex(16, nlist=32, nprobe=4, train_min=2000)
+    index.add([str(i) for i in range(2000)], vectors[:2000])
+    assert index.trained
+    index.add([str(i) for i in range(2000, 4000)], vectors[2000:])
+    index.metadata["watermark"] = "2024-05-01T00:00:00+00:00"
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = IVFIndex.load(path)
+
+    assert (len(loaded), loaded.metadata) == (4000, index.metadata)
+    queries = vectors[:200]
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+    found = loaded.search(queries, k=10)
+    recall = np.mean(
+        [
+            len({int(key) for key, _ in hits} & set(truth.tolist())) / 10
+            for hits, truth in zip(found, exact)
+        ]
+    )
+    assert recall >= 0.9
+    assert found == index.search(queries, k=10)
+
+
+def test_dedupe_drops_jobs_already_in_the_index(monkeypatch: Any) -> None:
+    embeddings = {"Old": [1.0, 0.0], "Repost": [0.99, 0.14], "New": [0.0, 1.0]}
+
+    def embed_batch(jobs: Sequence[dict], batch_size: int) -> list[list[float]]:
+        return [embeddings[job["title"]] for job in jobs]
+
+    monkeypatch.setattr(dedupe, "_embed_batch", embed_batch)
+    index = IVFIndex(2)
+    index.add(["1"], [embeddings["Old"]])
+
+    jobs = [{"title": "Repost"}, {"title": "New"}]
+    kept = dedupe_jobs(jobs, config=DedupConfig(), index=index)
+    assert [job["title"] for job in kept] == ["New"]
+
+
+def _fake_jobs_table(
+    monkeypatch: Any, table: dict[int, tuple[datetime, str, str]]
+) -> list[tuple[Any, ...]]:
+    """Serve ``jobs_normalized`` keyset pages from ``table``; return queries."""
+
+    queries: list[tuple[Any, ...]] = []
+
+    class Cursor:
+        def execute(self, query: str, params: tuple[Any, ...]) -> None:
+            queries.append(params)
+            after, after_id, limit = params
+            self.rows = sorted(
+                (
+                    (key, updated, title, description)
+                    for key, (updated, title, description) in table.items()
+                    if (updated, key) > (after, after_id)
+                ),
+                key=lambda row: (row[1], row[0]),
+            )[:limit]
+
+        def fetchall(self) -> list[tuple[Any, ...]]:
+            return self.rows
+
+        def __enter__(self) -> "Cursor":
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            return None
+
+    class Conn:
+        def __enter__(self) -> "Conn":
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            return None
+
+        def cursor(self) -> Cursor:
+            return Cursor()
+
+    @contextmanager
+    def pg_conn() -> Iterator[Conn]:
+        yield Conn()
+
+    monkeypatch.setattr(main, "_pg_conn", pg_conn)
+    monkeypatch.setattr(main, "_DEDUPE_INDEX", None)
+    return queries
+
+
+def test_update_dedupe_index_only_embeds_changed_rows(
+    monkeypatch: Any, tmp_path
+) -> None:
+    t0 = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    table = {
+        1: (t0, "Dev", "python"),
+        2: (t0 + timedelta(seconds=1), "Ops", "linux"),
+    }
+    queries = _fake_jobs_table(monkeypatch, table)
+    embedded: list[str] = []
+
+    def embed_batch(jobs: Sequence[dict], batch_size: int) -> list[list[float]]:
+        embedded.extend(job["title"] for job in jobs)
+        return [[1.0, 0.0] if job["title"] == "Dev" else [0.0, 1.0] for job in jobs]
+
+    monkeypatch.setattr(main, "_DEDUPE_INDEX_PAGE", 1)
+    monkeypatch.setattr(dedupe, "_embed_batch", embed_batch)
+    path = str(tmp_path / "dedupe.npz")
+
+    assert main.update_dedupe_index(path) == 2
+    table[2] = (t0 + timedelta(seconds=5), "Ops", "kubernetes")
+    table[3] = (t0 + timedelta(seconds=6), "QA", "testing")
+    assert main.update_dedupe_index(path) == 2
+    assert embedded == ["Dev", "Ops", "Ops", "QA"]
+    # Rows inside the overlap window are read again but not re-embedded.
+    assert queries[-4][:2] == (t0 + timedelta(seconds=1) - timedelta(seconds=60), 0)
+
+    loaded = IVFIndex.load(path)
+    assert len(loaded) == 3
+    assert loaded.metadata["watermark"] == (t0 + timedelta(seconds=6)).isoformat()
+    assert loaded.search([1.0, 0.0], k=1) == [[("1", 1.0)]]
+
+
+def test_freshly_ingested_jobs_dedupe_against_older_ones_only(
+    monkeypatch: Any, tmp_path
+) -> None:
+    t0 = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    table = {1: (t0, "Dev", "python")}
+    _fake_jobs_table(monkeypatch, table)
+    embeddings = {
+        "Dev": [1.0, 0.0],
+        "Dev repost": [0.99, 0.14],
+        "Ops": [0.0, 1.0],
+        "Ops engineer": [0.14, 0.99],
+    }
+
+    def embed_batch(jobs: Sequence[dict], batch_size: int) -> list[list[float]]:
+        return [embeddings[job["title"]] for job in jobs]
+
+    monkeypatch.setattr(dedupe, "_embed_batch", embed_batch)
+    path = str(tmp_path / "dedupe.npz")
+    main.update_dedupe_index(path)
+    # The next run persists three postings; ingestion indexes them.
+    fresh = {2: "Dev repost", 3: "Ops", 4: "Ops engineer"}
+    for key, title in fresh.items():
+        table[key] = (t0 + timedelta(seconds=key), title, "")
+    main.update_dedupe_index(path)
+    assert len(main._DEDUPE_INDEX) == 4
+
+    kept = dedupe_jobs(
+        [{"title": title} for title in fresh.values()],
+        config=DedupConfig(),
+        index=main._DEDUPE_INDEX,
+        ids=[str(key) for key in fresh],
+    )
+    # The repost matches the older job; the Ops pair collapses to its first.
+    assert [job["title"] for job in kept] == ["Ops"]
+
+
+def test_only_the_leader_updates_the_index(monkeypatch: Any) -> None:
+    updates: list[str | None] = []
+
+    def update(path: str | None = None) -> int:
+        updates.append(path)
+        return 3
+
+    class Leader:
+        def __init__(self, held: bool) -> None:
+            self.held = held
+
+        def acquire(self) -> bool:
+            return self.held
+
+    monkeypatch.setattr(main, "update_dedupe_index", update)
+    assert main._dedupe_index_tick(Leader(False)) == 0
+    assert updates == []
+    assert main._dedupe_index_tick(Leader(True)) == 3
+    assert updates == [None]
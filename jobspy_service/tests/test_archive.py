@@ -0,0 +1,137 @@
+"""Tests for the raw scrape archive and offline replay."""
+
+from __future__ import annotations
+
+from datetime import date
+import gzip
+import os
+from pathlib import Path
+import sys
+from typing import Any
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+import jobspy_service.app.main as main  # noqa: E402
+from jobspy_service.app import replay  # noqa: E402
+from jobspy_service.app.archive import RawArchive  # noqa: E402
+from jobspy_service.app.db import ConnectionPool  # noqa: E402
+
+# 2024-05-01T12:00:00Z
+NOON = 1714564800.0
+
+
+def test_archive_round_trips_partitioned_by_day_and_board(tmp_path) -> None:
+    archive = RawArchive(str(tmp_path))
+    jobs = [{"title": "Dev", "posted": date(2024, 5, 1)}, {"title": "Ops"}]
+    writer = archive.writer("indeed", "run-1", NOON)
+    writer.write(jobs)
+    writer.close()
+    archive.writer("linkedin", "run-2", NOON + 86400).close()
+
+    path = tmp_path / "date=2024-05-01" / "board=indeed" / "run-1.ndjson.gz"
+    assert gzip.open(path).read()  # gzip-compressed
+    assert list(archive.files()) == [
+        ("indeed", str(path)),
+        ("linkedin", archive.path_for("linkedin", "run-2", NOON + 86400)),
+    ]
+    assert list(archive.files(since=date(2024, 5, 2))) == [
+        ("linkedin", archive.path_for("linkedin", "run-2", NOON + 86400))
+    ]
+    assert list(archive.read(str(path))) == [
+        {"title": "Dev", "posted": "2024-05-01"},
+        {"title": "Ops"},
+    ]
+
+
+def test_aborted_writer_leaves_nothing_behind(tmp_path) -> None:
+    archive = RawArchive(str(tmp_path))
+    writer = archive.writer("indeed", "run-1", NOON)
+    writer.write([{"title": "Dev"}])
+    writer.abort()
+    assert list(archive.files()) == []
+    assert not any(files for _, _, files in os.walk(tmp_path))
+
+
+def test_nan_is_archived_as_missing(tmp_path) -> None:
+    archive = RawArchive(str(tmp_path))
+    writer = archive.writer("indeed", "run-1", NOON)
+    writer.write([{"title": "Dev", "company": float("nan"), "job_id": "1"}])
+    writer.close()
+
+    [(_, path)] = list(archive.files())
+    replayed = main.normalize_batch("indeed", list(archive.read(path)))
+    live = main.normalize_batch("indeed", [{"title": "Dev", "job_id": "1"}])
+    assert replayed == live
+    assert replayed[0].company is None
+
+
+def _configure(monkeypatch, tmp_path, mode: str) -> RawArchive:
+    monkeypatch.setenv("INGEST_ARCHIVE_DIR", str(tmp_path / "archive"))
+    main.BOARD_CONFIG["demo"] = {
+        "enabled": True,
+        "cadence": "4h",
+        "results_wanted_max": 25,
+        "ingest_mode": mode,
+        "page_size": 10,
+    }
+    return RawArchive(str(tmp_path / "archive"))
+
+
+def _scrape(
+    board: str, *, results_wanted_max: int, offset: int = 0, **_: Any
+) -> dict[str, Any]:
+    jobs = [{"title": f"Dev {i}", "job_id": str(i)} for i in range(25)]
+    return {"jobs": jobs[offset : offset + results_wanted_max]}
+
+
+def test_ingest_archives_raw_payload(monkeypatch, tmp_path) -> None:
+    for mode in ("sequential", "pipelined"):
+        archive = _configure(monkeypatch, tmp_path / mode, mode)
+        with patch.object(main, "scrape_jobs", side_effect=_scrape):
+            run = main.ingest_board("demo", now=NOON)
+
+        [(board, path)] = list(archive.files())
+        assert board == "demo"
+        assert path.endswith(f"{run.run_id}.ndjson.gz")
+        assert [job["job_id"] for job in archive.read(path)] == [
+            str(i) for i in range(25)
+        ]
+    # Sequential runs time archiving as a stage of its own.
+    assert "archive" in [s.stage for s in main.INGESTION_RUNS[-2].stages]
+
+
+def test_replay_renormalizes_without_scraping(monkeypatch, tmp_path) -> None:
+    archive = _configure(monkeypatch, tmp_path, "sequential")
+    with patch.object(main, "scrape_jobs", side_effect=_scrape):
+        main.ingest_board("demo", now=NOON)
+        main.ingest_board("demo", now=NOON + 86400)
+
+    persisted: list[int] = []
+
+    class Conn:
+        def __enter__(self) -> "Conn":
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            return None
+
+        def cursor(self) -> "Conn":
+            return self
+
+        def close(self) -> None:
+            return None
+
+    def persist(cur: Any, rows: list[main.JobRow], cfg: Any) -> main.PersistResult:
+        persisted.append(len(rows))
+        return main.PersistResult(unique_new=len(rows))
+
+    monkeypatch.setattr(main, "_POOL", ConnectionPool(Conn))
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+    monkeypatch.setattr(replay, "_persist_chunk", persist)
+    with patch.object(main, "scrape_jobs", side_effect=AssertionError("network")):
+        dry = replay.replay(archive, dry_run=True)
+        assert (dry.files, dry.rows, persisted) == (2, 50, [])
+        stats = replay.replay(archive, since=date(2024, 5, 2), chunk_size=10)
+
+    assert (stats.files, stats.rows, stats.unique_new) == (1, 25, 25)
+    assert persisted == [10, 10, 5]
@@ -0,0 +1,386 @@
+"""Tests for the bounded search cache."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from typing import Any
+from unittest.mock import patch
+import zlib
+
+import pytest
+from fastapi import Response
+
+from jobspy_service.app import main
+from jobspy_service.app.cache import (
+    PopularityTracker,
+    SearchCache,
+    SQLiteCacheBackend,
+    TieredCache,
+    load_snapshot,
+    normalize_key,
+    save_snapshot,
+)
+
+
+def test_keys_fold_case_and_whitespace() -> None:
+    assert normalize_key("Indeed ", "  Python   Developer ") == (
+        "indeed",
+        "python developer",
+    )
+    assert normalize_key("indeed", None) == ("indeed", "")
+
+
+def test_lru_eviction_by_entry_count() -> None:
+    cache: SearchCache[str] = SearchCache(max_entries=2)
+    cache.set("a", "1", ttl=60)
+    cache.set("b", "2", ttl=60)
+    assert cache.get("a") == "1"  # "b" is now least recently used
+    cache.set("c", "3", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_is_enforced() -> None:
+    cache: SearchCache[str] = SearchCache(max_bytes=10, sizeof=len)
+    cache.set("a", "x" * 6, ttl=60)
+    cache.set("b", "y" * 6, ttl=60)
+    cache.set("huge", "z" * 11, ttl=60)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+    assert cache.get("huge") is None
+    assert cache.stats()["bytes"] == 6
+
+
+def test_expired_entries_are_deleted() -> None:
+    current = {"t": 0.0}
+    cache: SearchCache[str] = SearchCache(sizeof=len)
+    with patch("jobspy_service.app.cache.time.time", lambda: current["t"]):
+        cache.set("a", "abc", ttl=5)
+        cache.set("b", "def", ttl=50)
+        current["t"] = 10.0
+        assert cache.purge_expired() == 1
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 3
+    assert stats["expirations"] == 1
+
+
+@pytest.mark.anyio
+async def test_cache_stats_endpoint(monkeypatch: Any, client: Any) -> None:
+    main._CACHE.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    monkeypatch.setenv("JOBSPY_DELAY_SECONDS", "0")
+    before = main._CACHE.stats()
+
+    with patch("jobspy_service.app.main.scrape_jobs", return_value={"jobs": []}):
+        for term in ("Python", " python ", "PYTHON"):
+            await client.get(
+                "/jobs/search", params={"source": "indeed", "search_term": term}
+            )
+
+    stats = (await client.get("/jobs/cache/stats")).json()
+    assert stats["entries"] == 1
+    assert stats["hits"] - before["hits"] == 2
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["bytes"] > 0
+    main._CACHE.clear()
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_scrape(monkeypatch: Any) -> None:
+    main._CACHE.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    monkeypatch.setenv("JOBSPY_DELAY_SECONDS", "0")
+    coalesced_before = main._INFLIGHT.stats()["coalesced"]
+    release = threading.Event()
+    calls: list[str | None] = []
+
+    def fake_scrape(source: str, **kwargs: Any) -> dict[str, Any]:
+        calls.append(kwargs.get("search_term"))
+        assert release.wait(5)
+        return {"jobs": [{"title": "Dev"}]}
+
+    async def release_when_coalesced() -> None:
+        while main._INFLIGHT.stats()["coalesced"] - coalesced_before < 2:
+            await asyncio.sleep(0.01)
+        release.set()
+
+    with patch("jobspy_service.app.main.scrape_jobs", side_effect=fake_scrape):
+        *responses, _ = await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    main.search_jobs("indeed", Response(), search_term="python")
+                    for _ in range(3)
+                ),
+                release_when_coalesced(),
+            ),
+            timeout=5,
+        )
+
+    assert calls == ["python"]
+    assert all(r is responses[0] for r in responses)
+    assert main._INFLIGHT.stats()["in_flight"] == 0
+    main._CACHE.clear()
+
+
+def test_sqlite_tier_is_shared_between_workers(tmp_path: Any) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+
+    def worker_cache() -> TieredCache[main.JobSearchResponse]:
+        return TieredCache(
+            SearchCache(),
+            SQLiteCacheBackend(path),
+            encode=lambda r: r.model_dump_json().encode(),
+            decode=main.JobSearchResponse.model_validate_json,
+        )
+
+    first, second = worker_cache(), worker_cache()
+    response = main.JobSearchResponse(
+        source="indeed", jobs=[main.Job(title="Dev", company="Acme")]
+    )
+    first.set(("indeed", "python"), response, ttl=60)
+
+    assert second.get(("indeed", "python")) == response
+    assert second.stats()["l2_hits"] == 1
+    # Promoted into the second worker's L1, so the next read stays local.
+    assert second.get(("indeed", "python")) == response
+    assert second.stats()["l2_hits"] == 1
+
+    with sqlite3.connect(path) as db:
+        (payload,) = db.execute("SELECT payload FROM search_cache").fetchone()
+    assert json.loads(zlib.decompress(payload))["jobs"][0]["company"] == "Acme"
+
+
+def test_sqlite_tier_honours_ttl(tmp_path: Any) -> None:
+    current = {"t": 100.0}
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    with patch("jobspy_service.app.cache.time.time", lambda: current["t"]):
+        backend.set('["indeed", "python"]', b"{}", expires_at=105.0)
+        assert backend.get('["indeed", "python"]') == (105.0, b"{}")
+        current["t"] = 106.0
+        assert backend.get('["indeed", "python"]') is None
+        assert backend.purge_expired() == 1
+
+
+def test_sqlite_tier_purges_on_write_and_caps_entries(tmp_path: Any) -> None:
+    current = {"t": 100.0}
+    backend = SQLiteCacheBackend(
+        str(tmp_path / "cache.sqlite3"), max_entries=3, purge_every=2
+    )
+    with patch("jobspy_service.app.cache.time.time", lambda: current["t"]):
+        backend.set("expired", b"{}", expires_at=101.0, stored_at=100.0)
+        current["t"] = 102.0
+        for i in range(5):
+            backend.set(f"k{i}", b"{}", expires_at=1000.0, stored_at=102.0 + i)
+        # Six writes, so three purges: the expired row and the two oldest go.
+        stats = backend.stats()
+        assert (stats["entries"], stats["evictions"]) == (3, 2)
+        assert backend.get("k1") is None
+        assert [backend.get(f"k{i}") is not None for i in (2, 3, 4)] == [True] * 3
+
+
+@pytest.mark.anyio
+async def test_stale_results_are_served_while_one_refresh_runs(
+    monkeypatch: Any, client: Any
+) -> None:
+    main._CACHE.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    monkeypatch.setenv("JOBSPY_DELAY_SECONDS", "0")
+    monkeypatch.setattr(main, "CACHE_TTL", 5)
+    monkeypatch.setattr(main, "CACHE_STALE_TTL", 60)
+    current = {"t": 1000.0}
+    scrapes: list[float] = []
+
+    def fake_scrape(source: str, **kwargs: Any) -> dict[str, Any]:
+        scrapes.append(current["t"])
+        return {"jobs": [{"title": f"Dev {len(scrapes)}"}]}
+
+    async def search() -> tuple[str, str]:
+        resp = await client.get(
+            "/jobs/search", params={"source": "indeed", "search_term": "python"}
+        )
+        return resp.headers["age"], resp.json()["jobs"][0]["title"]
+
+    with patch("jobspy_service.app.main.scrape_jobs", side_effect=fake_scrape):
+        with patch("jobspy_service.app.main.time.time", lambda: current["t"]):
+            assert await search() == ("0", "Dev 1")
+            current["t"] = 1003.0
+            assert await search() == ("3", "Dev 1")
+            # Stale: answered from cache at once, refreshed in the background.
+            current["t"] = 1010.0
+            assert await search() == ("10", "Dev 1")
+            assert await search() == ("10", "Dev 1")
+            await asyncio.gather(*main._REFRESHES)
+            assert scrapes == [1000.0, 1010.0]
+            current["t"] = 1012.0
+            assert await search() == ("2", "Dev 2")
+            # Past the stale window a request waits for a fresh scrape.
+            current["t"] = 1100.0
+            assert await search() == ("0", "Dev 3")
+
+    assert main._INFLIGHT.stats()["in_flight"] == 0
+    main._CACHE.clear()
+
+
+def test_sqlite_tier_keeps_result_age(tmp_path: Any) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    with sqlite3.connect(path) as db:
+        # A file written before result ages were stored.
+        db.execute(
+            "CREATE TABLE search_cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload BLOB NOT NULL)"
+        )
+        db.execute(
+            "INSERT INTO search_cache VALUES (?, ?, ?)",
+            ('"old"', 200.0, zlib.compress(b'"v"')),
+        )
+    current = {"t": 100.0}
+    with patch("jobspy_service.app.cache.time.time", lambda: current["t"]):
+        cache: TieredCache[str] = TieredCache(
+            SearchCache(),
+            SQLiteCacheBackend(path),
+            encode=lambda v: json.dumps(v).encode(),
+            decode=json.loads,
+        )
+        cache.set("new", "v", ttl=60)
+        current["t"] = 130.0
+        cache.l1.clear()
+        assert cache.lookup("new") == ("v", 100.0)
+        assert cache.l1.lookup("new") == ("v", 100.0)  # promoted with its age
+        assert cache.lookup("old") == ("v", 0.0)
+
+
+def test_popularity_decays_and_forgets_least_popular() -> None:
+    current = {"t": 0.0}
+    with patch("jobspy_service.app.cache.time.time", lambda: current["t"]):
+        tracker = PopularityTracker(half_life=3600, max_keys=2)
+        for _ in range(3):
+            tracker.record("a")
+        current["t"] = 3600.0
+        tracker.record("b")
+        tracker.record("b")
+        assert tracker.ranked() == [("b", 2.0), ("a", 1.5)]
+        tracker.record("c")
+        assert [key for key, _ in tracker.ranked()] == ["b", "a"]
+
+
+@pytest.mark.anyio
+async def test_prewarm_refreshes_hot_keys_within_rate_budget(monkeypatch: Any) -> None:
+    main._CACHE.clear()
+    main._POPULARITY.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    # Two tokens and effectively no refill during the test.
+    monkeypatch.setenv("JOBSPY_RATE_LIMITS", "indeed=0.0001:2")
+    for term, count in (("python", 4), ("java", 3), ("rust", 2), ("go", 1)):
+        for _ in range(count):
+            main._POPULARITY.record(("indeed", term))
+    main._CACHE.set(
+        ("indeed", "python"), main.JobSearchResponse(source="indeed", jobs=[]), ttl=60
+    )
+    scraped: list[str] = []
+
+    def fake_scrape(source: str, **kwargs: Any) -> dict[str, Any]:
+        scraped.append(kwargs["search_term"])
+        return {"jobs": []}
+
+    with patch("jobspy_service.app.main.scrape_jobs", side_effect=fake_scrape):
+        assert await main.prewarm_cache(3) == 2
+        assert await main.prewarm_cache(3) == 0  # all fresh now
+        # Everything is due, but the bucket is empty.
+        assert await main.prewarm_cache(3, lead=3600) == 0
+
+    assert scraped == ["java", "rust"]
+    assert main._CACHE.peek(("indeed", "rust")) is not None
+    assert main._CACHE.peek(("indeed", "go")) is None
+    main._CACHE.clear()
+    main._POPULARITY.clear()
+
+
+@pytest.mark.anyio
+async def test_prewarm_skips_non_leaders_before_taking_a_token(
+    monkeypatch: Any,
+) -> None:
+    main._CACHE.clear()
+    main._POPULARITY.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    monkeypatch.setenv("JOBSPY_RATE_LIMITS", "indeed=0.0001:1")
+    main._POPULARITY.record(("indeed", "python"))
+
+    class Follower:
+        def acquire(self) -> bool:
+            return False
+
+    with patch("jobspy_service.app.main.scrape_jobs", return_value={"jobs": []}):
+        assert await main.prewarm_cache(3, leader=Follower()) == 0
+        # The follower left the only token for the leader.
+        assert await main.prewarm_cache(3) == 1
+    main._CACHE.clear()
+    main._POPULARITY.clear()
+
+
+def test_snapshot_round_trip_keeps_age_and_popularity(tmp_path: Any) -> None:
+    path = str(tmp_path / "snapshot" / "cache.json")
+    current = {"t": 1000.0}
+    with patch("jobspy_service.app.cache.time.time", lambda: current["t"]):
+        cache: SearchCache[main.JobSearchResponse] = SearchCache()
+        tracker = PopularityTracker()
+        live = main.JobSearchResponse(source="indeed", jobs=[main.Job(title="Dev")])
+        cache.set(("indeed", "python"), live, ttl=600, stored_at=990.0)
+        cache.set(("indeed", "java"), live, ttl=5)
+        tracker.record(("indeed", "python"))
+        assert save_snapshot(
+            path, cache, tracker, encode=lambda r: r.model_dump(mode="json")
+        ) == 2
+
+        current["t"] = 1010.0
+        restored: SearchCache[main.JobSearchResponse] = SearchCache()
+        popularity = PopularityTracker()
+        assert load_snapshot(
+            path,
+            restored,
+            popularity,
+            decode=main.JobSearchResponse.model_validate,
+        ) == 1
+
+        assert restored.lookup(("indeed", "python")) == (live, 990.0)
+        assert [key for key, _ in popularity.ranked()] == [("indeed", "python")]
+        current["t"] = 1601.0
+        assert restored.get(("indeed", "python")) is None  # original expiry kept
+
+
+def test_snapshots_write_through_private_temp_files(tmp_path: Any) -> None:
+    path = str(tmp_path / "cache.json")
+    cache: SearchCache[list[int]] = SearchCache()
+    cache.set(("indeed", "python"), [1, 2], ttl=600)
+    temps: list[str] = []
+    replace = os.replace
+
+    def record(src: str, dst: str) -> None:
+        temps.append(os.path.basename(src))
+        replace(src, dst)
+
+    with patch("jobspy_service.app.cache.os.replace", record):
+        for _ in range(2):
+            save_snapshot(path, cache, PopularityTracker(), encode=list)
+
+    # Workers sharing the path must not write into each other's temp file.
+    assert len(set(temps)) == 2
+    assert all(f".{os.getpid()}." in name for name in temps)
+    assert os.listdir(tmp_path) == ["cache.json"]
+    with open(path, encoding="utf-8") as fh:
+        [entry] = json.load(fh)["entries"]
+    assert entry["value"] == [1, 2]
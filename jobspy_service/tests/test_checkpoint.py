@@ -0,0 +1,308 @@
+"""Tests for chunked, checkpointed and resumable persistence."""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+import sys
+from typing import Any
+from unittest.mock import patch
+
+import psycopg2
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+import jobspy_service.app.main as main  # noqa: E402
+from jobspy_service.app.db import ConnectionPool  # noqa: E402
+from jobspy_service.app.spool import RunSpool  # noqa: E402
+
+
+class FakeDB:
+    """Transactional stand-in for the tables touched by persistence.
+
+    Rows whose ``job_id_ext`` is in ``reject`` violate a constraint, and
+    ``drop_on_chunk`` simulates the connection dying on that chunk;
+    ``drop_on_record`` does so once when the run itself is recorded.
+    """
+
+    def __init__(self, drop_on_chunk: int | None = None) -> None:
+        self.state: dict[str, dict[Any, Any]] = {
+            "jobs": {},
+            "checkpoints": {},
+            "runs": {},
+            "stages": {},
+        }
+        self.drop_on_chunk = drop_on_chunk
+        self.drop_on_record = False
+        self.reject: set[str] = set()
+        self.chunks = 0
+
+
+class FakeConn:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+        self.txn: dict[str, dict[Any, Any]] | None = None
+        self.savepoints: dict[str, Any] = {}
+        self.result: list[tuple[Any, ...]] = []
+
+    def __enter__(self) -> "FakeConn":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: object) -> None:
+        if exc_type is None and self.txn is not None:
+            self.db.state = self.txn
+        self.txn = None
+
+    def cursor(self) -> "FakeConn":
+        return self
+
+    def rollback(self) -> None:
+        self.txn = None
+
+    def close(self) -> None:
+        return None
+
+    def executemany(self, query: str, params: list[Any]) -> None:
+        if "ingestion_run_stages" not in query:
+            return
+        assert self.txn is not None
+        for run_id, stage, *timing in params:
+            if (run_id, stage) in self.txn["stages"]:
+                raise psycopg2.IntegrityError("duplicate key ingestion_run_stages")
+            self.txn["stages"][(run_id, stage)] = timing
+
+    def fetchone(self) -> tuple[Any, ...] | None:
+        return self.result[0] if self.result else None
+
+    def fetchall(self) -> list[tuple[Any, ...]]:
+        return self.result
+
+    def execute(self, query: str, params: Any = None) -> None:
+        if self.txn is None:
+            self.txn = copy.deepcopy(self.db.state)
+        tables = self.txn
+        self.result = []
+        q = " ".join(query.split())
+        if q.startswith("SAVEPOINT"):
+            if q == "SAVEPOINT persist_chunk":
+                self.db.chunks += 1
+                if self.db.chunks == self.db.drop_on_chunk:
+                    raise psycopg2.OperationalError("server closed the connection")
+            self.savepoints[q.split()[1]] = copy.deepcopy(tables)
+        elif q.startswith("ROLLBACK TO SAVEPOINT"):
+            self.txn = copy.deepcopy(self.savepoints[q.split()[-1]])
+        elif q.startswith("INSERT INTO jobs_normalized"):
+            bulk = "::integer" in q
+            width = 10 if bulk else 9
+            rows = [params[i : i + width] for i in range(0, len(params), width)]
+            for row in rows:
+                job = main.JobRow._make(row[1:] if bulk else row)
+                if job.job_id_ext in self.db.reject:
+                    raise psycopg2.IntegrityError("violates check constraint")
+            for row in rows:
+                job = main.JobRow._make(row[1:] if bulk else row)
+                key = (job.source, job.job_id_ext)
+                self.result.append((key not in tables["jobs"],))
+                tables["jobs"][key] = job
+        elif q.startswith("INSERT INTO ingestion_checkpoints"):
+            run_id = params[0]
+            current = tables["checkpoints"].get(run_id)
+            fresh = {"committed": 0, "unique_new": 0, "unchanged": 0, "failed_rows": 0}
+            if "'resuming'" not in q:
+                tables["checkpoints"][run_id] = {**fresh, "status": "running"}
+            elif current is None or current["status"] == "failed":
+                current = {**(current or fresh), "status": "resuming"}
+                tables["checkpoints"][run_id] = current
+                self.result = [tuple(current[k] for k in fresh)]
+        elif q.startswith("SELECT status FROM ingestion_checkpoints"):
+            current = tables["checkpoints"].get(params[0])
+            self.result = [(current["status"],)] if current else []
+        elif q.startswith("UPDATE ingestion_checkpoints SET committed"):
+            committed, unique_new, unchanged, failed, run_id = params
+            tables["checkpoints"][run_id].update(
+                committed=committed,
+                unique_new=unique_new,
+                unchanged=unchanged,
+                failed_rows=failed,
+            )
+        elif q.startswith("UPDATE ingestion_checkpoints SET status"):
+            if "'complete'" in q:
+                tables["checkpoints"][params[0]]["status"] = "complete"
+            else:
+                tables["checkpoints"][params[1]]["status"] = params[0]
+        elif q.startswith("INSERT INTO ingestion_runs"):
+            if self.db.drop_on_record:
+                self.db.drop_on_record = False
+                raise psycopg2.OperationalError("server closed the connection")
+            tables["runs"][params[0]] = params
+
+
+@pytest.fixture
+def db(monkeypatch) -> FakeDB:
+    fake = FakeDB()
+    monkeypatch.setattr(main, "_POOL", ConnectionPool(lambda: FakeConn(fake)))
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+    main.BOARD_CONFIG["demo"] = {
+        "enabled": True,
+        "cadence": "4h",
+        "results_wanted_max": 100,
+        "commit_size": 10,
+    }
+    return fake
+
+
+def _scrape(count: int) -> dict[str, Any]:
+    return {"jobs": [{"title": f"Dev {i}", "job_id": str(i)} for i in range(count)]}
+
+
+def test_rejected_rows_are_counted_not_fatal(db: FakeDB) -> None:
+    db.reject = {"3", "17"}
+    with patch.object(main, "scrape_jobs", return_value=_scrape(25)):
+        run = main.ingest_board("demo", now=1.0)
+
+    assert run.errors == 0
+    assert run.failed_rows == 2
+    assert run.unique_new == 23
+    assert len(db.state["jobs"]) == 23
+    assert db.state["checkpoints"][run.run_id]["status"] == "complete"
+    assert run.run_id in db.state["runs"]
+
+
+def test_failed_run_resumes_from_last_committed_chunk(db: FakeDB) -> None:
+    db.drop_on_chunk = 2
+    with patch.object(main, "scrape_jobs", return_value=_scrape(25)) as scrape:
+        run = main.ingest_board("demo", now=1.0)
+
+    assert run.errors == 1
+    assert run.unique_new == 10
+    assert len(db.state["jobs"]) == 10
+    checkpoint = db.state["checkpoints"][run.run_id]
+    assert checkpoint["status"] == "failed"
+    assert checkpoint["committed"] == 10
+    assert run.run_id not in db.state["runs"]
+
+    resumed = main.resume_run(run.run_id)
+
+    assert scrape.call_count == 1
+    assert resumed.run_id == run.run_id
+    assert resumed.fetched == 25
+    assert resumed.unique_new == 25
+    assert len(db.state["jobs"]) == 25
+    assert db.state["checkpoints"][run.run_id]["status"] == "complete"
+    assert run.run_id in db.state["runs"]
+    assert not RunSpool(main._spool_dir(), run.run_id).exists()
+    with pytest.raises(HTTPException) as exc:
+        main.resume_run(run.run_id)
+    assert exc.value.status_code == 404
+
+
+def test_resume_skips_chunk_committed_despite_error(db: FakeDB) -> None:
+    db.drop_on_chunk = 2
+    with patch.object(main, "scrape_jobs", return_value=_scrape(25)):
+        run = main.ingest_board("demo", now=1.0)
+    # The failing commit reached the server after all.
+    db.state["checkpoints"][run.run_id]["committed"] = 20
+    db.state["checkpoints"][run.run_id]["unique_new"] = 20
+
+    resumed = main.resume_run(run.run_id)
+
+    assert db.chunks == 3  # only the final five rows were written again
+    assert resumed.unique_new == 25
+
+
+def test_pipelined_run_spools_and_resumes_with_full_totals(db: FakeDB) -> None:
+    main.BOARD_CONFIG["demo"].update(ingest_mode="pipelined", page_size=10)
+    jobs = _scrape(25)["jobs"]
+
+    def scrape(board: str, *, results_wanted_max: int, offset: int = 0, **_: Any):
+        return {"jobs": jobs[offset : offset + results_wanted_max]}
+
+    db.drop_on_chunk = 2
+    with patch.object(main, "scrape_jobs", side_effect=scrape):
+        run = main.ingest_board("demo", now=1.0)
+
+    assert (run.errors, run.fetched, run.normalized) == (1, 25, 25)
+    spooled = RunSpool(main._spool_dir(), run.run_id)
+    header = spooled.header()
+    assert (header["base"], header["run"]["fetched"]) == (10, 25)
+    assert [s["stage"] for s in header["run"]["stages"]] == ["scrape", "normalize"]
+    assert len(list(spooled.rows())) == 15
+
+    resumed = main.resume_run(run.run_id)
+
+    params = db.state["runs"][run.run_id]
+    assert params[2:5] == (25, 25, 25)  # fetched, normalized, unique_new
+    assert [s.stage for s in resumed.stages] == ["scrape", "normalize", "persist"]
+    assert {stage for _, stage in db.state["stages"]} == {
+        "scrape",
+        "normalize",
+        "persist",
+    }
+
+
+def test_resume_after_failed_completion_keeps_one_persist_stage(
+    db: FakeDB,
+) -> None:
+    db.drop_on_record = True
+    with patch.object(main, "scrape_jobs", return_value=_scrape(25)):
+        run = main.ingest_board("demo", now=1.0)
+    assert run.errors == 1
+    assert "persist" in [s.stage for s in run.stages]
+
+    resumed = main.resume_run(run.run_id)
+
+    stages = [s.stage for s in resumed.stages]
+    assert stages.count("persist") == 1
+    assert resumed.stages[stages.index("persist")].rows == 25
+    assert db.state["checkpoints"][run.run_id]["status"] == "complete"
+
+
+def test_running_checkpoint_cannot_be_resumed(db: FakeDB) -> None:
+    db.drop_on_chunk = 1
+    with patch.object(main, "scrape_jobs", return_value=_scrape(5)):
+        run = main.ingest_board("demo", now=1.0)
+    db.state["checkpoints"][run.run_id]["status"] = "running"
+
+    with pytest.raises(HTTPException) as exc:
+        main.resume_run(run.run_id)
+    assert exc.value.status_code == 409
+    assert RunSpool(main._spool_dir(), run.run_id).exists()
+
+
+def test_resuming_a_complete_run_removes_its_spool(db: FakeDB) -> None:
+    db.drop_on_chunk = 1
+    with patch.object(main, "scrape_jobs", return_value=_scrape(5)):
+        run = main.ingest_board("demo", now=1.0)
+    spool = RunSpool(main._spool_dir(), run.run_id)
+    assert spool.exists()
+    # As if an earlier resume completed the run but died before cleaning up.
+    db.state["checkpoints"][run.run_id]["status"] = "complete"
+
+    with pytest.raises(HTTPException) as exc:
+        main.resume_run(run.run_id)
+    assert exc.value.status_code == 409
+    assert not spool.exists()
+
+
+def test_scrape_window_starts_at_last_successful_run(db: FakeDB) -> None:
+    main.BOARD_CONFIG["demo"]["hours_old"] = 24
+    hour = 3600.0
+    with patch.object(main, "scrape_jobs", return_value=_scrape(25)) as scrape:
+        first = main.ingest_board("demo", now=1.0)
+        second = main.ingest_board("demo", now=1.0 + 4 * hour)
+        db.drop_on_chunk = db.chunks + 1
+        failed = main.ingest_board("demo", now=1.0 + 8 * hour)
+        db.drop_on_chunk = None
+        after_failure = main.ingest_board("demo", now=1.0 + 12 * hour)
+        idle = main.ingest_board("demo", now=1.0 + 100 * hour)
+
+    windows = [c.kwargs["hours_old"] for c in scrape.call_args_list]
+    # One hour of overlap; the failed run does not move the window forward.
+    assert windows == [24, 5, 5, 9, 24]
+    assert (first.hours_old, first.rows_saved) == (24, 0)
+    # 25 rows in 5 hours extrapolate to 120 over 24, capped at 100 wanted.
+    assert (second.hours_old, second.rows_saved) == (5, 75)
+    assert failed.errors == 1
+    assert after_failure.hours_old == 9
+    assert idle.rows_saved == 0
@@ -0,0 +1,105 @@
+"""Tests for the shared Postgres connection pool."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+from typing import Any
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from jobspy_service.app.db import ConnectionPool, PoolTimeout  # noqa: E402
+
+
+class FakeConn:
+    def __init__(self) -> None:
+        self.closed = 0
+        self.queries: list[str] = []
+
+    def cursor(self) -> "FakeConn":
+        return self
+
+    def __enter__(self) -> "FakeConn":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def execute(self, query: str, params: Any = None) -> None:
+        if self.closed:
+            raise RuntimeError("connection already closed")
+        self.queries.append(query)
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+def test_connections_are_reused() -> None:
+    created: list[FakeConn] = []
+
+    def connect() -> FakeConn:
+        created.append(FakeConn())
+        return created[-1]
+
+    pool = ConnectionPool(connect, min_size=1, max_size=2)
+    pool.open()
+    for _ in range(3):
+        with pool.connection() as conn:
+            assert conn is created[0]
+
+    stats = pool.stats()
+    assert len(created) == 1
+    assert stats["connections_created"] == 1
+    assert stats["reused"] == 3
+    assert stats["in_use"] == 0
+
+
+def test_health_check_replaces_dead_connection() -> None:
+    created: list[FakeConn] = []
+
+    def connect() -> FakeConn:
+        created.append(FakeConn())
+        return created[-1]
+
+    pool = ConnectionPool(connect, max_size=1, health_check_interval=0)
+    with pool.connection() as conn:
+        first = conn
+    first.closed = 2  # server closed the socket while idle
+
+    with pool.connection() as conn:
+        assert conn is not first
+        assert conn.closed == 0
+
+    with pool.connection() as conn:
+        assert conn.queries == ["SELECT 1"]
+    assert pool.stats()["connections_discarded"] == 1
+
+
+def test_checkout_times_out_when_exhausted() -> None:
+    pool = ConnectionPool(FakeConn, max_size=1, timeout=0.05)
+    held = pool.checkout()
+    with pytest.raises(PoolTimeout):
+        pool.checkout()
+    assert pool.stats()["timeouts"] == 1
+
+    released = threading.Timer(0.01, lambda: pool._release(held))
+    released.start()
+    pool.timeout = 2
+    assert pool.checkout() is held
+    released.join()
+
+
+def test_failed_connect_frees_capacity() -> None:
+    def connect() -> FakeConn:
+        raise ConnectionError("database down")
+
+    pool = ConnectionPool(connect, max_size=1, timeout=0.05)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            pool.checkout()
+    assert pool.stats()["size"] == 0
@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable, Sequence
+
+import numpy as np
 
 from jobspy_service.app import dedupe
 from jobspy_service.app.dedupe import DedupConfig, dedupe_jobs
 
 
+def _batched(embed: Callable[[dict], list[float]]) -> Callable[..., list[list[float]]]:
+    """Adapt a per-job fake embedding to the batched embedding interface."""
+
+    def embed_batch(jobs: Sequence[dict], batch_size: int) -> list[list[float]]:
+        return [embed(job) for job in jobs]
+
+    return embed_batch
+
+
 def test_semantic_duplicates_merge(monkeypatch: Any) -> None:
     """Jobs with very similar content are collapsed."""
 
@@ -20,7 +31,7 @@ def test_semantic_duplicates_merge(monkeypatch: Any) -> None:
     def fake_embed(job: dict) -> list[float]:
         return embeddings[job["title"]]
 
-    monkeypatch.setattr(dedupe, "_embed", fake_embed)
+    monkeypatch.setattr(dedupe, "_embed_batch", _batched(fake_embed))
 
     jobs = [
         {"title": "Python Developer", "description": "Build backend APIs"},
@@ -54,7 +65,7 @@ def test_thresholds_config_override(monkeypatch: Any) -> None:
     def fake_embed(job: dict) -> list[float]:
         return embeddings[job["title"]]
 
-    monkeypatch.setattr(dedupe, "_embed", fake_embed)
+    monkeypatch.setattr(dedupe, "_embed_batch", _batched(fake_embed))
 
     jobs = [
         {"title": "A", "description": "", "company_size": "big"},
@@ -80,7 +91,7 @@ def test_company_alias_collapse(monkeypatch: Any) -> None:
     def fake_embed(job: dict) -> list[float]:
         return embeddings[job["company"]]
 
-    monkeypatch.setattr(dedupe, "_embed", fake_embed)
+    monkeypatch.setattr(dedupe, "_embed_batch", _batched(fake_embed))
 
     jobs = [
         {
@@ -98,3 +109,65 @@ def test_company_alias_collapse(monkeypatch: Any) -> None:
     deduped = dedupe_jobs(jobs)
     assert len(deduped) == 1
 
+
+
+def test_embeddings_are_computed_in_batches_after_hash_filter(
+    monkeypatch: Any,
+) -> None:
+    """Only hash-distinct jobs are embedded, in one batched call."""
+
+    calls: list[tuple[list[str], int]] = []
+
+    def fake_embed_batch(jobs: Sequence[dict], batch_size: int) -> list[list[float]]:
+        calls.append(([job["title"] for job in jobs], batch_size))
+        return [[1.0, 0.0] if job["title"] != "C" else [0.0, 1.0] for job in jobs]
+
+    monkeypatch.setattr(dedupe, "_embed_batch", fake_embed_batch)
+
+    jobs = [{"title": t, "description": ""} for t in ("A", "A", "B", "C")]
+    deduped = dedupe_jobs(jobs, config=DedupConfig(embed_batch_size=16))
+
+    assert calls == [(["A", "B", "C"], 16)]
+    assert [j["title"] for j in deduped] == ["A", "C"]
+
+
+def test_matrix_pass_matches_pairwise_greedy(monkeypatch: Any) -> None:
+    """Blocked matrix checks keep exactly what the pairwise loop kept."""
+
+    rng = np.random.default_rng(0)
+    centres = rng.normal(size=(40, 16))
+    noise = rng.normal(scale=0.3, size=(600, 16))
+    vectors = centres[rng.integers(0, 40, 600)] + noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    jobs = [
+        {"title": f"Job {i}", "company_size": "big" if i % 3 else "small"}
+        for i in range(600)
+    ]
+    by_title = {job["title"]: vec for job, vec in zip(jobs, vectors)}
+    monkeypatch.setattr(
+        dedupe, "_embed_batch", _batched(lambda job: by_title[job["title"]])
+    )
+    monkeypatch.setattr(dedupe, "_BLOCK_SIZE", 64)
+    config = DedupConfig(big_company_threshold=0.9, small_company_threshold=0.85)
+
+    expected: list[str] = []
+    kept_vectors: list[np.ndarray] = []
+    for job in jobs:
+        vec = by_title[job["title"]].astype(np.float32)
+        threshold = 0.9 if job["company_size"] == "big" else 0.85
+        if all(float(vec @ other) < threshold for other in kept_vectors):
+            expected.append(job["title"])
+            kept_vectors.append(vec)
+
+    deduped = dedupe_jobs(jobs, config=config)
+    assert 40 <= len(expected) < 600
+    assert [j["title"] for j in deduped] == expected
+
+
+def test_embedding_matrix_grows_in_place() -> None:
+    matrix = dedupe._EmbeddingMatrix(2, capacity=1)
+    matrix.extend(np.array([[1.0, 0.0]], dtype=np.float32))
+    matrix.extend(np.array([[0.0, 1.0], [0.6, 0.8]], dtype=np.float32))
+    assert matrix.size == 3
+    similarity = matrix.max_similarity(np.array([[0.8, 0.6]], dtype=np.float32))
+    assert abs(float(similarity[0]) - 0.96) < 1e-6
@@ -1,5 +1,6 @@
 from pathlib import Path
 import sys
+import threading
 from typing import Any
 from unittest.mock import patch
 
@@ -7,6 +8,7 @@ import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 import jobspy_service.app.main as main
+from jobspy_service.app.db import ConnectionPool
 
 
 @pytest.mark.anyio
@@ -113,7 +115,7 @@ def test_cadence_persists_across_restart(monkeypatch) -> None:
 
         def execute(self, query: str, params: tuple | None = None) -> None:
             if "INSERT INTO ingestion_runs" in query:
-                run_id, board, fetched, norm, uniq, errs, ts = params or ()
+                run_id, board, *_, ts = params or ()
                 self.store.append({"board": board, "ts": float(ts)})
                 self.result = None
             elif "SELECT board" in query:
@@ -133,6 +135,9 @@ def test_cadence_persists_across_restart(monkeypatch) -> None:
                         max_ts = row["ts"]
                 self.result = [(max_ts,)]
 
+        def executemany(self, query: str, params: list[tuple]) -> None:
+            return None
+
         def fetchall(self) -> list[tuple[str, float | None]]:
             return self.result or []
 
@@ -161,6 +166,7 @@ def test_cadence_persists_across_restart(monkeypatch) -> None:
         return FakeConn(store)
 
     monkeypatch.setattr(main, "_pg_connect", connect)
+    monkeypatch.setattr(main, "_POOL", ConnectionPool(connect))
     main.INGESTION_RUNS.clear()
     main.BOARD_CONFIG.clear()
     main.BOARD_CONFIG["demo"] = {
@@ -180,3 +186,524 @@ def test_cadence_persists_across_restart(monkeypatch) -> None:
     main._LAST_RUN.clear()
     main._load_last_runs()
     assert main._due("demo", now=5 * 3600)
+
+
+class _RecordingCursor:
+    """Cursor double that answers upserts as if every row were new."""
+
+    def __init__(self, unchanged: int = 0) -> None:
+        self.statements: list[tuple[str, Any]] = []
+        self.result: list[tuple[Any, ...]] = []
+        # Rows per statement the fake database skips as content-identical.
+        self.unchanged = unchanged
+
+    def execute(self, query: str, params: Any = None) -> None:
+        self.statements.append((query, params))
+        if "INSERT INTO jobs_normalized" in query:
+            rows = query.count("::integer") or 1
+            self.result = [(True,)] * rows
+            if self.unchanged:
+                self.result = self.result[: -self.unchanged] if rows > 1 else []
+
+    def executemany(self, query: str, params: list[Any]) -> None:
+        self.statements.append((query, params))
+
+    def __enter__(self) -> "_RecordingCursor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def fetchone(self) -> tuple[Any, ...] | None:
+        return self.result[0] if self.result else None
+
+    def fetchall(self) -> list[tuple[Any, ...]]:
+        return self.result
+
+
+def _sample_rows(count: int) -> list[main.JobRow]:
+    return main.normalize_batch(
+        "demo", [{"title": "Dev", "job_id": str(i)} for i in range(count)]
+    )
+
+
+def test_bulk_persist_chunks_statements() -> None:
+    cur = _RecordingCursor()
+    cfg = {"persist_mode": "bulk", "chunk_size": 2}
+
+    result = main._persist_jobs(cur, _sample_rows(5), cfg)
+
+    upserts = [q for q, _ in cur.statements if "jobs_normalized" in q]
+    assert len(upserts) == 3
+    assert all("DISTINCT ON (source, job_id_ext)" in q for q in upserts)
+    assert result.unique_new == 5
+
+
+def test_row_persist_mode_is_kept_as_fallback() -> None:
+    cur = _RecordingCursor()
+
+    result = main._persist_jobs(cur, _sample_rows(3), {"persist_mode": "row"})
+
+    assert len(cur.statements) == 3
+    assert result.unique_new == 3
+
+
+def test_run_all_ingests_boards_concurrently() -> None:
+    main.INGESTION_RUNS.clear()
+    main.BOARD_CONFIG.clear()
+    for board in ("alpha", "beta", "broken"):
+        main.BOARD_CONFIG[board] = {
+            "enabled": True,
+            "cadence": "4h",
+            "results_wanted_max": 10,
+            "hours_old": 24,
+            "delay": 0,
+        }
+    main._LAST_RUN.clear()
+    main._LAST_RUN.update({"alpha": None, "beta": None, "broken": None})
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_scrape(board: str, **_: Any) -> dict[str, Any]:
+        if board == "broken":
+            raise RuntimeError("scraper blocked")
+        # Both healthy boards must be in flight at once to pass the barrier.
+        barrier.wait()
+        return {"jobs": [{"title": "Dev", "job_id": board}]}
+
+    with patch("jobspy_service.app.main.scrape_jobs", side_effect=fake_scrape):
+        runs = main.run_all_due(now=1.0, max_workers=3)
+
+    assert [r.board for r in runs] == ["alpha", "beta"]
+    assert len({r.run_id for r in runs}) == 2
+    assert all(r.fetched == 1 for r in runs)
+
+
+def test_content_hash_ignores_identity_fields() -> None:
+    raw = {"title": "Dev", "company": "Acme", "description": "Build", "id": "1"}
+    first = main.normalize_for_db("demo", raw)
+    moved = main.normalize_for_db("other", {**raw, "id": "2"})
+    edited = main.normalize_for_db("demo", {**raw, "description": "Build more"})
+
+    assert first["content_hash"] == moved["content_hash"]
+    assert first["content_hash"] != edited["content_hash"]
+
+
+def test_unchanged_rows_are_counted_not_rewritten() -> None:
+    rows = _sample_rows(4)
+    assert "WHERE jobs_normalized.content_hash IS DISTINCT FROM" in (
+        main._UPSERT_ASSIGNMENTS
+    )
+
+    bulk = main._persist_jobs(
+        _RecordingCursor(unchanged=3), rows, {"persist_mode": "bulk"}
+    )
+    per_row = main._persist_jobs(
+        _RecordingCursor(unchanged=1), rows, {"persist_mode": "row"}
+    )
+
+    assert (bulk.unique_new, bulk.unchanged) == (1, 3)
+    assert (per_row.unique_new, per_row.unchanged) == (0, 4)
+
+
+_NORMALIZE_CASES: list[dict[str, Any]] = [
+    {
+        "job_title": "Engineer",
+        "company": "Acme",
+        "job_description": "Build stuff",
+        "city": "NY",
+        "job_url": "http://indeed/job1",
+        "is_remote": True,
+    },
+    {
+        "title": "Developer",
+        "company_name": "Beta",
+        "description": "Write code",
+        "location": "SF",
+        "url": "http://linkedin/job2",
+        "remote": "remote",
+        "jobkey": "jk-2",
+    },
+    {"title": "", "company": "", "is_remote": False, "link": "http://x/3"},
+    {"remote_status": "hybrid", "id": "4", "location_name": "Remote, US"},
+    {"job_id_ext": "5", "remote_status": None, "is_remote": False},
+    {},
+]
+
+
+def test_normalize_batch_matches_per_row_path() -> None:
+    expected = [main.normalize_for_db("demo", raw) for raw in _NORMALIZE_CASES]
+
+    rows = main.normalize_batch("demo", _NORMALIZE_CASES)
+
+    assert [row._asdict() for row in rows] == expected
+    assert main.normalize_batch("demo", []) == []
+
+
+def test_normalize_batch_accepts_dataframe_like_input() -> None:
+    class Column:
+        def __init__(self, values: list[Any]) -> None:
+            self.values = values
+
+        def astype(self, _: type) -> "Column":
+            return self
+
+        def notna(self) -> list[bool]:
+            return [v is not None for v in self.values]
+
+        def where(self, mask: list[bool], other: Any) -> "Column":
+            return Column([v if m else other for v, m in zip(self.values, mask)])
+
+        def tolist(self) -> list[Any]:
+            return list(self.values)
+
+    class Frame:
+        def __init__(self, rows: list[dict[str, Any]]) -> None:
+            self.columns = sorted(set().union(*rows))
+            self._rows = rows
+
+        def __getitem__(self, name: str) -> Column:
+            return Column([row.get(name) for row in self._rows])
+
+        def __len__(self) -> int:
+            return len(self._rows)
+
+        def notna(self) -> None:  # pragma: no cover - marker only
+            return None
+
+    assert main.normalize_batch("demo", Frame(_NORMALIZE_CASES)) == (
+        main.normalize_batch("demo", _NORMALIZE_CASES)
+    )
+
+
+class _RecordingConn:
+    def __init__(self, cur: _RecordingCursor) -> None:
+        self.cur = cur
+
+    def cursor(self) -> _RecordingCursor:
+        return self.cur
+
+    def __enter__(self) -> "_RecordingConn":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def test_stage_timings_are_persisted_with_run(monkeypatch) -> None:
+    cur = _RecordingCursor()
+    monkeypatch.setattr(main, "_POOL", ConnectionPool(lambda: _RecordingConn(cur)))
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+    main.BOARD_CONFIG["demo"] = {"enabled": True, "cadence": "4h"}
+    sample = {"jobs": [{"title": "Dev", "job_id": str(i)} for i in range(4)]}
+
+    with patch("jobspy_service.app.main.scrape_jobs", return_value=sample):
+        run = main.ingest_board("demo", now=1.0)
+
+    assert run.errors == 0
+    assert [s.stage for s in run.stages] == [
+        "scrape",
+        "normalize",
+        "collapse",
+        "persist",
+    ]
+    assert all(s.rows == 4 and s.duration >= 0 for s in run.stages)
+    [(query, params)] = [
+        (q, p) for q, p in cur.statements if "INTO ingestion_run_stages" in q
+    ]
+    assert [p[:2] for p in params] == [
+        (run.run_id, "scrape"),
+        (run.run_id, "normalize"),
+        (run.run_id, "collapse"),
+        (run.run_id, "persist"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_stage_summary_reports_percentiles(client) -> None:
+    main.INGESTION_RUNS.clear()
+    for i, duration in enumerate([1.0, 2.0, 3.0, 4.0, 5.0]):
+        main.INGESTION_RUNS.append(
+            main.IngestionRun(
+                run_id=str(i),
+                board="demo",
+                fetched=10,
+                normalized=10,
+                unique_new=0,
+                errors=0,
+                timestamp=main.time.time(),
+                stages=[
+                    main.StageTiming(
+                        stage="scrape",
+                        duration=duration,
+                        rows=10,
+                        rows_per_second=10 / duration,
+                    )
+                ],
+            )
+        )
+    old = main.INGESTION_RUNS[0].model_copy(update={"timestamp": 0.0})
+    main.INGESTION_RUNS.append(old)
+
+    resp = await client.get("/ingest/stages/summary", params={"window_hours": 1})
+
+    assert resp.status_code == 200
+    [summary] = resp.json()
+    assert summary["board"] == "demo"
+    assert summary["stage"] == "scrape"
+    assert summary["runs"] == 5
+    assert summary["p50"] == 3.0
+    assert abs(summary["p95"] - 4.8) < 1e-9
+
+
+def _history(count: int) -> list[main.IngestionRun]:
+    runs = [
+        main.IngestionRun(
+            run_id=f"00000000-0000-0000-0000-{i:012d}",
+            board="alpha" if i % 2 else "beta",
+            fetched=0,
+            normalized=0,
+            unique_new=0,
+            errors=0,
+            # Pairs of runs share a timestamp so the run_id tie-break matters.
+            timestamp=float(i // 2),
+        )
+        for i in range(count)
+    ]
+    main.INGESTION_RUNS.clear()
+    main.INGESTION_RUNS.extend(runs)
+    return runs
+
+
+@pytest.mark.anyio
+async def test_runs_are_keyset_paginated(client) -> None:
+    runs = _history(7)
+    newest_first = [r.run_id for r in reversed(runs)]
+
+    seen: list[str] = []
+    params: dict[str, Any] = {"limit": 3}
+    while True:
+        page = (await client.get("/ingest/runs", params=params)).json()
+        if not page:
+            break
+        seen.extend(r["run_id"] for r in page)
+        params = {
+            "limit": 3,
+            "before_ts": page[-1]["timestamp"],
+            "before_id": page[-1]["run_id"],
+        }
+    assert seen == newest_first
+
+    # Walking back from the oldest page returns the page just newer than it.
+    oldest = runs[0]
+    back = await client.get(
+        "/ingest/runs",
+        params={"limit": 2, "after_ts": oldest.timestamp, "after_id": oldest.run_id},
+    )
+    assert [r["run_id"] for r in back.json()] == [runs[2].run_id, runs[1].run_id]
+
+
+@pytest.mark.anyio
+async def test_runs_filter_by_board_and_time_range(client) -> None:
+    runs = _history(8)
+    resp = await client.get(
+        "/ingest/runs", params={"board": "alpha", "since": 1, "until": 3}
+    )
+    expected = [
+        r.run_id
+        for r in reversed(runs)
+        if r.board == "alpha" and 1 <= r.timestamp < 3
+    ]
+    assert [r["run_id"] for r in resp.json()] == expected
+
+
+@pytest.mark.anyio
+async def test_runs_reject_invalid_cursors(client) -> None:
+    for params in (
+        {"limit": 0},
+        {"before_ts": 1, "after_ts": 2},
+        {"before_id": "00000000-0000-0000-0000-000000000001"},
+        {"before_ts": 1, "before_id": "not-a-uuid"},
+    ):
+        resp = await client.get("/ingest/runs", params=params)
+        assert resp.status_code == 400, params
+
+
+def test_run_history_is_bounded(monkeypatch) -> None:
+    monkeypatch.setattr(main, "INGESTION_RUNS", main.deque(maxlen=3))
+    main.BOARD_CONFIG["demo"] = {"enabled": True, "cadence": "4h"}
+    with patch("jobspy_service.app.main.scrape_jobs", return_value={"jobs": []}):
+        runs = [main.ingest_board("demo", now=float(i)) for i in range(5)]
+    assert list(main.INGESTION_RUNS) == runs[-3:]
+
+
+def _paged_scraper(total: int, *, on_page: Any = None) -> Any:
+    jobs = [{"title": "Dev", "job_id": str(i)} for i in range(total)]
+
+    def scrape(
+        board: str, *, results_wanted_max: int, offset: int = 0, **_: Any
+    ) -> dict[str, Any]:
+        if on_page is not None:
+            on_page(offset)
+        return {"jobs": jobs[offset : offset + results_wanted_max]}
+
+    return scrape
+
+
+def _pipelined_config(**overrides: Any) -> dict[str, Any]:
+    return {
+        "enabled": True,
+        "cadence": "4h",
+        "results_wanted_max": 25,
+        "ingest_mode": "pipelined",
+        "page_size": 10,
+        "queue_depth": 1,
+        **overrides,
+    }
+
+
+def test_pipelined_ingest_matches_sequential_totals(monkeypatch) -> None:
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+    runs = {}
+    for mode in ("sequential", "pipelined"):
+        cur = _RecordingCursor()
+        pool = ConnectionPool(lambda: _RecordingConn(cur))
+        monkeypatch.setattr(main, "_POOL", pool)
+        main.BOARD_CONFIG["demo"] = _pipelined_config(ingest_mode=mode)
+        with patch.object(main, "scrape_jobs", side_effect=_paged_scraper(40)):
+            runs[mode] = main.ingest_board("demo", now=1.0)
+        upserts = [q for q, _ in cur.statements if "INTO jobs_normalized" in q]
+        assert len(upserts) == (1 if mode == "sequential" else 3)
+
+    seq, pipe = runs["sequential"], runs["pipelined"]
+    for field in ("fetched", "normalized", "unique_new", "unchanged", "errors"):
+        assert getattr(pipe, field) == getattr(seq, field), field
+    assert pipe.fetched == 25
+    assert [(s.stage, s.rows) for s in pipe.stages] == [
+        ("scrape", 25),
+        ("normalize", 25),
+        ("persist", 25),
+    ]
+
+
+def test_pipelined_ingest_overlaps_persist_with_scrape(monkeypatch) -> None:
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+    cur = _RecordingCursor()
+    monkeypatch.setattr(main, "_POOL", ConnectionPool(lambda: _RecordingConn(cur)))
+    main.BOARD_CONFIG["demo"] = _pipelined_config(results_wanted_max=60)
+    first_persisted = threading.Event()
+    overlapped: list[bool] = []
+    scraped: list[int] = []
+    persisted: list[int] = []
+    real_persist = main._persist_jobs
+
+    def on_page(offset: int) -> None:
+        scraped.append(offset)
+        # Queues of depth 1 bound how far scraping may run ahead of persist.
+        assert len(scraped) - len(persisted) <= 4
+        if offset == 30:
+            overlapped.append(first_persisted.wait(timeout=5))
+
+    def persist(cur: Any, rows: list[main.JobRow], cfg: dict[str, Any]) -> Any:
+        result = real_persist(cur, rows, cfg)
+        persisted.append(len(rows))
+        first_persisted.set()
+        return result
+
+    monkeypatch.setattr(main, "_persist_jobs", persist)
+    scrape = _paged_scraper(60, on_page=on_page)
+    with patch.object(main, "scrape_jobs", side_effect=scrape):
+        run = main.ingest_board("demo", now=1.0)
+
+    assert overlapped == [True]
+    assert run.errors == 0
+    assert persisted == [10] * 6
+    assert run.normalized == 60
+
+
+def test_pipelined_scrape_failure_records_nothing(monkeypatch) -> None:
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+    cur = _RecordingCursor()
+    monkeypatch.setattr(main, "_POOL", ConnectionPool(lambda: _RecordingConn(cur)))
+    main.BOARD_CONFIG["demo"] = _pipelined_config()
+
+    def on_page(offset: int) -> None:
+        if offset:
+            raise RuntimeError("scraper blocked")
+
+    scrape = _paged_scraper(40, on_page=on_page)
+    with patch.object(main, "scrape_jobs", side_effect=scrape):
+        with pytest.raises(RuntimeError, match="scraper blocked"):
+            main.ingest_board("demo", now=1.0)
+
+    assert not any("INTO ingestion_runs" in q for q, _ in cur.statements)
+
+
+def test_collapse_duplicates_keeps_last_copy_in_first_position() -> None:
+    rows = main.normalize_batch(
+        "demo",
+        [
+            {"title": "A", "job_id": "1"},
+            {"title": "B", "job_id": "2"},
+            {"title": "A2", "job_id": "1"},
+            {"title": "C", "url": "https://example.com/c"},
+            {"title": "C2", "url": "https://example.com/c"},
+            {"title": "no id"},
+            {"title": "no id"},
+        ],
+    )
+    collapsed = main.collapse_duplicates(rows)
+    assert [(r.title, r.job_id_ext) for r in collapsed] == [
+        ("A2", "1"),
+        ("B", "2"),
+        ("C2", "https://example.com/c"),
+        ("no id", None),
+        ("no id", None),
+    ]
+    unique = rows[:2]
+    assert main.collapse_duplicates(unique) is unique
+
+
+def test_duplicates_collapse_before_persistence(monkeypatch) -> None:
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+    # Every posting is scraped twice in a row: 25 rows, 13 distinct ids.
+    jobs = [{"title": f"Dev {i}", "job_id": str(i - i % 2)} for i in range(25)]
+
+    def scrape(
+        board: str, *, results_wanted_max: int, offset: int = 0, **_: Any
+    ) -> dict[str, Any]:
+        return {"jobs": jobs[offset : offset + results_wanted_max]}
+
+    for mode in ("sequential", "pipelined"):
+        cur = _RecordingCursor()
+        monkeypatch.setattr(main, "_POOL", ConnectionPool(lambda: _RecordingConn(cur)))
+        main.BOARD_CONFIG["demo"] = _pipelined_config(
+            ingest_mode=mode, persist_mode="row"
+        )
+        with patch.object(main, "scrape_jobs", side_effect=scrape):
+            run = main.ingest_board("demo", now=1.0)
+
+        upserts = [p for q, p in cur.statements if "INTO jobs_normalized" in q]
+        assert (run.normalized, run.collapsed, run.unique_new) == (25, 12, 13)
+        assert [(p.job_id_ext, p.title) for p in upserts[:2]] == [
+            ("0", "Dev 1"),
+            ("2", "Dev 3"),
+        ]
+        assert len(upserts) == 13
+        assert [s.rows for s in run.stages if s.stage == "persist"] == [13]
+        [recorded] = [p for q, p in cur.statements if "INTO ingestion_runs" in q]
+        assert recorded[-2] == 12  # collapsed, just before the timestamp
+
+
+def test_normalize_batch_matches_per_row_path_for_pandas_dataframe() -> None:
+    pd = pytest.importorskip("pandas")
+    # Keys absent from a record become NaN in the frame.
+    frame = pd.DataFrame(_NORMALIZE_CASES)
+    expected = [main.normalize_for_db("demo", raw) for raw in _NORMALIZE_CASES]
+
+    rows = main.normalize_batch("demo", frame)
+
+    assert [row._asdict() for row in rows] == expected
+    assert main.normalize_batch("demo", frame.iloc[:0]) == []
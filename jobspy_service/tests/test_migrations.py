@@ -0,0 +1,86 @@
+"""Tests for the versioned schema bootstrap."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from jobspy_service.app import main
+from jobspy_service.app.db import ConnectionPool
+from jobspy_service.app.migrations import MIGRATIONS, apply_migrations
+
+
+class FakeDB:
+    """Records executed SQL and keeps an in-memory ``schema_version``."""
+
+    def __init__(self) -> None:
+        self.versions: set[int] = set()
+        self.statements: list[str] = []
+        self.result: list[tuple[Any, ...]] = []
+
+    def cursor(self) -> "FakeDB":
+        return self
+
+    def __enter__(self) -> "FakeDB":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def execute(self, query: str, params: Any = None) -> None:
+        self.statements.append(query)
+        if "SELECT version FROM schema_version" in query:
+            self.result = [(v,) for v in self.versions]
+        elif "INSERT INTO schema_version" in query:
+            self.versions.add(params[1])
+        elif "INSERT INTO jobs_normalized" in query:
+            self.result = [(True,)]
+
+    def executemany(self, query: str, params: Any) -> None:
+        self.statements.append(query)
+
+    def fetchall(self) -> list[tuple[Any, ...]]:
+        return self.result
+
+    def fetchone(self) -> tuple[Any, ...]:
+        return self.result[0]
+
+    def close(self) -> None:
+        return None
+
+    def ddl(self) -> list[str]:
+        return [
+            q
+            for q in self.statements
+            if q.lstrip().startswith(("CREATE TABLE", "CREATE INDEX", "ALTER"))
+            and "schema_version" not in q
+        ]
+
+
+def test_migrations_apply_once() -> None:
+    db = FakeDB()
+
+    first = apply_migrations(db)
+    ddl_count = len(db.ddl())
+    second = apply_migrations(db)
+
+    assert first == [m.version for m in MIGRATIONS]
+    assert second == []
+    assert len(db.ddl()) == ddl_count
+    assert any("ingestion_runs (timestamp DESC)" in q for q in db.ddl())
+
+
+def test_ingest_runs_no_ddl_after_bootstrap(monkeypatch: Any) -> None:
+    db = FakeDB()
+    monkeypatch.setattr(main, "_POOL", ConnectionPool(lambda: db))
+    monkeypatch.setattr(main, "_SCHEMA_READY", False)
+    main.BOARD_CONFIG["demo"] = {"enabled": True, "cadence": "4h"}
+    sample = {"jobs": [{"title": "Dev", "job_id": "1"}]}
+
+    with patch("jobspy_service.app.main.scrape_jobs", return_value=sample):
+        main.ingest_board("demo", now=1.0)
+        ddl_after_first = len(db.ddl())
+        main.ingest_board("demo", now=2.0)
+
+    assert ddl_after_first > 0
+    assert len(db.ddl()) == ddl_after_first
@@ -0,0 +1,226 @@
+"""Tests for deadline scheduling and scheduler leader election."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+import random
+import sys
+from typing import Any, Iterator
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+import jobspy_service.app.main as main  # noqa: E402
+from jobspy_service.app.scheduler import BoardSchedule, LeaderLock  # noqa: E402
+
+HOUR = 3600.0
+
+
+def _intervals(board: str) -> float:
+    return {"fast": 4 * HOUR, "slow": 24 * HOUR}[board]
+
+
+def test_schedule_orders_boards_by_deadline() -> None:
+    schedule = BoardSchedule(_intervals)
+    schedule.sync("slow", 0.0, now=0.0)
+    schedule.sync("fast", 0.0, now=0.0)
+
+    assert schedule.next_deadline() == 4 * HOUR
+    assert schedule.pop_due(4 * HOUR - 1) == []
+    assert schedule.pop_due(4 * HOUR) == [("fast", 4 * HOUR)]
+    assert schedule.next_deadline() == 24 * HOUR
+
+    # A new last run replaces the old deadline rather than adding a second one.
+    schedule.sync("slow", 10 * HOUR, now=10 * HOUR)
+    assert schedule.pop_due(30 * HOUR) == []
+    assert schedule.pop_due(34 * HOUR) == [("slow", 34 * HOUR)]
+
+
+def test_never_run_board_is_due_immediately() -> None:
+    schedule = BoardSchedule(_intervals)
+    assert schedule.sync("fast", None, now=50.0) == 50.0
+    assert schedule.pop_due(50.0) == [("fast", 50.0)]
+
+
+def test_jitter_is_bounded_and_stable() -> None:
+    schedule = BoardSchedule(_intervals, jitter=300, rng=random.Random(1))
+    due = schedule.sync("fast", 0.0, now=0.0)
+
+    assert 4 * HOUR <= due <= 4 * HOUR + 300
+    assert schedule.sync("fast", 0.0, now=100.0) == due
+
+
+class FakeLockConn:
+    """Connection whose advisory lock is shared through ``holders``."""
+
+    def __init__(self, holders: set[int], owner: int) -> None:
+        self.holders = holders
+        self.owner = owner
+        self.autocommit = False
+        self.closed = False
+        self.result: tuple[Any, ...] = ()
+
+    def cursor(self) -> "FakeLockConn":
+        return self
+
+    def __enter__(self) -> "FakeLockConn":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def execute(self, query: str, params: Any = None) -> None:
+        if self.closed:
+            raise RuntimeError("connection closed")
+        if "pg_try_advisory_lock" in query:
+            free = not self.holders
+            if free:
+                self.holders.add(self.owner)
+            self.result = (free,)
+
+    def fetchone(self) -> tuple[Any, ...]:
+        return self.result
+
+    def close(self) -> None:
+        self.closed = True
+        self.holders.discard(self.owner)
+
+
+def test_only_one_process_becomes_leader() -> None:
+    holders: set[int] = set()
+    conns: list[FakeLockConn] = []
+
+    def connect_as(owner: int) -> Any:
+        def connect() -> FakeLockConn:
+            conns.append(FakeLockConn(holders, owner))
+            return conns[-1]
+
+        return connect
+
+    first = LeaderLock(connect_as(1), key=42)
+    second = LeaderLock(connect_as(2), key=42)
+
+    assert first.acquire() is True
+    assert second.acquire() is False
+    assert first.acquire() is True  # still held, no new connection
+    assert len(conns) == 2
+
+    # Losing the leader's session frees the lock for the other process.
+    conns[0].close()
+    assert second.acquire() is True
+    assert first.acquire() is False
+
+
+class _AlwaysLeader:
+    def acquire(self) -> bool:
+        return True
+
+
+def test_tick_runs_due_boards_and_records_lag(monkeypatch) -> None:
+    main.INGESTION_RUNS.clear()
+    main.BOARD_CONFIG.clear()
+    for board, cadence in (("fast", "4h"), ("slow", "daily")):
+        main.BOARD_CONFIG[board] = {
+            "enabled": True,
+            "cadence": cadence,
+            "results_wanted_max": 10,
+            "hours_old": 24,
+            "delay": 0,
+        }
+    main._LAST_RUN.clear()
+    main._LAST_RUN.update({"fast": 0.0, "slow": 0.0})
+    monkeypatch.setattr(main, "_load_last_runs", lambda: None)
+    current = {"t": 4 * HOUR + 30}
+
+    schedule = BoardSchedule(main._interval_for)
+    with patch("jobspy_service.app.main.scrape_jobs", return_value={"jobs": []}):
+        with patch("jobspy_service.app.main.time.time", lambda: current["t"]):
+            sleep = main._scheduler_tick(schedule, _AlwaysLeader(), poll=600)
+
+    assert [r.board for r in main.INGESTION_RUNS] == ["fast"]
+    assert main.INGESTION_RUNS[0].scheduling_lag == 30
+    # Next deadline is far away, so the tick sleeps for the poll ceiling.
+    assert sleep == 600
+
+
+def test_failed_board_is_retried_after_poll(monkeypatch) -> None:
+    main.BOARD_CONFIG.clear()
+    main.BOARD_CONFIG["broken"] = {"enabled": True, "cadence": "4h"}
+    main._LAST_RUN.clear()
+    main._LAST_RUN["broken"] = None
+    monkeypatch.setattr(main, "_load_last_runs", lambda: None)
+    monkeypatch.setattr(main, "_FAILED_ATTEMPTS", {})
+
+    schedule = BoardSchedule(main._interval_for)
+    with patch(
+        "jobspy_service.app.main.scrape_jobs", side_effect=RuntimeError("blocked")
+    ):
+        with patch("jobspy_service.app.main.time.time", lambda: 1000.0):
+            sleep = main._scheduler_tick(schedule, _AlwaysLeader(), poll=60)
+
+    assert sleep == 60
+    assert schedule.next_deadline() == 1060.0
+
+
+def test_failed_persistence_backs_off_instead_of_rescraping(monkeypatch) -> None:
+    main.BOARD_CONFIG.clear()
+    main.BOARD_CONFIG["flaky"] = {"enabled": True, "cadence": "4h"}
+    main._LAST_RUN.clear()
+    monkeypatch.setattr(main, "_FAILED_ATTEMPTS", {})
+    monkeypatch.setattr(main, "_SCHEMA_READY", True)
+
+    class ReadOnlyDB:
+        """Reads succeed, but every write fails as if the disk were full."""
+
+        def __enter__(self) -> "ReadOnlyDB":
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            return None
+
+        def cursor(self) -> "ReadOnlyDB":
+            return self
+
+        def execute(self, query: str, params: Any = None) -> None:
+            if not query.lstrip().startswith("SELECT"):
+                raise main.psycopg2.OperationalError("could not extend file")
+
+        def fetchall(self) -> list[tuple[Any, ...]]:
+            return [("flaky", None)]  # no run has ever completed
+
+    @contextmanager
+    def pg_conn() -> Iterator[ReadOnlyDB]:
+        yield ReadOnlyDB()
+
+    monkeypatch.setattr(main, "_pg_conn", pg_conn)
+    scraped: list[float] = []
+    current = {"t": 1000.0}
+
+    def scrape(board: str, **_: Any) -> dict[str, Any]:
+        scraped.append(current["t"])
+        return {"jobs": [{"title": "Dev", "job_id": "1"}]}
+
+    schedule = BoardSchedule(main._interval_for)
+    with patch("jobspy_service.app.main.scrape_jobs", side_effect=scrape):
+        with patch("jobspy_service.app.main.time.time", lambda: current["t"]):
+            for _ in range(8):
+                main._scheduler_tick(schedule, _AlwaysLeader(), poll=60)
+                current["t"] += 60
+
+    # Retries wait 60s, then 120s, then 240s rather than one poll each.
+    assert scraped == [1000.0, 1060.0, 1180.0, 1420.0]
+    assert main._FAILED_ATTEMPTS["flaky"] == 4
+    assert main._LAST_RUN["flaky"] == 1420.0
+
+
+def test_non_leader_does_not_ingest(monkeypatch) -> None:
+    class Follower:
+        def acquire(self) -> bool:
+            return False
+
+    def fail(*_: Any, **__: Any) -> None:
+        raise AssertionError("follower must not ingest")
+
+    monkeypatch.setattr(main, "_run_boards", fail)
+    schedule = BoardSchedule(main._interval_for)
+    assert main._scheduler_tick(schedule, Follower(), poll=45) == 45
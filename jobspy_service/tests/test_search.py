@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 import sys
 from unittest.mock import patch
@@ -83,11 +84,14 @@ async def test_google_scrape_with_delay(monkeypatch, client):
         calls.append(("scrape", source, search_term))
         return {"jobs": [], "source": source}
 
+    main._CACHE.clear()
     monkeypatch.setenv("JOBSPY_ENABLED", "true")
     monkeypatch.setenv("JOBSPY_SOURCES", "google")
     monkeypatch.setenv("JOBSPY_DELAY_SECONDS", "2")
 
-    with patch("jobspy_service.app.main.time.sleep", side_effect=fake_sleep) as mock_sleep:
+    with patch(
+        "jobspy_service.app.ratelimit.asyncio.sleep", side_effect=fake_sleep
+    ) as mock_sleep:
         with patch(
             "jobspy_service.app.main.scrape_jobs", side_effect=fake_scrape
         ) as mock_scrape:
@@ -95,19 +99,54 @@ async def test_google_scrape_with_delay(monkeypatch, client):
                 "/jobs/search",
                 params={"source": "google", "google_search_term": "python"},
             )
+            # The bucket starts full, so only the second scrape is delayed.
+            mock_sleep.assert_not_called()
+            await client.get(
+                "/jobs/search",
+                params={"source": "google", "google_search_term": "golang"},
+            )
 
-    assert calls[0][0] == "sleep"
-    assert calls[1][0] == "scrape"
-    assert calls[0][1] == 2
-    assert calls[1][1:] == ("google", "python")
-    mock_sleep.assert_called_once_with(2)
-    mock_scrape.assert_called_once_with(
+    assert [c[0] for c in calls] == ["scrape", "sleep", "scrape"]
+    assert calls[0][1:] == ("google", "python")
+    assert 1.5 < calls[1][1] <= 2
+    assert calls[2][1:] == ("google", "golang")
+    mock_scrape.assert_any_call(
         "google", search_term="python", results_wanted_max=None
     )
     assert response.status_code == 200
     body = response.json()
     assert body["source"] == "google"
     assert "jobs" in body
+    main._CACHE.clear()
+
+
+@pytest.mark.anyio
+async def test_rate_limits_configurable_per_source(monkeypatch, client):
+    main._CACHE.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed,linkedin")
+    monkeypatch.setenv("JOBSPY_RATE_LIMITS", "indeed=0.5:3")
+
+    with patch("jobspy_service.app.main.scrape_jobs", return_value={"jobs": []}):
+        with patch("jobspy_service.app.ratelimit.asyncio.sleep") as mock_sleep:
+            for term in ("a", "b", "c"):
+                await client.get(
+                    "/jobs/search", params={"source": "indeed", "search_term": term}
+                )
+            mock_sleep.assert_not_called()
+            await client.get(
+                "/jobs/search", params={"source": "indeed", "search_term": "d"}
+            )
+
+    (wait,), _ = mock_sleep.call_args
+    assert 1.5 < wait <= 2
+    assert main._BUCKETS["indeed"].burst == 3
+
+    monkeypatch.setenv("JOBSPY_RATE_LIMITS", "indeed=fast")
+    response = await client.get("/jobs/search", params={"source": "indeed"})
+    assert response.status_code == 500
+    assert response.json()["detail"] == "invalid JOBSPY_RATE_LIMITS"
+    main._CACHE.clear()
 
 
 @pytest.mark.anyio
@@ -218,7 +257,7 @@ async def test_repeat_query_uses_cache(monkeypatch, client):
         calls.append(("scrape", source, search_term))
         return {"jobs": [], "source": source}
 
-    with patch("jobspy_service.app.main.time.sleep", side_effect=fake_sleep):
+    with patch("jobspy_service.app.ratelimit.asyncio.sleep", side_effect=fake_sleep):
         with patch("jobspy_service.app.main.scrape_jobs", side_effect=fake_scrape):
             await client.get(
                 "/jobs/search", params={"source": "indeed", "search_term": "python"}
@@ -227,7 +266,7 @@ async def test_repeat_query_uses_cache(monkeypatch, client):
                 "/jobs/search", params={"source": "indeed", "search_term": "python"}
             )
 
-    assert calls == [("sleep", 2), ("scrape", "indeed", "python")]
+    assert calls == [("scrape", "indeed", "python")]
 
 
 @pytest.mark.anyio
@@ -244,7 +283,7 @@ async def test_cache_expires_after_ttl(monkeypatch, client):
         return current["t"]
 
     def fake_sleep(delay: float) -> None:
-        calls.append(("sleep", delay))
+        calls.append(("sleep", round(delay)))
 
     def fake_scrape(
         source: str,
@@ -255,7 +294,7 @@ async def test_cache_expires_after_ttl(monkeypatch, client):
         calls.append(("scrape", source, search_term))
         return {"jobs": [], "source": source}
 
-    with patch("jobspy_service.app.main.time.sleep", side_effect=fake_sleep):
+    with patch("jobspy_service.app.ratelimit.asyncio.sleep", side_effect=fake_sleep):
         with patch("jobspy_service.app.main.scrape_jobs", side_effect=fake_scrape):
             with patch("jobspy_service.app.main.time.time", side_effect=fake_time):
                 await client.get(
@@ -273,3 +312,104 @@ async def test_cache_expires_after_ttl(monkeypatch, client):
 
     assert calls == [("sleep", 2), ("scrape", "indeed", "python")]
 
+
+@pytest.mark.anyio
+async def test_stream_yields_ndjson_and_replays_cache(monkeypatch, client):
+    main._CACHE.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    monkeypatch.setenv("JOBSPY_DELAY_SECONDS", "0")
+    sample = {
+        "jobs": [
+            {"job_title": "Engineer", "company": "Acme", "is_remote": True},
+            {"title": "Developer", "company_name": "Beta", "remote": "hybrid"},
+        ]
+    }
+
+    with patch(
+        "jobspy_service.app.main.scrape_jobs", return_value=sample
+    ) as mock_scrape:
+        streamed = await client.get(
+            "/jobs/search/stream", params={"source": "indeed", "search_term": "dev"}
+        )
+        replayed = await client.get(
+            "/jobs/search/stream", params={"source": "indeed", "search_term": "dev"}
+        )
+        regular = await client.get(
+            "/jobs/search", params={"source": "indeed", "search_term": "dev"}
+        )
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [j["title"] for j in lines] == ["Engineer", "Developer"]
+    assert lines[0]["remote_status"] == "remote"
+    assert replayed.text == streamed.text
+    assert regular.json()["jobs"] == lines
+    mock_scrape.assert_called_once()
+    main._CACHE.clear()
+
+
+def _paged_scrape(calls, total):
+    def scrape(source, *, results_wanted_max, offset, **_):
+        calls.append(offset)
+        end = min(offset + results_wanted_max, total)
+        return {"jobs": [{"title": f"Job {i}"} for i in range(offset, end)]}
+
+    return scrape
+
+
+@pytest.mark.anyio
+async def test_stream_writes_each_page_before_scraping_the_next(monkeypatch):
+    main._CACHE.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    monkeypatch.setenv("JOBSPY_DELAY_SECONDS", "0")
+    monkeypatch.setitem(main.BOARD_CONFIG, "indeed", {"page_size": 2})
+    calls = []
+
+    with patch("jobspy_service.app.main.scrape_jobs", _paged_scrape(calls, 3)):
+        response = await main.search_jobs_stream("indeed", "dev")
+        lines = response.body_iterator
+        first = json.loads(await lines.__anext__())
+        assert (first["title"], calls) == ("Job 0", [0])
+        rest = [json.loads(line)["title"] async for line in lines]
+
+    assert rest == ["Job 1", "Job 2"]
+    assert calls == [0, 2]
+    cached, _ = main._CACHE.lookup(main.normalize_key("indeed", "dev"))
+    assert [job.title for job in cached.jobs] == ["Job 0", "Job 1", "Job 2"]
+    main._CACHE.clear()
+
+
+@pytest.mark.anyio
+async def test_oversized_stream_is_not_cached_or_shared(monkeypatch):
+    main._CACHE.clear()
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    monkeypatch.setenv("JOBSPY_DELAY_SECONDS", "0")
+    monkeypatch.setitem(main.BOARD_CONFIG, "indeed", {"page_size": 2})
+    monkeypatch.setattr(main, "STREAM_CACHE_MAX_JOBS", 2)
+    key = main.normalize_key("indeed", "dev")
+
+    with patch("jobspy_service.app.main.scrape_jobs", _paged_scrape([], 3)):
+        response = await main.search_jobs_stream("indeed", "dev")
+        follower, leader = main._INFLIGHT.join(key)
+        assert not leader
+        lines = [line async for line in response.body_iterator]
+
+    assert len(lines) == 3
+    # The follower is released to scrape for itself; nothing is cached.
+    assert isinstance(follower.exception(), main._UnsharedStream)
+    assert main._CACHE.lookup(key) is None
+
+
+@pytest.mark.anyio
+async def test_stream_shares_search_error_semantics(monkeypatch, client):
+    monkeypatch.setenv("JOBSPY_ENABLED", "true")
+    monkeypatch.setenv("JOBSPY_SOURCES", "indeed")
+    response = await client.get(
+        "/jobs/search/stream", params={"source": "google", "google_search_term": "x"}
+    )
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Google not allowlisted"